@@ -6,16 +6,49 @@ and ensure data integrity through SHA256 hashing.
 """
 
 import os
+import errno
+import glob
 import hashlib
+import itertools
 import json
 import random
+import shutil
+import stat
 import string
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Union
+
+from src import acquisition_catalog as catalog
+from src import evidence_storage
+from src import merkle
+from src import object_store
+from src import synthetic_corpus
 
 # Path to the forensic output directory
 FORENSIC_OUTPUT_DIR = "forensic_output"
 
+# Size of the blocks read when hashing evidence files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Hash algorithms that can be computed alongside SHA256
+SUPPORTED_HASH_ALGORITHMS = ("sha256", "md5", "sha1", "blake2b")
+
+# Number of acquisitions recorded in the catalog per transaction
+CATALOG_BATCH_SIZE = 256
+
+# Files modified more recently than this are not cached: a later write within
+# the same mtime tick would leave their identity unchanged
+HASH_CACHE_MIN_AGE_NS = 2 * 1_000_000_000
+
+# Directory of the content-addressed object store, inside the forensic output directory
+OBJECTS_DIRNAME = "objects"
+
+# Suffixes of a resumable acquisition's partial data and of its checkpoint records
+PART_SUFFIX = ".part"
+CHECKPOINT_SUFFIX = ".ckpt"
+
 def ensure_output_dir_exists() -> None:
     """
     Ensures that the forensic output directory exists.
@@ -24,6 +57,33 @@ def ensure_output_dir_exists() -> None:
     if not os.path.exists(FORENSIC_OUTPUT_DIR):
         os.makedirs(FORENSIC_OUTPUT_DIR)
 
+def catalog_path() -> str:
+    """
+    Returns the path of the acquisition catalog database.
+    
+    Returns:
+        str: The catalog path inside the forensic output directory
+    """
+    return os.path.join(FORENSIC_OUTPUT_DIR, catalog.CATALOG_FILENAME)
+
+def objects_dir() -> str:
+    """
+    Returns the path of the content-addressed object store.
+    
+    Returns:
+        str: The object store directory
+    """
+    return os.path.join(FORENSIC_OUTPUT_DIR, OBJECTS_DIRNAME)
+
+def _ensure_catalog() -> None:
+    """
+    Ensures the acquisition catalog exists, building it from the .meta files
+    of an evidence store that predates the catalog.
+    """
+    ensure_output_dir_exists()
+    if not os.path.exists(catalog_path()):
+        rebuild_catalog()
+
 def generate_random_content(size: int = 1024, content_type: str = "log") -> str:
     """
     Generates random content to simulate acquired data.
@@ -37,39 +97,7 @@ def generate_random_content(size: int = 1024, content_type: str = "log") -> str:
     """
     if content_type == "log":
         # Generate simulated log entries
-        log_entries = []
-        current_time = datetime.now()
-        
-        for i in range(size // 100):  # Approximate number of log entries
-            event_types = ["INFO", "WARNING", "ERROR", "DEBUG"]
-            event_type = random.choice(event_types)
-            
-            # Generate a random timestamp within the last 24 hours
-            timestamp = current_time.replace(
-                hour=random.randint(0, 23),
-                minute=random.randint(0, 59),
-                second=random.randint(0, 59)
-            ).isoformat()
-            
-            # Generate a random message
-            messages = [
-                "Device started",
-                "Connection established",
-                "Data sent to cloud",
-                "Configuration updated",
-                "Firmware update available",
-                "Sensor reading: {}".format(random.randint(0, 100)),
-                "Battery level: {}%".format(random.randint(0, 100)),
-                "Connection lost",
-                "Reconnecting...",
-                "Device shutdown"
-            ]
-            message = random.choice(messages)
-            
-            log_entry = f"[{timestamp}] [{event_type}] {message}"
-            log_entries.append(log_entry)
-        
-        return "\n".join(log_entries)
+        return "\n".join(_iter_log_entries(size))
     
     elif content_type == "config":
         # Generate simulated configuration data
@@ -115,22 +143,641 @@ def generate_random_content(size: int = 1024, content_type: str = "log") -> str:
         # Generate random binary-like data
         return ''.join(random.choices(string.printable, k=size))
 
-def calculate_sha256(data: str) -> str:
+def _iter_log_entries(size: int) -> Iterator[str]:
+    """
+    Generates simulated log entries one at a time.
+    
+    Args:
+        size: Approximate size of the log in bytes
+        
+    Yields:
+        str: Each log entry, without a line terminator
+    """
+    current_time = datetime.now()
+    
+    for i in range(size // 100):  # Approximate number of log entries
+        event_types = ["INFO", "WARNING", "ERROR", "DEBUG"]
+        event_type = random.choice(event_types)
+        
+        # Generate a random timestamp within the last 24 hours
+        timestamp = current_time.replace(
+            hour=random.randint(0, 23),
+            minute=random.randint(0, 59),
+            second=random.randint(0, 59)
+        ).isoformat()
+        
+        # Generate a random message
+        messages = [
+            "Device started",
+            "Connection established",
+            "Data sent to cloud",
+            "Configuration updated",
+            "Firmware update available",
+            "Sensor reading: {}".format(random.randint(0, 100)),
+            "Battery level: {}%".format(random.randint(0, 100)),
+            "Connection lost",
+            "Reconnecting...",
+            "Device shutdown"
+        ]
+        message = random.choice(messages)
+        
+        yield f"[{timestamp}] [{event_type}] {message}"
+
+def generate_content_chunks(
+    size: int = 1024,
+    content_type: str = "log",
+    chunk_size: int = HASH_CHUNK_SIZE,
+    seed: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Generates random content to simulate acquired data, as a stream of chunks.
+    
+    Unlike generate_random_content, only about one chunk is held in memory at
+    a time, so arbitrarily large sources can be simulated.
+    
+    Args:
+        size: Size of the content in bytes
+        content_type: Type of content to generate (log, config, etc.)
+        chunk_size: Approximate size of the chunks yielded
+        seed: Generate log and config content with the vectorized synthetic
+            corpus generator, reproducibly for this seed (optional)
+        
+    Yields:
+        bytes: Successive chunks of UTF-8 encoded content
+    """
+    if seed is not None and content_type == "log":
+        yield from synthetic_corpus.generate_log_corpus(size, seed=seed)
+    
+    elif seed is not None and content_type == "config":
+        yield from synthetic_corpus.generate_config_corpus(size, seed=seed)
+    
+    elif content_type == "log":
+        pending = []
+        pending_size = 0
+        for i, entry in enumerate(_iter_log_entries(size)):
+            line = (entry if i == 0 else "\n" + entry).encode('utf-8')
+            pending.append(line)
+            pending_size += len(line)
+            if pending_size >= chunk_size:
+                yield b"".join(pending)
+                pending = []
+                pending_size = 0
+        if pending:
+            yield b"".join(pending)
+    
+    elif content_type == "config":
+        # Configurations are small; generate them whole
+        yield generate_random_content(size, content_type).encode('utf-8')
+    
+    else:
+        remaining = size
+        while remaining > 0:
+            count = min(chunk_size, remaining)
+            yield ''.join(random.choices(string.printable, k=count)).encode('utf-8')
+            remaining -= count
+
+def calculate_sha256(data: Union[str, bytes]) -> str:
     """
     Calculates the SHA256 hash of the given data.
     
     Args:
-        data: The data to hash
+        data: The data to hash (text is hashed as UTF-8)
         
     Returns:
         str: The SHA256 hash
     """
-    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(
+    file_path: str,
+    algorithms: Iterable[str] = ("sha256",),
+    chunk_size: int = HASH_CHUNK_SIZE,
+    compression: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Hashes a file's bytes with one or more algorithms in a single pass.
+    
+    The file is read in binary mode in fixed-size chunks into a reused buffer,
+    so memory use stays constant regardless of the file size. Evidence stored
+    compressed is hashed over its uncompressed content when its codec is given.
+    
+    Args:
+        file_path: The path to the file to hash
+        algorithms: Hash algorithms to compute (see SUPPORTED_HASH_ALGORITHMS)
+        chunk_size: Size of the blocks read from the file
+        compression: The codec the file was stored with (see stored_compression),
+            or None to hash its bytes as they are
+        
+    Returns:
+        Dict[str, str]: The hex digest for each requested algorithm
+    """
+    hashers = {name: hashlib.new(name) for name in algorithms}
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    
+    with evidence_storage.open_evidence(file_path, compression) as f:
+        while True:
+            bytes_read = f.readinto(buffer)
+            if not bytes_read:
+                break
+            chunk = view[:bytes_read]
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+def _file_identity(file_path: str) -> Tuple[int, int, int, int]:
+    """
+    Returns the identity of a file's current contents, used as hash cache key.
+    
+    Args:
+        file_path: The path to the file
+        
+    Returns:
+        Tuple[int, int, int, int]: The file's (st_dev, st_ino, size, mtime_ns)
+    """
+    stat = os.stat(file_path)
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+def _in_output_dir(file_path: str) -> bool:
+    """
+    Checks whether a file lies inside the forensic output directory.
+    
+    Args:
+        file_path: The path to the file
+        
+    Returns:
+        bool: True if the file is in the output directory or below it
+    """
+    output_dir = os.path.realpath(FORENSIC_OUTPUT_DIR)
+    try:
+        return os.path.commonpath([os.path.realpath(file_path), output_dir]) == output_dir
+    except ValueError:
+        # Paths on different drives
+        return False
+
+def hash_file_cached(
+    file_path: str,
+    algorithms: Iterable[str] = ("sha256",),
+    force: bool = False,
+    compression: Optional[str] = None
+) -> Tuple[Dict[str, str], bool]:
+    """
+    Hashes a file, answering from the hash cache when the file is unchanged.
+    
+    Only files in the forensic output directory are cached; other files are
+    simply hashed, without creating or touching the catalog.
+    
+    Args:
+        file_path: The path to the file to hash
+        algorithms: Hash algorithms to compute (see SUPPORTED_HASH_ALGORITHMS)
+        force: Re-read the file even if its digests are cached
+        compression: The codec the file was stored with, or None to hash its
+            bytes as they are
+        
+    Returns:
+        Tuple[Dict[str, str], bool]: The hex digest for each requested algorithm,
+        and whether they were all answered from the cache
+    """
+    algorithms = list(algorithms)
+    if not _in_output_dir(file_path):
+        return hash_file(file_path, algorithms, compression=compression), False
+    _ensure_catalog()
+    
+    # Digests of the uncompressed content are cached apart from those of the stored bytes
+    prefix = f"{compression}:" if compression else ""
+    
+    identity = _file_identity(file_path)
+    if not force:
+        cached = catalog.get_cached_hashes(catalog_path(), identity, [prefix + name for name in algorithms])
+        if len(cached) == len(algorithms):
+            return {name: cached[prefix + name] for name in algorithms}, True
+    
+    digests = hash_file(file_path, algorithms, compression=compression)
+    
+    # Only cache digests of files that did not change while being read
+    if _file_identity(file_path) == identity and time.time_ns() - identity[3] >= HASH_CACHE_MIN_AGE_NS:
+        catalog.store_hashes(catalog_path(), identity, {prefix + name: digest for name, digest in digests.items()})
+    
+    return digests, False
+
+def _create_unique_file(stem: str, extension: str) -> Tuple[str, BinaryIO]:
+    """
+    Creates a new output file, never reusing the name of an existing one.
+    
+    The file is created exclusively, so concurrent acquisitions that generate
+    the same name within one second each get their own file; later ones get a
+    numeric suffix.
+    
+    Args:
+        stem: The file name without extension
+        extension: The file extension, including the dot
+        
+    Returns:
+        Tuple[str, BinaryIO]: The path of the new file and the file, open for binary writing
+    """
+    for attempt in itertools.count():
+        filename = f"{stem}_{attempt}{extension}" if attempt else f"{stem}{extension}"
+        output_path = os.path.join(FORENSIC_OUTPUT_DIR, filename)
+        try:
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o644)
+        except FileExistsError:
+            continue
+        return output_path, os.fdopen(fd, 'wb')
+
+def _read_checkpoint(checkpoint_path: str) -> Tuple[Dict, List[Dict]]:
+    """
+    Reads the records of a resumable acquisition's checkpoint.
+    
+    A record torn by an interruption, and anything after it, is ignored.
+    
+    Args:
+        checkpoint_path: The path to the .ckpt file
+        
+    Returns:
+        Tuple[Dict, List[Dict]]: The header describing the acquisition and the
+        record of each completed chunk, in order
+        
+    Raises:
+        ValueError: If the checkpoint has no valid header
+    """
+    records = []
+    with open(checkpoint_path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not isinstance(record, dict):
+                break
+            records.append(record)
+    
+    if not records or "file_path" not in records[0]:
+        raise ValueError(f"Invalid checkpoint: {checkpoint_path}")
+    return records[0], records[1:]
+
+def find_checkpoint(device_id: str, source_path: str) -> Optional[Dict]:
+    """
+    Finds the checkpoint of an interrupted acquisition of a source file.
+    
+    Args:
+        device_id: The ID of the device
+        source_path: The path to the source file
+        
+    Returns:
+        Dict or None: The checkpoint header, with its path under
+        "checkpoint_path" and the bytes recorded under "bytes_written", or
+        None if there is no checkpoint for this source
+    """
+    for checkpoint_path in sorted(glob.glob(os.path.join(glob.escape(FORENSIC_OUTPUT_DIR), "*" + CHECKPOINT_SUFFIX))):
+        try:
+            header, records = _read_checkpoint(checkpoint_path)
+        except (OSError, ValueError):
+            continue
+        source = header.get("source") or {}
+        if header.get("device_id") == device_id and source.get("path") == os.path.abspath(source_path):
+            header["checkpoint_path"] = checkpoint_path
+            header["bytes_written"] = records[-1]["bytes_written"] if records else 0
+            return header
+    return None
+
+class AcquisitionWriter:
+    """
+    Writes one acquisition's data as it arrives, hashing it while it is written.
+    
+    Each chunk is written to the output file and fed to the digest as it
+    arrives, so memory use does not depend on the size of the evidence and
+    the hash and size are final as soon as the last chunk is written.
+    
+    Alongside the whole-file hash, the hash of every chunk of the data and
+    their Merkle root are recorded (see merkle), so that the acquisition can
+    later be verified in parallel and corrupted ranges located.
+    
+    With compression, the data is stored as independently compressed frames
+    (see evidence_storage) and the metadata records the frame index. Hashes
+    and sizes always describe the uncompressed data.
+    
+    With dedup, the stored bytes go to the content-addressed object store
+    (see object_store) and the output file is a hard link to their blob, so
+    acquisitions of identical content share one copy. The metadata records
+    the blob's key.
+    
+    A resumable acquisition writes its data to <output>.part and, each time a
+    Merkle chunk is complete and flushed to disk, appends the chunk's hash and
+    the number of bytes written to <output>.ckpt. An interrupted acquisition
+    can be continued with resume, which re-hashes the completed chunks on
+    disk (SHA256 state cannot be saved) and checks them against the records.
+    Resumable acquisitions are stored raw, without compression or dedup.
+    
+    The data is complete once finish is called, which writes the .meta file
+    and catalogs the acquisition; abort discards it instead, and close leaves
+    a resumable acquisition's partial data to be resumed later.
+    """
+    
+    def __init__(
+        self,
+        device_id: str,
+        source_type: str,
+        output_filename: Optional[str] = None,
+        compression: Optional[str] = None,
+        dedup: bool = False,
+        resumable: bool = False,
+        source: Optional[Dict] = None
+    ):
+        if compression is not None and compression not in evidence_storage.COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if resumable and (compression or dedup):
+            raise ValueError("Resumable acquisitions cannot be compressed or deduplicated")
+        
+        ensure_output_dir_exists()
+        
+        self.device_id = device_id
+        self.source_type = source_type
+        self.compression = compression
+        self.dedup = dedup
+        self.source = source
+        self.resumed_at: List[int] = []
+        
+        # Generate a timestamp for the acquisition
+        self.timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        
+        # Generate a unique filename if not provided
+        if output_filename is None:
+            extension = ".dat" + evidence_storage.COMPRESSION_EXTENSIONS.get(compression, "")
+            self.output_path, self._file = _create_unique_file(f"{device_id}_{source_type}_{self.timestamp}", extension)
+        else:
+            self.output_path = os.path.join(FORENSIC_OUTPUT_DIR, output_filename)
+            # Replace rather than truncate an existing file, which may be a blob shared with other acquisitions
+            if os.path.lexists(self.output_path):
+                os.remove(self.output_path)
+            self._file = open(self.output_path, 'wb')
+        
+        self._hasher = hashlib.sha256()
+        self._chunk_hasher = merkle.ChunkHasher()
+        self.file_size = 0
+        
+        # With dedup, the output path is only reserved here and linked to the blob once written
+        self._temp_path = None
+        if dedup:
+            self._file.close()
+            self._temp_path, self._file = object_store.create_temp(objects_dir())
+        
+        # A resumable acquisition's output path is only reserved here and replaced by its .part once complete
+        self.checkpoint_path = None
+        if resumable:
+            self._file.close()
+            self._temp_path = self.output_path + PART_SUFFIX
+            self._file = open(self._temp_path, 'wb')
+            self.checkpoint_path = self.output_path + CHECKPOINT_SUFFIX
+            with open(self.checkpoint_path, 'w') as f:
+                f.write(json.dumps(self._checkpoint_header()) + "\n")
+        
+        self._stored_file = object_store.HashingWriter(self._file) if dedup and compression else self._file
+        self._writer = evidence_storage.FrameWriter(self._stored_file, compression) if compression else self._stored_file
+    
+    @classmethod
+    def resume(cls, checkpoint_path: str) -> "AcquisitionWriter":
+        """
+        Continues an interrupted resumable acquisition.
+        
+        The completed chunks of the partial data are re-read and checked
+        against the checkpoint records. Data after the last chunk that
+        matches its record is discarded, so the acquisition continues from
+        file_size bytes into the source.
+        
+        Args:
+            checkpoint_path: The acquisition's .ckpt file
+            
+        Returns:
+            AcquisitionWriter: A writer for the rest of the data
+            
+        Raises:
+            ValueError: If the checkpoint or the partial data is missing or unreadable
+        """
+        header, records = _read_checkpoint(checkpoint_path)
+        output_path = header["file_path"]
+        part_path = output_path + PART_SUFFIX
+        if not os.path.exists(part_path):
+            raise ValueError(f"Partial data of {output_path} is missing")
+        
+        writer = cls.__new__(cls)
+        writer.device_id = header["device_id"]
+        writer.source_type = header["source_type"]
+        writer.timestamp = header["timestamp"]
+        writer.compression = None
+        writer.dedup = False
+        writer.source = header.get("source")
+        writer.output_path = output_path
+        writer.checkpoint_path = checkpoint_path
+        writer._temp_path = part_path
+        writer._hasher = hashlib.sha256()
+        writer._chunk_hasher = merkle.ChunkHasher(header["merkle_chunk_size"])
+        
+        # Rebuild the hash state from the data on disk, stopping at the first chunk that does not match
+        chunk_size = writer._chunk_hasher.chunk_size
+        verified = []
+        with open(part_path, 'rb') as f:
+            for record in records:
+                chunk = f.read(chunk_size)
+                if len(chunk) < chunk_size or merkle.leaf_hash(chunk) != record["chunk_hash"]:
+                    break
+                writer._hasher.update(chunk)
+                verified.append(record)
+        writer._chunk_hasher.leaf_hashes = [record["chunk_hash"] for record in verified]
+        writer.file_size = len(verified) * chunk_size
+        writer.resumed_at = header.get("resumed_at", []) + [writer.file_size]
+        
+        writer._file = open(part_path, 'r+b')
+        writer._file.truncate(writer.file_size)
+        writer._file.seek(writer.file_size)
+        writer._stored_file = writer._writer = writer._file
+        
+        # Rewrite the checkpoint without the discarded records
+        header["resumed_at"] = writer.resumed_at
+        temp_checkpoint = checkpoint_path + ".tmp"
+        with open(temp_checkpoint, 'w') as f:
+            f.writelines(json.dumps(line) + "\n" for line in [header] + verified)
+        os.replace(temp_checkpoint, checkpoint_path)
+        
+        return writer
+    
+    def _checkpoint_header(self) -> Dict:
+        """
+        Builds the first record of the checkpoint, describing the acquisition.
+        
+        Returns:
+            Dict: The checkpoint header
+        """
+        return {
+            "device_id": self.device_id,
+            "source_type": self.source_type,
+            "timestamp": self.timestamp,
+            "file_path": self.output_path,
+            "source": self.source,
+            "merkle_chunk_size": self._chunk_hasher.chunk_size
+        }
+    
+    def write(self, chunk: bytes) -> None:
+        """
+        Writes and hashes the next chunk of data.
+        
+        Args:
+            chunk: The data following everything written so far
+        """
+        self._writer.write(chunk)
+        self._hasher.update(chunk)
+        completed = len(self._chunk_hasher.leaf_hashes)
+        self._chunk_hasher.update(chunk)
+        self.file_size += len(chunk)
+        
+        if self.checkpoint_path and len(self._chunk_hasher.leaf_hashes) > completed:
+            self._checkpoint(completed)
+    
+    def _checkpoint(self, first: int) -> None:
+        """
+        Records newly completed chunks once their data is on disk.
+        
+        Args:
+            first: The index of the first chunk not yet recorded
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        
+        chunk_size = self._chunk_hasher.chunk_size
+        leaf_hashes = self._chunk_hasher.leaf_hashes
+        with open(self.checkpoint_path, 'a') as f:
+            for index in range(first, len(leaf_hashes)):
+                f.write(json.dumps({"bytes_written": (index + 1) * chunk_size, "chunk_hash": leaf_hashes[index]}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def finish(self) -> Tuple[str, str, str]:
+        """
+        Completes the acquisition, writing its .meta file and cataloging it.
+        
+        Returns:
+            Tuple[str, str, str]: The output file path, the SHA256 hash, and the acquisition timestamp
+        """
+        with self._file:
+            if self.compression:
+                self._writer.close()
+        sha256_hash = self._hasher.hexdigest()
+        chunk_hashes, merkle_root = self._chunk_hasher.finish()
+        
+        if self.dedup:
+            # Blobs are keyed on the stored bytes, which are the data itself when uncompressed
+            blob = self._stored_file.hasher.hexdigest() if self.compression else sha256_hash
+            object_store.link(object_store.add(objects_dir(), self._temp_path, blob), self.output_path)
+        elif self.checkpoint_path:
+            os.replace(self._temp_path, self.output_path)
+        
+        # Create a metadata file with acquisition details
+        metadata = {
+            "device_id": self.device_id,
+            "source_type": self.source_type,
+            "timestamp": self.timestamp,
+            "sha256_hash": sha256_hash,
+            "file_path": self.output_path,
+            "file_size": self.file_size
+        }
+        if self.compression:
+            metadata.update({
+                "compression": self.compression,
+                "stored_size": self._writer.stored_size,
+                "frame_size": self._writer.frame_size,
+                "frames": self._writer.frames
+            })
+        if self.dedup:
+            metadata["blob"] = blob
+        if self.source:
+            metadata.update({
+                "source_path": self.source["path"],
+                "source_mtime": datetime.fromtimestamp(self.source["mtime_ns"] / 1e9).isoformat()
+            })
+        if self.resumed_at:
+            metadata["resumed_at"] = self.resumed_at
+        metadata.update({
+            "merkle_root": merkle_root,
+            "merkle_chunk_size": self._chunk_hasher.chunk_size,
+            "chunk_hashes": chunk_hashes
+        })
+        
+        metadata_path = f"{self.output_path}.meta"
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=4)
+        
+        if self.checkpoint_path:
+            os.remove(self.checkpoint_path)
+        
+        _ensure_catalog()
+        catalog.add_acquisition(catalog_path(), metadata)
+        
+        return self.output_path, sha256_hash, self.timestamp
+    
+    def close(self) -> None:
+        """
+        Stops an unfinished acquisition. A resumable acquisition's partial data
+        and checkpoint are kept so that it can be resumed; any other
+        acquisition is discarded.
+        """
+        if self.checkpoint_path:
+            self._file.close()
+        else:
+            self.abort()
+    
+    def abort(self) -> None:
+        """
+        Discards an unfinished acquisition and the data written so far.
+        """
+        self._file.close()
+        for path in (self._temp_path, self.checkpoint_path, self.output_path):
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+def acquire_stream(
+    device_id: str,
+    source_type: str,
+    chunks: Iterable[bytes],
+    output_filename: Optional[str] = None,
+    compression: Optional[str] = None,
+    dedup: bool = False
+) -> Tuple[str, str, str]:
+    """
+    Acquires data from a stream of chunks, hashing it while it is written
+    (see AcquisitionWriter).
+    
+    If the stream fails, the partial output is removed and the error raised.
+    
+    Args:
+        device_id: The ID of the device the data comes from
+        source_type: The type of data acquired (log, config, etc.)
+        chunks: The acquired data, as successive byte chunks
+        output_filename: The name of the output file (optional)
+        compression: Store the data compressed with this codec ("gzip" or "lzma")
+        dedup: Store the data in the object store, shared with identical acquisitions
+        
+    Returns:
+        Tuple[str, str, str]: The output file path, the SHA256 hash, and the acquisition timestamp
+    """
+    writer = AcquisitionWriter(device_id, source_type, output_filename, compression, dedup)
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish()
 
 def simulate_acquisition(
     device_id: str,
     source_type: str,
-    output_filename: Optional[str] = None
+    output_filename: Optional[str] = None,
+    size: Optional[int] = None,
+    seed: Optional[int] = None,
+    compression: Optional[str] = None,
+    dedup: bool = False
 ) -> Tuple[str, str, str]:
     """
     Simulates data acquisition from a device.
@@ -139,55 +786,363 @@ def simulate_acquisition(
         device_id: The ID of the device to acquire data from
         source_type: The type of data to acquire (log, config, etc.)
         output_filename: The name of the output file (optional)
+        size: Approximate size of the data in bytes (random between 1 and 10 KiB if omitted)
+        seed: Seed for reproducible synthetic content (optional)
+        compression: Store the data compressed with this codec (optional)
+        dedup: Store the data in the object store, shared with identical acquisitions
         
     Returns:
         Tuple[str, str, str]: The output file path, the SHA256 hash, and the acquisition timestamp
     """
-    ensure_output_dir_exists()
+    if size is None:
+        size = random.randint(1024, 10240)
     
-    # Generate a timestamp for the acquisition
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    # Stream random content based on the source type straight to disk
+    chunks = generate_content_chunks(size=size, content_type=source_type, seed=seed)
+    return acquire_stream(device_id, source_type, chunks, output_filename, compression, dedup)
+
+def run_acquisition_batch(
+    device_ids: Iterable[str],
+    source_types: Iterable[str],
+    max_workers: int = 8,
+    compression: Optional[str] = None,
+    dedup: bool = False
+) -> Iterator[Dict]:
+    """
+    Acquires every source type from every device concurrently.
+    
+    Acquisitions run in a bounded pool of worker threads, so the latency of
+    each device overlaps with the others instead of adding up.
+    
+    Args:
+        device_ids: The IDs of the devices to acquire data from
+        source_types: The types of data to acquire from each device
+        max_workers: Maximum number of acquisitions running at once
+        compression: Store the data compressed with this codec (optional)
+        dedup: Store the data in the object store, shared with identical acquisitions
+        
+    Yields:
+        Dict: The result of each job as it finishes, with its device ID, source
+        type and either the output path, hash and timestamp or an error
+    """
+    source_types = list(source_types)
+    jobs = [(device_id, source_type) for device_id in device_ids for source_type in source_types]
+    if not jobs:
+        return
+    
+    # Create the catalog up front so concurrent jobs do not race to rebuild it
+    _ensure_catalog()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(simulate_acquisition, device_id, source_type, compression=compression, dedup=dedup): (device_id, source_type)
+                   for device_id, source_type in jobs}
+        for future in as_completed(futures):
+            device_id, source_type = futures[future]
+            result = {"device_id": device_id, "source_type": source_type}
+            try:
+                result["output_path"], result["sha256_hash"], result["timestamp"] = future.result()
+                result["status"] = "done"
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = str(e)
+            yield result
+
+def acquire_image(
+    source_path: str,
+    device_id: str,
+    source_type: str = "image",
+    resume: bool = True,
+    on_resume: Optional[Callable[[str, int], None]] = None
+) -> Tuple[str, str, str]:
+    """
+    Acquires a large file, such as a flash or disk image, resumably.
+    
+    If an earlier acquisition of the same, unchanged source was interrupted,
+    it is resumed from its last checkpoint (see AcquisitionWriter); the .meta
+    records the offsets at which it was resumed. If this acquisition is
+    interrupted in turn, its partial data is kept for the next attempt.
+    
+    Args:
+        source_path: The path to the file to acquire
+        device_id: The ID of the device the file comes from
+        source_type: The type of data acquired
+        resume: Resume an interrupted acquisition of the source (otherwise it
+            is discarded and the acquisition starts over)
+        on_resume: Called with the output path and the offset the acquisition
+            continues from, before copying, if it actually resumes
+        
+    Returns:
+        Tuple[str, str, str]: The output file path, the SHA256 hash, and the acquisition timestamp
+    """
+    source_stat = os.stat(source_path)
+    source = {
+        "path": os.path.abspath(source_path),
+        "size": source_stat.st_size,
+        "mtime_ns": source_stat.st_mtime_ns
+    }
+    
+    checkpoint = find_checkpoint(device_id, source_path)
+    writer = None
+    # A checkpoint is stale if the source has changed since
+    if checkpoint and resume and checkpoint["source"] == source:
+        try:
+            writer = AcquisitionWriter.resume(checkpoint["checkpoint_path"])
+        except (OSError, ValueError):
+            writer = None
+    if writer is None:
+        if checkpoint:
+            for path in (checkpoint["file_path"] + PART_SUFFIX, checkpoint["checkpoint_path"], checkpoint["file_path"]):
+                if os.path.exists(path):
+                    os.remove(path)
+        writer = AcquisitionWriter(device_id, source_type, resumable=True, source=source)
+    elif on_resume:
+        on_resume(writer.output_path, writer.file_size)
+    
+    try:
+        with open(source_path, 'rb') as f:
+            f.seek(writer.file_size)
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                writer.write(chunk)
+    except BaseException:
+        writer.close()
+        raise
+    return writer.finish()
+
+def iter_data_path_files(source_root: str, data_paths: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Finds the regular files of a mounted image or extracted directory that
+    match a device's data paths.
+    
+    Data paths are interpreted relative to the source root and may name a
+    directory (all files below it), a file, or a glob pattern. Symbolic links
+    are never followed, so nothing outside the source root is acquired.
+    
+    Args:
+        source_root: The root directory of the device's filesystem
+        data_paths: The device's data paths, e.g. "/var/log/"
+        
+    Yields:
+        Tuple[str, str]: Each file's path and its path relative to the source root
+    """
+    root = os.path.realpath(source_root)
+    seen = set()
     
-    # Generate a filename if not provided
-    if output_filename is None:
-        output_filename = f"{device_id}_{source_type}_{timestamp}.dat"
+    def candidates(data_path: str) -> Iterator[str]:
+        target = os.path.normpath(os.path.join(root, data_path.strip().lstrip("/\\")))
+        if target != root and not target.startswith(root + os.sep):
+            return
+        matches = glob.glob(target, recursive=True) if glob.has_magic(target) else [target]
+        for match in sorted(matches):
+            if os.path.isdir(match) and not os.path.islink(match):
+                for dir_path, dir_names, filenames in os.walk(match):
+                    dir_names.sort()
+                    for filename in sorted(filenames):
+                        yield os.path.join(dir_path, filename)
+            else:
+                yield match
     
-    # Generate the output file path
-    output_path = os.path.join(FORENSIC_OUTPUT_DIR, output_filename)
+    for data_path in data_paths:
+        for path in candidates(data_path):
+            relative_path = os.path.relpath(path, root)
+            if relative_path in seen or relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+                continue
+            # Skip files reached through a symbolically linked directory
+            if os.path.realpath(os.path.dirname(path)) != os.path.dirname(os.path.join(root, relative_path)):
+                continue
+            try:
+                if not stat.S_ISREG(os.lstat(path).st_mode):
+                    continue
+            except OSError:
+                continue
+            seen.add(relative_path)
+            yield path, relative_path
+
+def _zero_copy(source_fd: int, dest_fd: int, size: int) -> None:
+    """
+    Copies a file's contents between descriptors inside the kernel when possible.
+    
+    os.copy_file_range is tried first (it can also share extents on
+    filesystems that support it), then os.sendfile, then a regular copy.
     
-    # Generate random content based on the source type
-    content = generate_random_content(size=random.randint(1024, 10240), content_type=source_type)
+    Args:
+        source_fd: Descriptor of the source file, opened for reading
+        dest_fd: Descriptor of the destination file, opened for writing
+        size: Number of bytes to copy
+    """
+    offset = 0
+    unsupported = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.ETXTBSY)
     
-    # Calculate the SHA256 hash of the content
-    sha256_hash = calculate_sha256(content)
+    if hasattr(os, "copy_file_range"):
+        try:
+            while offset < size:
+                copied = os.copy_file_range(source_fd, dest_fd, size - offset, offset, offset)
+                if copied == 0:
+                    break
+                offset += copied
+        except OSError as e:
+            if e.errno not in unsupported:
+                raise
     
-    # Write the content to the output file
-    with open(output_path, 'w') as f:
-        f.write(content)
+    if offset < size and hasattr(os, "sendfile"):
+        os.lseek(dest_fd, offset, os.SEEK_SET)
+        try:
+            while offset < size:
+                copied = os.sendfile(dest_fd, source_fd, offset, size - offset)
+                if copied == 0:
+                    break
+                offset += copied
+        except OSError as e:
+            if e.errno not in unsupported + (errno.ENOTSOCK,):
+                raise
+    
+    if offset < size:
+        os.lseek(source_fd, offset, os.SEEK_SET)
+        os.lseek(dest_fd, offset, os.SEEK_SET)
+        with open(source_fd, 'rb', closefd=False) as fsrc, open(dest_fd, 'wb', closefd=False) as fdst:
+            shutil.copyfileobj(fsrc, fdst, HASH_CHUNK_SIZE)
+
+def _acquire_file(source_path: str, relative_path: str, output_dir: str, device_id: str, timestamp: str) -> Dict:
+    """
+    Copies one file of a device's filesystem into the output directory,
+    hashes the copy and writes its metadata file.
+    
+    Args:
+        source_path: The path of the file to acquire
+        relative_path: The file's path relative to the source root
+        output_dir: The directory of this filesystem acquisition
+        device_id: The ID of the device
+        timestamp: The acquisition timestamp
+        
+    Returns:
+        Dict: The acquisition metadata
+    """
+    output_path = os.path.join(output_dir, relative_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    with open(source_path, 'rb') as source:
+        source_stat = os.fstat(source.fileno())
+        dest_fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            _zero_copy(source.fileno(), dest_fd, source_stat.st_size)
+        finally:
+            os.close(dest_fd)
+    
+    # Hash the stored copy (fresh in the page cache) in a single pass
+    hasher = hashlib.sha256()
+    chunk_hasher = merkle.ChunkHasher()
+    file_size = 0
+    with open(output_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+            chunk_hasher.update(chunk)
+            file_size += len(chunk)
+    chunk_hashes, merkle_root = chunk_hasher.finish()
     
-    # Create a metadata file with acquisition details
     metadata = {
         "device_id": device_id,
-        "source_type": source_type,
+        "source_type": "filesystem",
         "timestamp": timestamp,
-        "sha256_hash": sha256_hash,
+        "sha256_hash": hasher.hexdigest(),
         "file_path": output_path,
-        "file_size": len(content)
+        "file_size": file_size,
+        "source_path": "/" + relative_path.replace(os.sep, "/"),
+        "source_mtime": datetime.fromtimestamp(source_stat.st_mtime).isoformat(),
+        "merkle_root": merkle_root,
+        "merkle_chunk_size": chunk_hasher.chunk_size,
+        "chunk_hashes": chunk_hashes
     }
     
-    metadata_path = f"{output_path}.meta"
-    with open(metadata_path, 'w') as f:
+    # Never replace an acquired file (see acquire_filesystem's collision check)
+    with open(f"{output_path}.meta", 'x') as f:
         json.dump(metadata, f, indent=4)
     
-    return output_path, sha256_hash, timestamp
+    return metadata
+
+def acquire_filesystem(
+    source_root: str,
+    device_id: str,
+    data_paths: Iterable[str],
+    max_workers: int = 8
+) -> Iterator[Dict]:
+    """
+    Acquires the files matching a device's data paths from a mounted device
+    image or extracted directory.
+    
+    Files are copied into a new directory of the forensic output directory,
+    keeping their relative paths, using the kernel's zero-copy paths where
+    available. Copies are hashed by a pool of threads and each gets its own
+    .meta file and catalog entry. A file named like the .meta file of another
+    acquired file ("foo.meta" next to "foo") would collide with its metadata,
+    so it fails before anything is written.
+    
+    Args:
+        source_root: The root directory of the device's filesystem
+        device_id: The ID of the device
+        data_paths: The device's data paths (see iter_data_path_files)
+        max_workers: Maximum number of files acquired at once
+        
+    Yields:
+        Dict: The result of each file as it finishes, with its source path and
+        either its metadata or an error
+    """
+    if not os.path.isdir(source_root):
+        raise ValueError(f"Source is not a directory: {source_root}")
+    
+    _ensure_catalog()
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    
+    # A fresh directory per acquisition, so repeated acquisitions never collide
+    for attempt in itertools.count():
+        output_dir = os.path.join(FORENSIC_OUTPUT_DIR, f"{device_id}_filesystem_{timestamp}" + (f"_{attempt}" if attempt else ""))
+        try:
+            os.mkdir(output_dir)
+            break
+        except FileExistsError:
+            continue
+    
+    files = list(iter_data_path_files(source_root, data_paths))
+    relative_paths = {os.path.normcase(relative_path) for _, relative_path in files}
+    
+    # Catalog entries are written in batches rather than one transaction per file
+    pending = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for source_path, relative_path in files:
+                name = os.path.normcase(relative_path)
+                if name.endswith(".meta") and name[:-len(".meta")] in relative_paths:
+                    yield {
+                        "source_path": source_path,
+                        "status": "failed",
+                        "error": f"Name collides with the metadata file of {os.path.basename(relative_path)[:-len('.meta')]}"
+                    }
+                    continue
+                futures[pool.submit(_acquire_file, source_path, relative_path, output_dir, device_id, timestamp)] = source_path
+            for future in as_completed(futures):
+                result = {"source_path": futures[future]}
+                try:
+                    result["metadata"] = future.result()
+                    result["status"] = "done"
+                    pending.append(result["metadata"])
+                except OSError as e:
+                    result["status"] = "failed"
+                    result["error"] = str(e)
+                if len(pending) >= CATALOG_BATCH_SIZE:
+                    catalog.add_acquisitions(catalog_path(), pending)
+                    pending = []
+                yield result
+    finally:
+        if pending:
+            catalog.add_acquisitions(catalog_path(), pending)
 
-def verify_file_integrity(file_path: str, expected_hash: str) -> bool:
+def verify_file_integrity(file_path: str, expected_hash: str, force: bool = False) -> bool:
     """
     Verifies the integrity of a file by comparing its SHA256 hash with the expected hash.
     
     Args:
         file_path: The path to the file to verify
         expected_hash: The expected SHA256 hash
+        force: Re-read the file instead of trusting the hash cache
         
     Returns:
         bool: True if the file is intact, False otherwise
@@ -195,19 +1150,61 @@ def verify_file_integrity(file_path: str, expected_hash: str) -> bool:
     if not os.path.exists(file_path):
         return False
     
-    # Read the file content
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    # Calculate the SHA256 hash of the content
-    actual_hash = calculate_sha256(content)
+    # Hash the file's content in chunks, decompressing it if it was stored compressed
+    actual_hash = hash_file_cached(file_path, force=force, compression=stored_compression(file_path))[0]["sha256"]
     
     # Compare the actual hash with the expected hash
-    return actual_hash == expected_hash
+    return actual_hash == expected_hash.strip().lower()
 
-def list_acquisitions() -> List[Dict]:
+def _read_metadata_file(metadata_path: str) -> Optional[Dict]:
     """
-    Lists all acquisitions in the forensic output directory.
+    Reads an acquisition metadata file.
+    
+    Acquired files may themselves be named *.meta, so a file only counts as
+    metadata if it describes the file it is named after.
+    
+    Args:
+        metadata_path: The path to the .meta file
+        
+    Returns:
+        Dict or None: The acquisition metadata, or None if the file is not metadata
+    """
+    try:
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+    except (UnicodeDecodeError, ValueError):
+        return None
+    
+    if not isinstance(metadata, dict) or not isinstance(metadata.get("file_path"), str):
+        return None
+    if os.path.basename(metadata["file_path"]) + ".meta" != os.path.basename(metadata_path):
+        return None
+    return metadata
+
+def stored_compression(file_path: str) -> Optional[str]:
+    """
+    Looks up the codec an acquired file was stored with in its metadata file.
+    
+    Only the metadata decides: a file acquired as it was found is read as is,
+    even if it happens to be a gzip or xz file.
+    
+    Args:
+        file_path: The path to the acquired file
+        
+    Returns:
+        str or None: The codec ("gzip" or "lzma"), or None for raw files and
+        files without metadata
+    """
+    try:
+        metadata = _read_metadata_file(f"{file_path}.meta")
+    except OSError:
+        return None
+    return metadata.get("compression") if metadata else None
+
+def read_metadata_files() -> List[Dict]:
+    """
+    Reads the metadata of every acquisition from the .meta files in the
+    forensic output directory and its subdirectories.
     
     Returns:
         List[Dict]: A list of acquisition metadata
@@ -217,13 +1214,302 @@ def list_acquisitions() -> List[Dict]:
     acquisitions = []
     
     # Iterate through all files in the forensic output directory
-    for filename in os.listdir(FORENSIC_OUTPUT_DIR):
-        if filename.endswith(".meta"):
-            # Read the metadata file
-            metadata_path = os.path.join(FORENSIC_OUTPUT_DIR, filename)
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            
-            acquisitions.append(metadata)
+    for dir_path, dir_names, filenames in os.walk(FORENSIC_OUTPUT_DIR):
+        # Blobs in the object store are reached through the acquisitions linking them
+        if dir_path == FORENSIC_OUTPUT_DIR and OBJECTS_DIRNAME in dir_names:
+            dir_names.remove(OBJECTS_DIRNAME)
+        for filename in filenames:
+            if filename.endswith(".meta"):
+                # Read the metadata file
+                metadata = _read_metadata_file(os.path.join(dir_path, filename))
+                if metadata is not None:
+                    acquisitions.append(metadata)
+    
+    return acquisitions
+
+def rebuild_catalog() -> int:
+    """
+    Rebuilds the acquisition catalog from the .meta files.
+    
+    Returns:
+        int: The number of acquisitions cataloged
+    """
+    ensure_output_dir_exists()
+    return catalog.replace_all(catalog_path(), read_metadata_files())
+
+def gc_objects(dry_run: bool = False) -> Dict[str, int]:
+    """
+    Removes the blobs of the object store that no .meta file references.
+    
+    References are read from the .meta files rather than the catalog, so a
+    stale catalog can never cause referenced evidence to be removed.
+    
+    Args:
+        dry_run: Only report what would be removed
+        
+    Returns:
+        Dict[str, int]: The number of blobs kept and removed, and the bytes freed
+    """
+    referenced = {metadata["blob"] for metadata in read_metadata_files() if metadata.get("blob")}
+    return object_store.collect_garbage(objects_dir(), referenced, dry_run=dry_run)
+
+def storage_stats(acquisitions: Optional[Iterable[Dict]] = None) -> Dict[str, int]:
+    """
+    Measures how much disk space deduplication saves.
+    
+    Args:
+        acquisitions: The metadata of the acquisitions to measure (all if omitted)
+        
+    Returns:
+        Dict[str, int]: The number of acquisitions and unique stored files, the
+        logical bytes (each acquisition's stored file counted separately), the
+        bytes actually stored (files sharing a blob counted once) and the
+        bytes saved
+    """
+    if acquisitions is None:
+        acquisitions = list_acquisitions()
+    
+    count = 0
+    logical_bytes = 0
+    stored = {}
+    for metadata in acquisitions:
+        try:
+            file_stat = os.stat(metadata["file_path"])
+        except OSError:
+            continue
+        count += 1
+        logical_bytes += file_stat.st_size
+        stored[(file_stat.st_dev, file_stat.st_ino)] = file_stat.st_size
+    
+    stored_bytes = sum(stored.values())
+    return {
+        "acquisitions": count,
+        "unique_files": len(stored),
+        "logical_bytes": logical_bytes,
+        "stored_bytes": stored_bytes,
+        "saved_bytes": logical_bytes - stored_bytes
+    }
+
+def find_acquisitions(
+    device_id: Optional[str] = None,
+    source_type: Optional[str] = None,
+    timestamps: Optional[Iterable[str]] = None,
+    file_paths: Optional[Iterable[str]] = None
+) -> List[Dict]:
+    """
+    Finds acquisitions in the catalog.
+    
+    Args:
+        device_id: Exact device ID to match (optional)
+        source_type: Exact source type to match (optional)
+        timestamps: Acquisition timestamps to match (optional)
+        file_paths: Acquisition file paths to match (optional)
+        
+    Returns:
+        List[Dict]: The metadata of the matching acquisitions, oldest first
+    """
+    _ensure_catalog()
+    return catalog.find_acquisitions(
+        catalog_path(),
+        device_id=device_id,
+        source_type=source_type,
+        timestamps=timestamps,
+        file_paths=file_paths
+    )
+
+def list_acquisitions() -> List[Dict]:
+    """
+    Lists all acquisitions in the forensic output directory.
+    
+    Returns:
+        List[Dict]: A list of acquisition metadata, oldest first
+    """
+    return find_acquisitions()
+
+def read_acquisition_range(file_path: str, offset: int, length: int) -> bytes:
+    """
+    Reads a range of an acquisition's uncompressed content.
+    
+    For compressed acquisitions only the frames spanning the range are read
+    and decompressed, using the frame index from the acquisition's metadata.
+    
+    Args:
+        file_path: The path to the acquired file
+        offset: Offset of the range in the uncompressed content
+        length: Length of the range in bytes
+        
+    Returns:
+        bytes: The content in the range (shorter if it extends past the end)
+    """
+    metadata = {}
+    if os.path.exists(f"{file_path}.meta"):
+        with open(f"{file_path}.meta", 'r') as f:
+            metadata = json.load(f)
+    
+    if metadata.get("frames"):
+        return evidence_storage.read_range(file_path, metadata["compression"], metadata["frames"], offset, length)
+    
+    with evidence_storage.open_evidence(file_path, metadata.get("compression")) as f:
+        f.seek(offset)
+        return f.read(length)
+
+def _hash_chunk_batch(file_path: str, metadata: Dict, first: int, count: int) -> List[Optional[str]]:
+    """
+    Computes the leaf hashes of a run of consecutive chunks of an acquisition.
+    
+    Args:
+        file_path: The path to the acquired file
+        metadata: The acquisition metadata
+        first: Index of the first chunk
+        count: Number of chunks
+        
+    Returns:
+        List[Optional[str]]: The leaf hash of each chunk, or None for chunks
+        that could not be read or decompressed
+    """
+    chunk_size = metadata["merkle_chunk_size"]
+    hashes = []
+    
+    if metadata.get("frames"):
+        for index in range(first, first + count):
+            try:
+                chunk = evidence_storage.read_range(
+                    file_path, metadata["compression"], metadata["frames"], index * chunk_size, chunk_size
+                )
+                hashes.append(merkle.leaf_hash(chunk))
+            except (OSError, ValueError):
+                hashes.append(None)
+        return hashes
+    
+    with open(file_path, 'rb') as f:
+        f.seek(first * chunk_size)
+        for _ in range(count):
+            hashes.append(merkle.leaf_hash(f.read(chunk_size)))
+    return hashes
+
+def verify_chunks(file_path: str, max_workers: Optional[int] = None) -> Dict:
+    """
+    Verifies an acquisition chunk by chunk against the chunk hashes in its metadata.
+    
+    Runs of chunks are hashed concurrently by a pool of threads (hashlib and
+    the decompressors release the GIL on large buffers), and the byte ranges of
+    the chunks that no longer match are reported.
+    
+    Args:
+        file_path: The path to the acquired file
+        max_workers: Number of worker threads (defaults to the CPU count)
+        
+    Returns:
+        Dict: The verification result, with a status of "ok", "corrupted",
+        "missing" or "error", the corrupted chunk indexes, the corrupted
+        (start, end) byte ranges of the uncompressed data, the number of
+        unexpected trailing bytes and whether the Merkle root matches
+    """
+    result = {"file_path": file_path, "corrupted_chunks": [], "corrupted_ranges": [], "trailing_bytes": 0}
+    
+    metadata = {}
+    if os.path.exists(f"{file_path}.meta"):
+        with open(f"{file_path}.meta", 'r') as f:
+            metadata = json.load(f)
+    expected = metadata.get("chunk_hashes")
+    if expected is None:
+        result["status"] = "error"
+        result["error"] = "Acquisition metadata has no chunk hashes"
+        return result
+    if not os.path.exists(file_path):
+        result["status"] = "missing"
+        return result
+    
+    chunk_size = metadata["merkle_chunk_size"]
+    file_size = metadata["file_size"]
+    workers = max_workers or os.cpu_count() or 1
+    batch = max(1, -(-len(expected) // (workers * 4)))
+    
+    actual = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = [pool.submit(_hash_chunk_batch, file_path, metadata, first, min(batch, len(expected) - first))
+                   for first in range(0, len(expected), batch)]
+        for future in batches:
+            actual.extend(future.result())
+    
+    for index, (expected_hash, actual_hash) in enumerate(zip(expected, actual)):
+        if expected_hash != actual_hash:
+            result["corrupted_chunks"].append(index)
+            start, end = index * chunk_size, min((index + 1) * chunk_size, file_size)
+            if result["corrupted_ranges"] and result["corrupted_ranges"][-1][1] == start:
+                result["corrupted_ranges"][-1] = (result["corrupted_ranges"][-1][0], end)
+            else:
+                result["corrupted_ranges"].append((start, end))
+    
+    # Data appended after the acquired content does not belong to any chunk
+    expected_stored_size = metadata.get("stored_size", file_size)
+    result["trailing_bytes"] = max(os.path.getsize(file_path) - expected_stored_size, 0)
+    
+    result["merkle_root_ok"] = None not in actual and merkle.merkle_root(actual) == metadata.get("merkle_root")
+    result["status"] = "ok" if result["merkle_root_ok"] and not result["trailing_bytes"] else "corrupted"
+    return result
+
+def verify_acquisition(metadata: Dict, force: bool = False) -> Dict:
+    """
+    Re-hashes the file of one acquisition and compares it with its metadata.
+    
+    Args:
+        metadata: The acquisition metadata (as stored in its .meta file)
+        force: Re-read the file instead of trusting the hash cache
+        
+    Returns:
+        Dict: The verification result, with the file path, expected and actual
+        hashes, whether the hash came from the cache and a status of "ok",
+        "mismatch", "missing" or "error"
+    """
+    file_path = metadata.get("file_path")
+    expected_hash = metadata.get("sha256_hash")
+    result = {
+        "device_id": metadata.get("device_id"),
+        "timestamp": metadata.get("timestamp"),
+        "file_path": file_path,
+        "expected_hash": expected_hash,
+        "actual_hash": None,
+        "cached": False
+    }
+    
+    if not file_path or not expected_hash:
+        result["status"] = "error"
+        result["error"] = "Metadata has no file path or hash"
+    elif not os.path.exists(file_path):
+        result["status"] = "missing"
+    else:
+        try:
+            digests, result["cached"] = hash_file_cached(file_path, force=force, compression=metadata.get("compression"))
+            result["actual_hash"] = digests["sha256"]
+            result["status"] = "ok" if result["actual_hash"] == expected_hash.lower() else "mismatch"
+        except OSError as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+    
+    return result
+
+def verify_all_acquisitions(max_workers: Optional[int] = None, force: bool = False) -> Iterator[Dict]:
+    """
+    Verifies every acquisition in the forensic output directory in parallel.
+    
+    The acquisitions are read from the .meta files rather than the catalog,
+    so each file is checked against its own .meta file even if the catalog is
+    stale. Files are re-hashed across a pool of worker processes, largest
+    first, and results are yielded as soon as each file is done.
+    
+    Args:
+        max_workers: Number of worker processes (defaults to the CPU count)
+        force: Re-read every file instead of trusting the hash cache
+        
+    Yields:
+        Dict: The verification result of each acquisition (see verify_acquisition)
+    """
+    acquisitions = sorted(read_metadata_files(), key=lambda m: m.get("file_size") or 0, reverse=True)
+    if not acquisitions:
+        return
     
-    return acquisitions
\ No newline at end of file
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(verify_acquisition, metadata, force) for metadata in acquisitions]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,263 @@
+"""
+IoT Device Acquisition Catalog Module
+
+This module maintains an SQLite catalog of acquisition metadata, so acquisitions
+can be listed and looked up by device, timestamp, source type or file path
+without opening and parsing every .meta file in the forensic output directory.
+The .meta files remain the source of truth; the catalog can be rebuilt from
+them at any time.
+
+The catalog database also holds a cache of file digests keyed on file identity
+(device, inode, size and modification time), so unchanged evidence files do
+not have to be re-read to be verified.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Name of the catalog database inside the forensic output directory
+CATALOG_FILENAME = "catalog.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS acquisitions (
+    file_path TEXT PRIMARY KEY,
+    device_id TEXT,
+    source_type TEXT,
+    timestamp TEXT,
+    sha256_hash TEXT,
+    file_size INTEGER,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_acquisitions_device_id ON acquisitions (device_id);
+CREATE INDEX IF NOT EXISTS idx_acquisitions_timestamp ON acquisitions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_acquisitions_source_type ON acquisitions (source_type);
+CREATE TABLE IF NOT EXISTS hash_cache (
+    st_dev INTEGER NOT NULL,
+    st_ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (st_dev, st_ino, size, mtime_ns, algorithm)
+);
+"""
+
+UPSERT_SQL = (
+    "INSERT OR REPLACE INTO acquisitions "
+    "(file_path, device_id, source_type, timestamp, sha256_hash, file_size, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """
+    Opens a connection to a catalog database, creating the schema if needed.
+
+    Args:
+        db_path: Path to the catalog database file
+
+    Returns:
+        sqlite3.Connection: An open database connection
+    """
+    db_dir = os.path.dirname(db_path)
+    if db_dir and not os.path.exists(db_dir):
+        os.makedirs(db_dir, exist_ok=True)
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _row_values(metadata: Dict[str, Any]) -> tuple:
+    """
+    Builds the column values stored for an acquisition.
+
+    Args:
+        metadata: The acquisition metadata
+
+    Returns:
+        tuple: Values for (file_path, device_id, source_type, timestamp,
+        sha256_hash, file_size, metadata)
+    """
+    return (
+        metadata["file_path"],
+        metadata.get("device_id"),
+        metadata.get("source_type"),
+        metadata.get("timestamp"),
+        metadata.get("sha256_hash"),
+        metadata.get("file_size"),
+        json.dumps(metadata)
+    )
+
+def add_acquisition(db_path: str, metadata: Dict[str, Any]) -> None:
+    """
+    Records an acquisition, replacing any entry for the same file path.
+
+    Args:
+        db_path: Path to the catalog database file
+        metadata: The acquisition metadata
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute(UPSERT_SQL, _row_values(metadata))
+    finally:
+        conn.close()
+
+def add_acquisitions(db_path: str, acquisitions: Iterable[Dict[str, Any]]) -> None:
+    """
+    Records many acquisitions in a single transaction.
+
+    Args:
+        db_path: Path to the catalog database file
+        acquisitions: The metadata of each acquisition
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(UPSERT_SQL, (_row_values(metadata) for metadata in acquisitions))
+    finally:
+        conn.close()
+
+def replace_all(db_path: str, acquisitions: Iterable[Dict[str, Any]]) -> int:
+    """
+    Replaces the catalog contents with the given acquisitions in one transaction.
+
+    Args:
+        db_path: Path to the catalog database file
+        acquisitions: The metadata of every acquisition
+
+    Returns:
+        int: The number of acquisitions cataloged
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM acquisitions")
+            conn.executemany(UPSERT_SQL, (_row_values(metadata) for metadata in acquisitions))
+            count = conn.execute("SELECT COUNT(*) FROM acquisitions").fetchone()[0]
+    finally:
+        conn.close()
+
+    return count
+
+def _in_clause(column: str, values: List[str], clauses: List[str], params: List[Any]) -> None:
+    """
+    Adds a "column IN (...)" condition to a query being built.
+
+    Args:
+        column: The column to match
+        values: The accepted values
+        clauses: The query's conditions, extended in place
+        params: The query's parameters, extended in place
+    """
+    clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+    params.extend(values)
+
+def find_acquisitions(
+    db_path: str,
+    device_id: Optional[str] = None,
+    source_type: Optional[str] = None,
+    timestamps: Optional[Iterable[str]] = None,
+    file_paths: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Finds acquisitions using the catalog indexes.
+
+    Args:
+        db_path: Path to the catalog database file
+        device_id: Exact device ID to match (optional)
+        source_type: Exact source type to match (optional)
+        timestamps: Acquisition timestamps to match (optional)
+        file_paths: Acquisition file paths to match (optional)
+
+    Returns:
+        List[Dict]: The metadata of the matching acquisitions, oldest first
+    """
+    clauses = []
+    params = []
+    if device_id is not None:
+        clauses.append("device_id = ?")
+        params.append(device_id)
+    if source_type is not None:
+        clauses.append("source_type = ?")
+        params.append(source_type)
+    if timestamps is not None:
+        timestamps = list(timestamps)
+        if not timestamps:
+            return []
+        _in_clause("timestamp", timestamps, clauses, params)
+    if file_paths is not None:
+        file_paths = list(file_paths)
+        if not file_paths:
+            return []
+        _in_clause("file_path", file_paths, clauses, params)
+
+    query = "SELECT metadata FROM acquisitions"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY timestamp, file_path"
+
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+    return [json.loads(row[0]) for row in rows]
+
+def get_cached_hashes(
+    db_path: str,
+    identity: Tuple[int, int, int, int],
+    algorithms: Iterable[str]
+) -> Dict[str, str]:
+    """
+    Looks up cached digests of a file.
+
+    Args:
+        db_path: Path to the catalog database file
+        identity: The file's (st_dev, st_ino, size, mtime_ns)
+        algorithms: The hash algorithms wanted
+
+    Returns:
+        Dict[str, str]: The cached digest of each algorithm found in the cache
+    """
+    algorithms = list(algorithms)
+
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT algorithm, digest FROM hash_cache "
+            "WHERE st_dev = ? AND st_ino = ? AND size = ? AND mtime_ns = ? "
+            f"AND algorithm IN ({', '.join('?' * len(algorithms))})",
+            (*identity, *algorithms)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return dict(rows)
+
+def store_hashes(db_path: str, identity: Tuple[int, int, int, int], digests: Dict[str, str]) -> None:
+    """
+    Caches the digests of a file, dropping entries for older versions of it.
+
+    Args:
+        db_path: Path to the catalog database file
+        identity: The file's (st_dev, st_ino, size, mtime_ns)
+        digests: The digest of each algorithm
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute(
+                "DELETE FROM hash_cache WHERE st_dev = ? AND st_ino = ? AND (size != ? OR mtime_ns != ?)",
+                identity
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO hash_cache (st_dev, st_ino, size, mtime_ns, algorithm, digest) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((*identity, algorithm, digest) for algorithm, digest in digests.items())
+            )
+    finally:
+        conn.close()
@@ -5,10 +5,245 @@ This module provides functionality to analyze data acquired from IoT devices,
 including parsing log files and configuration files.
 """
 
+import io
 import json
+import os
 import re
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Any, Optional, TextIO, Tuple, Union
+
+# Log entry format: [timestamp] [level] message. A sensor reading or battery
+# level at the start of the message, as devices emit them, is captured by the
+# same match. Fields are matched up to the first "]", which is faster than a
+# lazy match and gives the same result whenever it matches; lines with a "]"
+# inside the timestamp or level fall back to the lazy pattern.
+LOG_LINE_PATTERN = re.compile(
+    r'\[([^\]]*)\] \[([^\]]*)\] ((?:Sensor reading: (\d+)|Battery level: (\d+)%)?.*)'
+)
+LOG_LINE_FALLBACK_PATTERN = re.compile(
+    r'\[(.*?)\] \[(.*?)\] ((?:Sensor reading: (\d+)|Battery level: (\d+)%)?.*)'
+)
+SENSOR_PATTERN = re.compile(r'Sensor reading: (\d+)')
+BATTERY_PATTERN = re.compile(r'Battery level: (\d+)%')
+
+# Read buffer used when parsing logs from unbuffered binary files
+LOG_READ_BUFFER_SIZE = 1024 * 1024
+
+# Logs parsed in parallel are split into at least this many byte ranges per
+# worker, each at most LOG_SHARD_SIZE bytes (which a worker holds in memory)
+LOG_SHARDS_PER_WORKER = 4
+LOG_SHARD_SIZE = 32 * 1024 * 1024
+
+# Parsed timestamps are integer nanoseconds since the Unix epoch, with the
+# precision of datetime (microseconds). Timestamps without a UTC offset, as
+# devices emit them, are counted from a naive epoch, i.e. read as UTC.
+EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = EPOCH.replace(tzinfo=timezone.utc)
+_ONE_SECOND = timedelta(seconds=1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Fixed-width device timestamps (YYYY-MM-DDTHH:MM:SS, optionally followed by
+# six fractional digits) skip datetime parsing; the seconds value of each
+# second-resolution prefix is cached, as consecutive lines share it
+TIMESTAMP_PREFIX_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}', re.ASCII)
+TIMESTAMP_PREFIX_LENGTH = 19
+TIMESTAMP_CACHE_SIZE = 4096
+_timestamp_seconds_cache: Dict[str, int] = {}
+_timestamp_text_cache: Dict[int, str] = {}
+
+def _cache_put(cache: Dict[Any, Any], key: Any, value: Any) -> None:
+    """
+    Adds a value to one of the timestamp caches, emptying it when full.
+    
+    Args:
+        cache: The cache
+        key: The key
+        value: The value
+    """
+    if len(cache) >= TIMESTAMP_CACHE_SIZE:
+        cache.clear()
+    cache[key] = value
+
+def _prefix_seconds(prefix: str) -> Optional[int]:
+    """
+    Converts a second-resolution timestamp prefix to seconds since the epoch.
+    
+    Args:
+        prefix: The first TIMESTAMP_PREFIX_LENGTH characters of a timestamp
+        
+    Returns:
+        int or None: The seconds, or None if the prefix is not in the fixed-width format
+    
+    Raises:
+        ValueError: If the prefix has the fixed-width format but is not a valid time
+    """
+    seconds = _timestamp_seconds_cache.get(prefix)
+    if seconds is None and TIMESTAMP_PREFIX_PATTERN.fullmatch(prefix):
+        seconds = (datetime.fromisoformat(prefix) - EPOCH) // _ONE_SECOND
+        _cache_put(_timestamp_seconds_cache, prefix, seconds)
+        if prefix[10] == 'T':
+            # Already as isoformat() writes it, so formatting the entry is a cache hit
+            _cache_put(_timestamp_text_cache, seconds, prefix)
+    return seconds
+
+def parse_timestamp(timestamp_str: str) -> Tuple[int, Optional[float]]:
+    """
+    Parses an ISO format timestamp.
+    
+    Args:
+        timestamp_str: The timestamp, in any format datetime.fromisoformat accepts
+        
+    Returns:
+        Tuple[int, Optional[float]]: The nanoseconds since the epoch, and the
+        UTC offset in seconds if the timestamp has one
+    
+    Raises:
+        ValueError: If the timestamp is invalid
+    """
+    length = len(timestamp_str)
+    if length == TIMESTAMP_PREFIX_LENGTH:
+        seconds = _prefix_seconds(timestamp_str)
+        if seconds is not None:
+            return seconds * 1000000000, None
+    elif length == TIMESTAMP_PREFIX_LENGTH + 7 and timestamp_str[TIMESTAMP_PREFIX_LENGTH] == '.':
+        fraction = timestamp_str[TIMESTAMP_PREFIX_LENGTH + 1:]
+        if fraction.isdigit() and fraction.isascii():
+            seconds = _prefix_seconds(timestamp_str[:TIMESTAMP_PREFIX_LENGTH])
+            if seconds is not None:
+                return seconds * 1000000000 + int(fraction) * 1000, None
+    
+    timestamp = datetime.fromisoformat(timestamp_str)
+    utc_offset = timestamp.utcoffset()
+    if utc_offset is None:
+        return (timestamp - EPOCH) // _ONE_MICROSECOND * 1000, None
+    return (timestamp - _EPOCH_UTC) // _ONE_MICROSECOND * 1000, utc_offset.total_seconds()
+
+def format_timestamp(timestamp_ns: int, utc_offset: Optional[float] = None) -> str:
+    """
+    Formats a parsed timestamp as datetime.isoformat() would.
+    
+    Args:
+        timestamp_ns: The nanoseconds since the epoch
+        utc_offset: The UTC offset in seconds to show, for timestamps that had one
+        
+    Returns:
+        str: The timestamp in ISO format
+    """
+    if utc_offset is not None:
+        timestamp = _EPOCH_UTC + timedelta(microseconds=timestamp_ns // 1000)
+        return timestamp.astimezone(timezone(timedelta(seconds=utc_offset))).isoformat()
+    
+    seconds, nanoseconds = divmod(timestamp_ns, 1000000000)
+    text = _timestamp_text_cache.get(seconds)
+    if text is None:
+        text = (EPOCH + timedelta(seconds=seconds)).isoformat()
+        _cache_put(_timestamp_text_cache, seconds, text)
+    microseconds = nanoseconds // 1000
+    if microseconds:
+        text += f".{microseconds:06d}"
+    return text
+
+def format_log_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts a parsed log entry to its output form, with an ISO format
+    "timestamp" in place of "timestamp_ns" and "utc_offset".
+    
+    Args:
+        entry: The parsed log entry
+        
+    Returns:
+        Dict: The log entry as parse_log_file returns it
+    """
+    if "timestamp_ns" not in entry:
+        return entry
+    formatted = {"timestamp": format_timestamp(entry["timestamp_ns"], entry.get("utc_offset")), **entry}
+    del formatted["timestamp_ns"]
+    formatted.pop("utc_offset", None)
+    return formatted
+
+def _parse_log_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses one log line.
+    
+    Args:
+        line: The line; a trailing newline is ignored, as the message does not
+            extend past it
+        
+    Returns:
+        Dict or None: The parsed log entry, or None if the line is not a valid entry
+    """
+    match = LOG_LINE_PATTERN.match(line) or LOG_LINE_FALLBACK_PATTERN.match(line)
+    if not match:
+        return None
+    
+    timestamp_str, level, message, sensor_value, battery_level = match.groups()
+    
+    try:
+        # Parse the timestamp
+        timestamp_ns, utc_offset = parse_timestamp(timestamp_str)
+    except (ValueError, TypeError):
+        # Skip entries with invalid timestamps
+        return None
+    
+    # Create a structured log entry
+    entry = {
+        "timestamp_ns": timestamp_ns,
+        "level": level,
+        "message": message
+    }
+    if utc_offset is not None:
+        entry["utc_offset"] = utc_offset
+    
+    # Readings elsewhere than at the start of the message need a second search
+    if sensor_value is not None:
+        entry["sensor_value"] = int(sensor_value)
+    elif "Sensor reading:" in message:
+        sensor_match = SENSOR_PATTERN.search(message)
+        if sensor_match:
+            entry["sensor_value"] = int(sensor_match.group(1))
+    elif battery_level is not None:
+        entry["battery_level"] = int(battery_level)
+    elif "Battery level:" in message:
+        battery_match = BATTERY_PATTERN.search(message)
+        if battery_match:
+            entry["battery_level"] = int(battery_match.group(1))
+    
+    return entry
+
+def iter_log_entries(log_file: Union[BinaryIO, TextIO, Iterable[str]], errors: str = "replace") -> Iterator[Dict[str, Any]]:
+    """
+    Parses log entries lazily, one line at a time.
+    
+    Only the current line is held in memory, so logs of any size can be
+    parsed from an open file (see evidence_storage.open_evidence for
+    compressed evidence).
+    
+    Args:
+        log_file: A binary or text file handle, or any iterable of lines
+        errors: How to handle UTF-8 decoding errors in binary files (as for bytes.decode)
+        
+    Yields:
+        Dict: Each valid log entry, in file order, with its time as
+        "timestamp_ns" (see format_log_entry for the output form)
+    """
+    # Decode binary files in bulk rather than line by line
+    text_file = None
+    if isinstance(log_file, (io.RawIOBase, io.BufferedIOBase)):
+        if isinstance(log_file, io.RawIOBase):
+            # Unbuffered binary files would be read one byte at a time
+            log_file = io.BufferedReader(log_file, buffer_size=LOG_READ_BUFFER_SIZE)
+        text_file = log_file = io.TextIOWrapper(log_file, encoding="utf-8", errors=errors, newline="\n")
+    
+    try:
+        for entry in map(_parse_log_line, log_file):
+            if entry is not None:
+                yield entry
+    finally:
+        # Leave the caller's file open
+        if text_file is not None:
+            text_file.detach()
 
 def parse_log_file(log_content: str) -> List[Dict[str, Any]]:
     """
@@ -18,125 +253,340 @@ def parse_log_file(log_content: str) -> List[Dict[str, Any]]:
         log_content: The content of the log file
         
     Returns:
-        List[Dict]: A list of parsed log entries
+        List[Dict]: A list of parsed log entries, with ISO format timestamps
+    """
+    return [format_log_entry(entry) for entry in iter_log_entries(log_content.strip().split('\n'))]
+
+class _RunningStats:
+    """
+    Count, minimum, maximum and sum of a stream of values.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.sum = 0
+    
+    def add(self, value: float) -> None:
+        """
+        Accounts for one more value.
+        
+        Args:
+            value: The value
+        """
+        if not self.count:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.count += 1
+        self.sum += value
+    
+    def merge(self, other: "_RunningStats") -> None:
+        """
+        Accounts for the values another instance has seen.
+        
+        Args:
+            other: The other instance
+        """
+        if not other.count:
+            return
+        if not self.count or other.min < self.min:
+            self.min = other.min
+        if not self.count or other.max > self.max:
+            self.max = other.max
+        self.count += other.count
+        self.sum += other.sum
+    
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarizes the values seen.
+        
+        Returns:
+            Dict: The count, min, max and average of the values
+        """
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "avg": self.sum / self.count
+        }
+
+class LogEventSummary:
+    """
+    Running totals of parsed log entries, from which analyze_log_events
+    computes its results.
+    
+    Summaries of consecutive parts of a log can be merged, in log order,
+    into the summary of the whole log.
     """
-    # Define a regex pattern to match log entries
-    # Format: [timestamp] [level] message
-    pattern = r'\[(.*?)\] \[(.*?)\] (.*)'
     
-    parsed_entries = []
+    def __init__(self):
+        self.total_entries = 0
+        self.event_counts = {}
+        self.start_ns = self.end_ns = None
+        self.start_offset = self.end_offset = None
+        self.sensor_stats = _RunningStats()
+        self.battery_stats = _RunningStats()
     
-    # Process each line in the log content
-    for line in log_content.strip().split('\n'):
-        match = re.match(pattern, line)
-        if match:
-            timestamp_str, level, message = match.groups()
+    def update(self, parsed_logs: Iterable[Dict[str, Any]]) -> None:
+        """
+        Accounts for more log entries.
+        
+        Args:
+            parsed_logs: Parsed log entries, as a list or any iterable, with
+                either "timestamp_ns" or an ISO format "timestamp"
+        """
+        total_entries = self.total_entries
+        event_counts = self.event_counts
+        start_ns, start_offset = self.start_ns, self.start_offset
+        end_ns, end_offset = self.end_ns, self.end_offset
+        sensor_stats = self.sensor_stats
+        battery_stats = self.battery_stats
+        
+        # Process each log entry
+        for entry in parsed_logs:
+            total_entries += 1
+            
+            # Track the earliest and latest timestamps
+            timestamp_ns = entry.get("timestamp_ns")
+            if timestamp_ns is None:
+                timestamp_ns, utc_offset = parse_timestamp(entry["timestamp"])
+            else:
+                utc_offset = entry.get("utc_offset")
+            if start_ns is None or timestamp_ns < start_ns:
+                start_ns, start_offset = timestamp_ns, utc_offset
+            if end_ns is None or timestamp_ns > end_ns:
+                end_ns, end_offset = timestamp_ns, utc_offset
+            
+            # Count events by level
+            level = entry["level"]
+            event_counts[level] = event_counts.get(level, 0) + 1
             
-            try:
-                # Parse the timestamp
-                timestamp = datetime.fromisoformat(timestamp_str)
-                
-                # Create a structured log entry
-                entry = {
-                    "timestamp": timestamp.isoformat(),
-                    "level": level,
-                    "message": message
-                }
-                
-                # Extract additional information based on the message content
-                if "Sensor reading:" in message:
-                    # Extract sensor reading value
-                    sensor_match = re.search(r'Sensor reading: (\d+)', message)
-                    if sensor_match:
-                        entry["sensor_value"] = int(sensor_match.group(1))
-                
-                elif "Battery level:" in message:
-                    # Extract battery level
-                    battery_match = re.search(r'Battery level: (\d+)%', message)
-                    if battery_match:
-                        entry["battery_level"] = int(battery_match.group(1))
-                
-                parsed_entries.append(entry)
-            except (ValueError, TypeError):
-                # Skip entries with invalid timestamps
-                continue
-    
-    return parsed_entries
+            # Accumulate sensor readings and battery levels
+            if "sensor_value" in entry:
+                sensor_stats.add(entry["sensor_value"])
+            if "battery_level" in entry:
+                battery_stats.add(entry["battery_level"])
+        
+        self.total_entries = total_entries
+        self.start_ns, self.start_offset = start_ns, start_offset
+        self.end_ns, self.end_offset = end_ns, end_offset
+    
+    def add(self, entry: Dict[str, Any]) -> None:
+        """
+        Accounts for one more log entry.
+        
+        Args:
+            entry: The parsed log entry
+        """
+        self.update((entry,))
+    
+    def merge(self, other: "LogEventSummary") -> None:
+        """
+        Accounts for the entries of the part of the log following the part
+        this summary has seen.
+        
+        Args:
+            other: The summary of the following part
+        """
+        self.total_entries += other.total_entries
+        
+        # Of equal timestamps, the first in the log is kept
+        if other.start_ns is not None and (self.start_ns is None or other.start_ns < self.start_ns):
+            self.start_ns, self.start_offset = other.start_ns, other.start_offset
+        if other.end_ns is not None and (self.end_ns is None or other.end_ns > self.end_ns):
+            self.end_ns, self.end_offset = other.end_ns, other.end_offset
+        
+        for level, count in other.event_counts.items():
+            self.event_counts[level] = self.event_counts.get(level, 0) + count
+        
+        self.sensor_stats.merge(other.sensor_stats)
+        self.battery_stats.merge(other.battery_stats)
+    
+    def analysis(self) -> Dict[str, Any]:
+        """
+        Computes the analysis results.
+        
+        Returns:
+            Dict: Analysis results (see analyze_log_events)
+        """
+        if not self.total_entries:
+            return {"error": "No log entries to analyze"}
+        
+        # Calculate statistics
+        analysis = {
+            "total_entries": self.total_entries,
+            "start_time": format_timestamp(self.start_ns, self.start_offset),
+            "end_time": format_timestamp(self.end_ns, self.end_offset),
+            "duration_seconds": (self.end_ns - self.start_ns) // 1000 / 1000000,
+            "event_counts": dict(self.event_counts),
+            "error_count": self.event_counts.get("ERROR", 0),
+            "warning_count": self.event_counts.get("WARNING", 0)
+        }
+        
+        # Add sensor and battery statistics if available
+        if self.sensor_stats.count:
+            analysis["sensor_stats"] = self.sensor_stats.summary()
+        if self.battery_stats.count:
+            analysis["battery_stats"] = self.battery_stats.summary()
+        
+        return analysis
 
-def analyze_log_events(parsed_logs: List[Dict[str, Any]]) -> Dict[str, Any]:
+def analyze_log_events(parsed_logs: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Analyzes parsed log entries to extract insights.
     
+    The entries are consumed in a single pass keeping only running totals,
+    so a stream of entries (see iter_log_entries) is analyzed in constant
+    memory.
+    
     Args:
-        parsed_logs: A list of parsed log entries
+        parsed_logs: Parsed log entries, as a list or any iterable, with
+            either "timestamp_ns" or an ISO format "timestamp"
         
     Returns:
         Dict: Analysis results
     """
-    if not parsed_logs:
-        return {"error": "No log entries to analyze"}
-    
-    # Initialize counters and collectors
-    event_counts = {}
-    error_events = []
-    warning_events = []
-    sensor_readings = []
-    battery_levels = []
-    
-    # Collect the earliest and latest timestamps
-    timestamps = [datetime.fromisoformat(entry["timestamp"]) for entry in parsed_logs]
-    start_time = min(timestamps)
-    end_time = max(timestamps)
-    
-    # Process each log entry
-    for entry in parsed_logs:
-        # Count events by level
-        level = entry["level"]
-        event_counts[level] = event_counts.get(level, 0) + 1
-        
-        # Collect error and warning events
-        if level == "ERROR":
-            error_events.append(entry)
-        elif level == "WARNING":
-            warning_events.append(entry)
-        
-        # Collect sensor readings and battery levels
-        if "sensor_value" in entry:
-            sensor_readings.append(entry["sensor_value"])
-        
-        if "battery_level" in entry:
-            battery_levels.append(entry["battery_level"])
-    
-    # Calculate statistics
-    analysis = {
-        "total_entries": len(parsed_logs),
-        "start_time": start_time.isoformat(),
-        "end_time": end_time.isoformat(),
-        "duration_seconds": (end_time - start_time).total_seconds(),
-        "event_counts": event_counts,
-        "error_count": len(error_events),
-        "warning_count": len(warning_events)
-    }
+    summary = LogEventSummary()
+    summary.update(parsed_logs)
+    return summary.analysis()
+
+def split_log_file(file_path: str, shard_count: int) -> List[Tuple[int, int]]:
+    """
+    Splits a raw log file into byte ranges of about equal size, each ending
+    at a line boundary.
     
-    # Add sensor statistics if available
-    if sensor_readings:
-        analysis["sensor_stats"] = {
-            "count": len(sensor_readings),
-            "min": min(sensor_readings),
-            "max": max(sensor_readings),
-            "avg": sum(sensor_readings) / len(sensor_readings)
-        }
+    Args:
+        file_path: The path to the log file
+        shard_count: The number of ranges wanted
+        
+    Returns:
+        List[Tuple[int, int]]: The start and end offset of each non-empty
+        range, in file order (fewer than shard_count for files with few lines)
+    """
+    size = os.path.getsize(file_path)
+    boundaries = [0]
     
-    # Add battery statistics if available
-    if battery_levels:
-        analysis["battery_stats"] = {
-            "count": len(battery_levels),
-            "min": min(battery_levels),
-            "max": max(battery_levels),
-            "avg": sum(battery_levels) / len(battery_levels)
-        }
+    with open(file_path, 'rb') as f:
+        for shard in range(1, shard_count):
+            position = max(size * shard // shard_count, boundaries[-1], 1)
+            
+            # Move to the start of the next line, unless the split point is
+            # already at one (just after a newline)
+            position -= 1
+            f.seek(position)
+            while True:
+                block = f.read(LOG_READ_BUFFER_SIZE)
+                newline = block.find(b"\n")
+                if newline >= 0:
+                    position += newline + 1
+                    break
+                position += len(block)
+                if not block:
+                    break
+            
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
     
-    return analysis
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+def _summarize_log_range(file_path: str, start: int, end: int, format_entry: Optional[Callable[[Dict[str, Any]], Any]],
+                         errors: str) -> Tuple[LogEventSummary, Optional[List[Any]]]:
+    """
+    Parses and summarizes one byte range of a raw log file (run in a worker process).
+    
+    Args:
+        file_path: The path to the log file
+        start: The offset of the range's first line
+        end: The offset just past the range's last line
+        format_entry: Converts each entry to the form returned, or None to return no entries
+        errors: How to handle UTF-8 decoding errors (as for bytes.decode)
+        
+    Returns:
+        Tuple: The range's summary, and its formatted entries
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    
+    summary = LogEventSummary()
+    entries = iter_log_entries(io.BytesIO(data), errors=errors)
+    if format_entry is None:
+        summary.update(entries)
+        return summary, None
+    
+    formatted = []
+    
+    def keep_formatted(entries):
+        for entry in entries:
+            formatted.append(format_entry(entry))
+            yield entry
+    
+    summary.update(keep_formatted(entries))
+    return summary, formatted
+
+def iter_log_file_shards(file_path: str, max_workers: Optional[int] = None,
+                         format_entry: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                         errors: str = "replace") -> Iterator[Tuple[LogEventSummary, Optional[List[Any]]]]:
+    """
+    Parses a raw (uncompressed) log file in parallel.
+    
+    The file is split into byte ranges at line boundaries (see
+    split_log_file), which a pool of worker processes parse independently.
+    Merging the summaries in the order yielded gives the summary of the
+    whole file, exactly as a sequential pass would.
+    
+    Args:
+        file_path: The path to the log file
+        max_workers: Number of worker processes (defaults to the CPU count)
+        format_entry: Converts each parsed entry, in the worker, to the form
+            returned (a module-level function, so that it can be pickled), or
+            None to return summaries only
+        errors: How to handle UTF-8 decoding errors (as for bytes.decode)
+        
+    Yields:
+        Tuple: The summary of each range and its formatted entries (None
+        without format_entry), in file order
+    """
+    workers = max_workers or os.cpu_count() or 1
+    size = os.path.getsize(file_path)
+    # Several ranges per worker even out their load; none is large enough
+    # to strain a worker's memory
+    shard_count = max(workers * LOG_SHARDS_PER_WORKER, -(-size // LOG_SHARD_SIZE))
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, end in split_log_file(file_path, shard_count):
+            pending.append(pool.submit(_summarize_log_range, file_path, start, end, format_entry, errors))
+            # Bound the number of finished ranges waiting to be consumed
+            if len(pending) > 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def analyze_log_file_parallel(file_path: str, max_workers: Optional[int] = None, errors: str = "replace") -> Dict[str, Any]:
+    """
+    Analyzes a raw (uncompressed) log file across worker processes, with the
+    same results as analyze_log_events gives for the file's entries.
+    
+    Args:
+        file_path: The path to the log file
+        max_workers: Number of worker processes (defaults to the CPU count)
+        errors: How to handle UTF-8 decoding errors (as for bytes.decode)
+        
+    Returns:
+        Dict: Analysis results
+    """
+    summary = LogEventSummary()
+    for shard_summary, _ in iter_log_file_shards(file_path, max_workers, errors=errors):
+        summary.merge(shard_summary)
+    return summary.analysis()
 
 def parse_config_file(config_content: str) -> Dict[str, Any]:
     """
@@ -260,12 +710,27 @@ def extract_events_by_keyword(parsed_logs: List[Dict[str, Any]], keyword: str) -
     """
     return [entry for entry in parsed_logs if keyword.lower() in entry["message"].lower()]
 
+def _entry_timestamp_ns(entry: Dict[str, Any]) -> int:
+    """
+    Returns the time of a parsed log entry, in either form.
+    
+    Args:
+        entry: The parsed log entry
+        
+    Returns:
+        int: The nanoseconds since the epoch
+    """
+    if "timestamp_ns" in entry:
+        return entry["timestamp_ns"]
+    return parse_timestamp(entry["timestamp"])[0]
+
 def extract_time_range(parsed_logs: List[Dict[str, Any]], start_time: str, end_time: str) -> List[Dict[str, Any]]:
     """
     Extracts log events within a specific time range.
     
     Args:
-        parsed_logs: A list of parsed log entries
+        parsed_logs: A list of parsed log entries, with either "timestamp_ns"
+            or an ISO format "timestamp"
         start_time: The start time in ISO format
         end_time: The end time in ISO format
         
@@ -273,12 +738,12 @@ def extract_time_range(parsed_logs: List[Dict[str, Any]], start_time: str, end_t
         List[Dict]: Filtered log entries
     """
     try:
-        start = datetime.fromisoformat(start_time)
-        end = datetime.fromisoformat(end_time)
+        start = parse_timestamp(start_time)[0]
+        end = parse_timestamp(end_time)[0]
         
         return [
             entry for entry in parsed_logs 
-            if start <= datetime.fromisoformat(entry["timestamp"]) <= end
+            if start <= _entry_timestamp_ns(entry) <= end
         ]
     except ValueError:
         # Return empty list if time format is invalid
@@ -5,16 +5,23 @@ This module provides a command-line interface for the IoT forensic application
 using the Click library.
 """
 
+import asyncio
 import os
 import click
+import itertools
 import json
+import textwrap
 from datetime import datetime
 from typing import Dict, List, Any
 
 from src import knowledge_base as kb
 from src import acquisition as acq
 from src import analysis as anl
+from src import log_columns
 from src import reporting as rep
+from src import synthetic_corpus
+from src import evidence_storage
+from src import network_acquisition as net
 import cv2
 import time
 import src.video_acquisition as va
@@ -64,17 +71,87 @@ def kb_add(name, manufacturer, model, os, storage_type, data_paths, protocols, c
     click.echo(f"Device added successfully with ID: {device_id}")
 
 @kb_cmd.command("list")
-def kb_list():
-    """List all devices in the knowledge base."""
-    devices = kb.list_devices()
+@click.option("--added-from", type=click.DateTime(), help="Only list devices added at or after this time")
+@click.option("--added-to", type=click.DateTime(), help="Only list devices added at or before this time")
+@click.option("--limit", type=click.IntRange(min=1), help="Maximum number of devices to list (one page)")
+@click.option("--after", help="List devices after this device ID (cursor from the previous page)")
+@click.option("--fields", help="Fields to show (comma-separated, e.g. id,name,os)")
+def kb_list(added_from, added_to, limit, after, fields):
+    """List all devices in the knowledge base.
     
-    if not devices:
+    Devices are listed in ID order: generated DEV_<ULID> IDs sort in the order
+    the devices were added, and legacy DEV_YYYYmmddHHMMSS IDs sort after all
+    of them. With --added-from/--added-to, devices are listed oldest first.
+    """
+    if (added_from or added_to) and (limit or after):
+        raise click.UsageError("--limit and --after cannot be combined with --added-from/--added-to")
+    
+    field_list = None
+    if fields:
+        field_list = [field.strip() for field in fields.split(",") if field.strip()]
+    
+    next_cursor = None
+    try:
+        if added_from or added_to:
+            devices = kb.list_devices_added_between(added_from, added_to)
+        elif limit:
+            devices, next_cursor = kb.list_devices_page(limit, after=after, fields=field_list)
+        else:
+            devices = kb.iter_devices(after=after, fields=field_list)
+        
+        devices = iter(devices)
+        first_device = next(devices, None)
+    except ValueError as e:
+        click.echo(f"Listing failed: {e}")
+        return
+    
+    if first_device is None:
         click.echo("No devices found in the knowledge base.")
         return
     
     click.echo("\nDevices in the knowledge base:")
     click.echo("-" * 80)
     
+    for device in itertools.chain([first_device], devices):
+        if field_list:
+            for field in field_list:
+                click.echo(f"{field}: {device.get(field, '')}")
+        else:
+            click.echo(f"ID: {device['id']}")
+            click.echo(f"Name: {device['name']}")
+            click.echo(f"Manufacturer: {device['manufacturer']}")
+            click.echo(f"Model: {device['model']}")
+        click.echo("-" * 80)
+    
+    if next_cursor:
+        click.echo(f"More devices available: use --after {next_cursor}")
+
+@kb_cmd.command("search")
+@click.argument("query", nargs=-1)
+def kb_search(query):
+    """Search devices by free text and field=value filters (e.g. protocol=Zigbee manufacturer=Acme)."""
+    terms = []
+    filters = {}
+    for part in query:
+        if "=" in part:
+            field, value = part.split("=", 1)
+            filters[field] = value
+        else:
+            terms.append(part)
+    
+    try:
+        devices = kb.search_devices(terms, filters)
+    except ValueError as e:
+        click.echo(f"Search failed: {e}")
+        return
+    
+    if not devices:
+        click.echo("No matching devices found.")
+        return
+    
+    click.echo(f"\n{len(devices)} matching device(s):")
+    click.echo("-" * 80)
+    
     for device in devices:
         click.echo(f"ID: {device['id']}")
         click.echo(f"Name: {device['name']}")
@@ -169,6 +246,50 @@ def kb_delete(device_id):
     else:
         click.echo(f"Device with ID {device_id} not found.")
 
+@kb_cmd.command("import")
+@click.argument("file_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "file_format", type=click.Choice(["csv", "jsonl"]), help="File format (detected from the extension by default)")
+def kb_import(file_path, file_format):
+    """Import devices from a CSV or JSONL file."""
+    try:
+        results = kb.import_devices_from_file(file_path, file_format)
+    except ValueError as e:
+        click.echo(f"Import failed: {e}")
+        return
+    
+    for row_number, error in results["errors"]:
+        click.echo(f"Row {row_number}: {error}")
+    
+    click.echo(f"Imported {len(results['added'])} device(s), {len(results['errors'])} error(s).")
+
+@kb_cmd.command("export")
+@click.argument("file_path", type=click.Path(dir_okay=False))
+@click.option("--format", "file_format", type=click.Choice(["csv", "jsonl"]), help="File format (detected from the extension by default)")
+def kb_export(file_path, file_format):
+    """Export all devices to a CSV or JSONL file."""
+    try:
+        count = kb.export_devices(file_path, file_format)
+    except ValueError as e:
+        click.echo(f"Export failed: {e}")
+        return
+    
+    click.echo(f"Exported {count} device(s) to {file_path}")
+
+@kb_cmd.command("compact")
+def kb_compact():
+    """Fold the knowledge base journal back into the JSON file."""
+    kb.compact_kb()
+    
+    click.echo("Knowledge base compacted.")
+
+@kb_cmd.command("migrate")
+def kb_migrate():
+    """Migrate the JSON knowledge base into the SQLite database."""
+    migrated = kb.migrate_to_sqlite()
+    
+    click.echo(f"Migrated {migrated} device(s) to {kb.kb_sqlite.KB_DB_PATH}")
+    click.echo("Set IOT_KB_BACKEND=sqlite to use the SQLite knowledge base.")
+
 # Acquisition Commands
 @cli.group()
 def acquire():
@@ -179,7 +300,11 @@ def acquire():
 @click.argument("device_id")
 @click.option("--source-type", required=True, type=click.Choice(["log", "config"]), help="Type of data to acquire")
 @click.option("--output-file", help="Name of the output file")
-def acquire_simulate(device_id, source_type, output_file):
+@click.option("--size", type=click.IntRange(min=0), help="Approximate size of the acquired data in bytes")
+@click.option("--seed", type=int, help="Generate reproducible content with this seed")
+@click.option("--compress", type=click.Choice(["gzip", "lzma"]), help="Store the acquired data compressed")
+@click.option("--dedup", is_flag=True, help="Store the data in the object store, shared with identical acquisitions")
+def acquire_simulate(device_id, source_type, output_file, size, seed, compress, dedup):
     """Simulate data acquisition from a device."""
     # Check if the device exists
     device = kb.get_device(device_id)
@@ -191,7 +316,11 @@ def acquire_simulate(device_id, source_type, output_file):
     output_path, sha256_hash, timestamp = acq.simulate_acquisition(
         device_id=device_id,
         source_type=source_type,
-        output_filename=output_file
+        output_filename=output_file,
+        size=size,
+        seed=seed,
+        compression=compress,
+        dedup=dedup
     )
     
     click.echo(f"Acquisition completed successfully.")
@@ -199,13 +328,207 @@ def acquire_simulate(device_id, source_type, output_file):
     click.echo(f"SHA256 hash: {sha256_hash}")
     click.echo(f"Timestamp: {timestamp}")
 
+@acquire.command("filesystem")
+@click.argument("source", type=click.Path(exists=True, file_okay=False))
+@click.argument("device_id")
+@click.option("--workers", default=8, show_default=True, type=click.IntRange(min=1), help="Maximum number of files acquired at once")
+def acquire_filesystem(source, device_id, workers):
+    """Acquire the files matching a device's data paths from a mounted image or directory."""
+    device = kb.get_device(device_id)
+    if not device:
+        click.echo(f"Device with ID {device_id} not found.")
+        return
+    
+    data_paths = device.get("data_paths") or []
+    if not data_paths:
+        click.echo(f"Device {device_id} has no data paths in the knowledge base.")
+        return
+    
+    started = time.time()
+    acquired = failed = total_bytes = 0
+    for result in acq.acquire_filesystem(source, device_id, data_paths, max_workers=workers):
+        if result["status"] == "done":
+            acquired += 1
+            total_bytes += result["metadata"]["file_size"]
+            click.echo(f"{result['metadata']['source_path']} -> {result['metadata']['file_path']}")
+        else:
+            failed += 1
+            click.echo(f"FAILED {result['source_path']}: {result['error']}")
+    elapsed = max(time.time() - started, 1e-9)
+    
+    click.echo("-" * 80)
+    click.echo(f"Acquired {acquired} file(s), {total_bytes} bytes in {elapsed:.2f}s "
+               f"({total_bytes / elapsed / 1024 / 1024:.1f} MiB/s); {failed} failed.")
+    if failed:
+        click.get_current_context().exit(1)
+
+@acquire.command("image")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.argument("device_id")
+@click.option("--source-type", default="image", show_default=True, help="Type of data acquired")
+@click.option("--restart", is_flag=True, help="Discard an interrupted acquisition of SOURCE instead of resuming it")
+def acquire_image(source, device_id, source_type, restart):
+    """Acquire a large image file, resuming an interrupted acquisition of it."""
+    device = kb.get_device(device_id)
+    if not device:
+        click.echo(f"Device with ID {device_id} not found.")
+        return
+    
+    # Only reported once the checkpoint and partial data have been checked
+    def report_resume(output_path, offset):
+        click.echo(f"Resuming {output_path} from its checkpoint at byte {offset}...")
+    
+    output_path, sha256_hash, timestamp = acq.acquire_image(source, device_id, source_type=source_type,
+                                                            resume=not restart, on_resume=report_resume)
+    
+    click.echo(f"Acquisition completed successfully.")
+    click.echo(f"Output file: {output_path}")
+    click.echo(f"SHA256 hash: {sha256_hash}")
+    click.echo(f"Timestamp: {timestamp}")
+
+@acquire.command("network")
+@click.option("--target", "targets", multiple=True, type=(str, click.Choice(["log", "config"]), str),
+              metavar="DEVICE_ID SOURCE_TYPE URL",
+              help="Endpoint to acquire from, as http://host[:port]/path or tcp://host:port[/command] (repeatable)")
+@click.option("--per-host", default=net.DEFAULT_PER_HOST_LIMIT, show_default=True, type=click.IntRange(min=1), help="Maximum number of connections to one host at once")
+@click.option("--max-connections", default=net.DEFAULT_MAX_CONNECTIONS, show_default=True, type=click.IntRange(min=1), help="Maximum number of connections open at once, idle ones included")
+@click.option("--timeout", default=net.DEFAULT_TIMEOUT, show_default=True, type=click.FloatRange(min=0, min_open=True), help="Timeout in seconds for connecting and for each read")
+@click.option("--compress", type=click.Choice(["gzip", "lzma"]), help="Store the acquired data compressed")
+@click.option("--dedup", is_flag=True, help="Store the data in the object store, shared with identical acquisitions")
+def acquire_network(targets, per_host, max_connections, timeout, compress, dedup):
+    """Acquire data from many devices' network endpoints concurrently."""
+    if not targets:
+        click.echo("No targets to acquire from. Use --target.")
+        return
+    
+    missing = sorted({device_id for device_id, _, _ in targets if not kb.get_device(device_id)})
+    if missing:
+        click.echo(f"Device(s) not found: {', '.join(missing)}")
+        return
+    
+    async def run():
+        failed = 0
+        results = net.acquire_targets(targets, per_host_limit=per_host, max_connections=max_connections,
+                                      timeout=timeout, compression=compress, dedup=dedup)
+        done = 0
+        async for result in results:
+            done += 1
+            job = f"[{done}/{len(targets)}] {result['device_id']} {result['source_type']} {result['url']}"
+            if result["status"] == "done":
+                click.echo(f"{job}: {result['output_path']} (SHA256 {result['sha256_hash']})")
+            else:
+                failed += 1
+                click.echo(f"{job}: FAILED ({result['error']})")
+        return failed
+    
+    click.echo(f"Acquiring from {len(targets)} endpoint(s), up to {per_host} connection(s) per host...")
+    failed = asyncio.run(run())
+    click.echo(f"Network acquisition completed: {len(targets) - failed} succeeded, {failed} failed.")
+    if failed:
+        click.get_current_context().exit(1)
+
+@acquire.command("generate-corpus")
+@click.argument("output_file")
+@click.option("--type", "corpus_type", default="log", show_default=True, type=click.Choice(["log", "config"]), help="Type of corpus to generate")
+@click.option("--size", required=True, type=click.IntRange(min=0), help="Size of the corpus in bytes")
+@click.option("--seed", default=0, show_default=True, type=int, help="Seed of the random generator")
+@click.option("--level-mix", help="Relative weight of each log level, e.g. INFO=70,WARNING=20,ERROR=5,DEBUG=5")
+@click.option("--sensor-ratio", default=0.1, show_default=True, type=click.FloatRange(0, 1), help="Fraction of log lines that are sensor readings")
+@click.option("--battery-ratio", default=0.1, show_default=True, type=click.FloatRange(0, 1), help="Fraction of log lines that are battery levels")
+@click.option("--start", help="Time of the first log line (YYYY-MM-DDTHH:MM:SS)")
+@click.option("--span-hours", default=24.0, show_default=True, type=click.FloatRange(min=0), help="Time covered by the log corpus, in hours")
+def acquire_generate_corpus(output_file, corpus_type, size, seed, level_mix, sensor_ratio, battery_ratio, start, span_hours):
+    """Generate a reproducible synthetic log or config corpus for load testing."""
+    try:
+        level_weights = None
+        if level_mix:
+            level_weights = {}
+            for item in level_mix.split(","):
+                level, weight = item.split("=")
+                level_weights[level.strip().upper()] = float(weight)
+        start_time = datetime.fromisoformat(start) if start else None
+        
+        if corpus_type == "log":
+            chunks = synthetic_corpus.generate_log_corpus(
+                size,
+                seed=seed,
+                level_weights=level_weights,
+                sensor_ratio=sensor_ratio,
+                battery_ratio=battery_ratio,
+                start=start_time,
+                span_seconds=int(span_hours * 3600)
+            )
+        else:
+            chunks = synthetic_corpus.generate_config_corpus(size, seed=seed)
+        
+        started = time.time()
+        written = 0
+        with open(output_file, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        elapsed = time.time() - started
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        return
+    
+    click.echo(f"Wrote {written} bytes to {output_file} in {elapsed:.2f}s.")
+
+@acquire.command("batch")
+@click.option("--device-id", "device_ids", multiple=True, help="ID of a device to acquire from (repeatable)")
+@click.option("--all-devices", is_flag=True, help="Acquire from every device in the knowledge base")
+@click.option("--source-type", "source_types", multiple=True, type=click.Choice(["log", "config"]), help="Type of data to acquire (repeatable, defaults to all)")
+@click.option("--workers", default=8, show_default=True, type=click.IntRange(min=1), help="Maximum number of concurrent acquisitions")
+@click.option("--compress", type=click.Choice(["gzip", "lzma"]), help="Store the acquired data compressed")
+@click.option("--dedup", is_flag=True, help="Store the data in the object store, shared with identical acquisitions")
+def acquire_batch(device_ids, all_devices, source_types, workers, compress, dedup):
+    """Acquire data from many devices concurrently."""
+    if all_devices:
+        device_ids = [device["id"] for device in kb.iter_devices(fields=["id"])]
+    else:
+        missing = [device_id for device_id in device_ids if not kb.get_device(device_id)]
+        if missing:
+            click.echo(f"Device(s) not found: {', '.join(missing)}")
+            return
+    
+    if not device_ids:
+        click.echo("No devices to acquire from. Use --device-id or --all-devices.")
+        return
+    
+    source_types = source_types or ("log", "config")
+    total = len(device_ids) * len(source_types)
+    failed = 0
+    
+    click.echo(f"Running {total} acquisition(s) with up to {workers} at a time...")
+    for done, result in enumerate(acq.run_acquisition_batch(device_ids, source_types, max_workers=workers, compression=compress, dedup=dedup), 1):
+        job = f"[{done}/{total}] {result['device_id']} {result['source_type']}"
+        if result["status"] == "done":
+            click.echo(f"{job}: {result['output_path']} (SHA256 {result['sha256_hash']})")
+        else:
+            failed += 1
+            click.echo(f"{job}: FAILED ({result['error']})")
+    
+    click.echo(f"Batch completed: {total - failed} succeeded, {failed} failed.")
+    if failed:
+        click.get_current_context().exit(1)
+
 @acquire.command("verify")
 @click.argument("file_path")
 @click.argument("expected_hash")
-def acquire_verify(file_path, expected_hash):
+@click.option("--also", "extra_algorithms", multiple=True, type=click.Choice(["md5", "sha1", "blake2b"]), help="Also compute this hash in the same pass (repeatable)")
+@click.option("--force", is_flag=True, help="Re-read the file even if its hash is cached")
+@click.option("--raw", is_flag=True, help="Hash the stored bytes of compressed files instead of their content")
+def acquire_verify(file_path, expected_hash, extra_algorithms, force, raw):
     """Verify the integrity of an acquired file."""
-    # Verify the file integrity
-    is_intact = acq.verify_file_integrity(file_path, expected_hash)
+    if os.path.exists(file_path):
+        # Compute SHA256 and any extra digests in one pass over the file
+        compression = None if raw else acq.stored_compression(file_path)
+        digests, cached = acq.hash_file_cached(file_path, ("sha256",) + extra_algorithms, force=force, compression=compression)
+        is_intact = digests["sha256"] == expected_hash.strip().lower()
+        click.echo(f"Hash cache: {'hit' if cached else 'miss'}")
+    else:
+        is_intact = False
+        digests = {}
     
     if is_intact:
         click.echo(f"File integrity verified: {file_path}")
@@ -213,11 +536,70 @@ def acquire_verify(file_path, expected_hash):
     else:
         click.echo(f"File integrity check failed: {file_path}")
         click.echo(f"Expected hash: {expected_hash}")
+    
+    for algorithm in extra_algorithms:
+        if algorithm in digests:
+            click.echo(f"{algorithm.upper()}: {digests[algorithm]}")
+
+@acquire.command("verify-chunks")
+@click.argument("file_path")
+@click.option("--workers", type=click.IntRange(min=1), help="Number of worker threads (defaults to the CPU count)")
+def acquire_verify_chunks(file_path, workers):
+    """Verify an acquired file chunk by chunk and locate corrupted byte ranges."""
+    result = acq.verify_chunks(file_path, max_workers=workers)
+    
+    if result["status"] == "error":
+        click.echo(f"Cannot verify {file_path}: {result['error']}")
+    elif result["status"] == "missing":
+        click.echo(f"File not found: {file_path}")
+    elif result["status"] == "ok":
+        click.echo(f"All chunks verified: {file_path}")
+    else:
+        click.echo(f"File integrity check failed: {file_path}")
+        for start, end in result["corrupted_ranges"]:
+            click.echo(f"  Corrupted bytes {start}-{end - 1}")
+        if result["trailing_bytes"]:
+            click.echo(f"  {result['trailing_bytes']} unexpected trailing byte(s)")
+    
+    if result["status"] != "ok":
+        click.get_current_context().exit(1)
+
+@acquire.command("verify-all")
+@click.option("--workers", type=click.IntRange(min=1), help="Number of worker processes (defaults to the CPU count)")
+@click.option("--force", is_flag=True, help="Re-read every file even if its hash is cached")
+def acquire_verify_all(workers, force):
+    """Re-verify every acquisition against the hash in its .meta file."""
+    counts = {"ok": 0, "mismatch": 0, "missing": 0, "error": 0}
+    cache_hits = 0
+    
+    for result in acq.verify_all_acquisitions(max_workers=workers, force=force):
+        counts[result["status"]] += 1
+        cache_hits += result["cached"]
+        if result["status"] == "ok":
+            click.echo(f"OK        {result['file_path']}")
+        elif result["status"] == "mismatch":
+            click.echo(f"MISMATCH  {result['file_path']} (expected {result['expected_hash']}, got {result['actual_hash']})")
+        elif result["status"] == "missing":
+            click.echo(f"MISSING   {result['file_path']}")
+        else:
+            click.echo(f"ERROR     {result['file_path']}: {result.get('error')}")
+    
+    total = sum(counts.values())
+    click.echo("-" * 80)
+    click.echo(f"Verified {total} acquisition(s): {counts['ok']} OK, {counts['mismatch']} mismatched, "
+               f"{counts['missing']} missing, {counts['error']} error(s).")
+    hashed = counts["ok"] + counts["mismatch"]
+    click.echo(f"Hash cache: {cache_hits} hit(s), {hashed - cache_hits} miss(es).")
+    
+    if total != counts["ok"]:
+        click.get_current_context().exit(1)
 
 @acquire.command("list")
-def acquire_list():
+@click.option("--device-id", help="Only list acquisitions from this device")
+@click.option("--source-type", help="Only list acquisitions of this source type")
+def acquire_list(device_id, source_type):
     """List all acquisitions."""
-    acquisitions = acq.list_acquisitions()
+    acquisitions = acq.find_acquisitions(device_id=device_id, source_type=source_type)
     
     if not acquisitions:
         click.echo("No acquisitions found.")
@@ -235,6 +617,26 @@ def acquire_list():
         click.echo(f"  SHA256 Hash: {acquisition['sha256_hash']}")
         click.echo("-" * 80)
 
+@acquire.command("rebuild-catalog")
+def acquire_rebuild_catalog():
+    """Rebuild the acquisition catalog from the .meta files."""
+    count = acq.rebuild_catalog()
+    click.echo(f"Catalog rebuilt with {count} acquisition(s).")
+
+@acquire.command("gc")
+@click.option("--dry-run", is_flag=True, help="Only report what would be removed")
+def acquire_gc(dry_run):
+    """Remove object store blobs no acquisition references."""
+    result = acq.gc_objects(dry_run=dry_run)
+    action = "Would remove" if dry_run else "Removed"
+    click.echo(f"{action} {result['removed']} blob(s), freeing {result['freed_bytes']} bytes; kept {result['kept']}.")
+    
+    stats = acq.storage_stats()
+    click.echo(f"Acquisitions: {stats['acquisitions']} ({stats['unique_files']} unique stored file(s))")
+    click.echo(f"Logical size: {stats['logical_bytes']} bytes")
+    click.echo(f"Stored size: {stats['stored_bytes']} bytes")
+    click.echo(f"Deduplication savings: {stats['saved_bytes']} bytes")
+
 # Analysis Commands
 @cli.group()
 def analyze():
@@ -244,22 +646,61 @@ def analyze():
 @analyze.command("parse-log")
 @click.argument("file_path")
 @click.option("--output-file", help="Path to save the parsed results")
-def analyze_parse_log(file_path, output_file):
+@click.option("--parallel", is_flag=True, help="Parse byte ranges of the file in worker processes")
+@click.option("--workers", type=click.IntRange(min=1), help="Number of worker processes for --parallel (defaults to the CPU count)")
+@click.option("--level", help="Only keep entries of this level (e.g. ERROR)")
+@click.option("--time-range", nargs=2, metavar="START END", help="Only keep entries between these ISO format times (inclusive)")
+def analyze_parse_log(file_path, output_file, parallel, workers, level, time_range):
     """Parse a log file and extract structured information."""
     # Check if the file exists
     if not os.path.exists(file_path):
         click.echo(f"File not found: {file_path}")
         return
     
-    # Read the file content
-    with open(file_path, 'r') as f:
-        log_content = f.read()
+    filtered = level is not None or bool(time_range)
+    if parallel and filtered:
+        raise click.UsageError("--parallel cannot be combined with --level or --time-range")
+    for bound in time_range or ():
+        try:
+            anl.parse_timestamp(bound)
+        except ValueError:
+            raise click.BadParameter(f"Invalid ISO format time: {bound}", param_hint="--time-range") from None
     
-    # Parse the log file
-    parsed_logs = anl.parse_log_file(log_content)
+    # Only evidence its metadata says was stored compressed is decompressed
+    compression = acq.stored_compression(file_path)
+    if parallel and compression:
+        # Compressed content cannot be split at arbitrary offsets
+        click.echo("Compressed log files are parsed sequentially.")
+        parallel = False
     
-    # Analyze the parsed logs
-    analysis_results = anl.analyze_log_events(parsed_logs)
+    if parallel:
+        # Parse and analyze byte ranges of the log concurrently, merging in file order
+        if output_file:
+            shards = anl.iter_log_file_shards(file_path, max_workers=workers, format_entry=_log_entry_json)
+            with open(output_file, 'w') as out:
+                analysis_results = _analyze_log_shards_to_json(shards, out)
+        else:
+            analysis_results = anl.analyze_log_file_parallel(file_path, max_workers=workers)
+    elif filtered:
+        # Selecting entries needs the whole log at hand, held as compact columns
+        with evidence_storage.open_evidence(file_path, compression) as f:
+            columns = log_columns.parse_log_columns(f)
+        if level is not None:
+            columns = log_columns.extract_events_by_type(columns, level)
+        if time_range:
+            columns = log_columns.extract_time_range(columns, *time_range)
+        analysis_results = log_columns.analyze_log_events(columns)
+        if output_file:
+            with open(output_file, 'w') as out:
+                _write_log_json(map(_log_entry_json, columns.iter_entries()), lambda: analysis_results, out)
+    else:
+        # Parse and analyze the log in one streaming pass, decompressing it if needed
+        with evidence_storage.open_evidence(file_path, compression) as f:
+            if output_file:
+                with open(output_file, 'w') as out:
+                    analysis_results = _analyze_log_to_json(anl.iter_log_entries(f), out)
+            else:
+                analysis_results = anl.analyze_log_events(anl.iter_log_entries(f))
     
     # Display a summary
     click.echo(f"\nLog Analysis Summary:")
@@ -275,19 +716,89 @@ def analyze_parse_log(file_path, output_file):
     click.echo(f"\nError Events: {analysis_results.get('error_count', 0)}")
     click.echo(f"Warning Events: {analysis_results.get('warning_count', 0)}")
     
-    # Save the results if an output file is specified
     if output_file:
-        output_data = {
-            "parsed_logs": parsed_logs,
-            "analysis_results": analysis_results
-        }
+        click.echo(f"\nResults saved to: {output_file}")
+
+def _log_entry_json(entry) -> str:
+    """
+    Formats a parsed log entry as it appears in a JSON results file.
+    
+    Args:
+        entry: The parsed log entry
         
-        with open(output_file, 'w') as f:
-            json.dump(output_data, f, indent=4)
+    Returns:
+        str: The entry's JSON, indented for the "parsed_logs" list
+    """
+    return textwrap.indent(json.dumps(anl.format_log_entry(entry), indent=4), " " * 8)
+
+def _write_log_json(entry_texts, analysis, out) -> Dict[str, Any]:
+    """
+    Writes a JSON results file, without holding the parsed entries in memory.
+    
+    The file has the layout json.dump(..., indent=4) gives
+    {"parsed_logs": [...], "analysis_results": {...}}.
+    
+    Args:
+        entry_texts: The entries, formatted by _log_entry_json
+        analysis: Returns the analysis results, called once entry_texts is exhausted
+        out: The text file to write to
         
-        click.echo(f"\nResults saved to: {output_file}")
+    Returns:
+        Dict: The analysis results
+    """
+    written = 0
+    out.write('{\n    "parsed_logs": [')
+    for text in entry_texts:
+        out.write(",\n" if written else "\n")
+        out.write(text)
+        written += 1
+    
+    analysis_results = analysis()
+    out.write("\n    ],\n" if written else "],\n")
+    out.write('    "analysis_results": ' + textwrap.indent(json.dumps(analysis_results, indent=4), " " * 4)[4:])
+    out.write("\n}")
+    return analysis_results
+
+def _analyze_log_to_json(entries, out) -> Dict[str, Any]:
+    """
+    Analyzes parsed log entries while writing them to a JSON results file.
+    
+    Args:
+        entries: The parsed log entries
+        out: The text file to write to
+        
+    Returns:
+        Dict: The analysis results
+    """
+    summary = anl.LogEventSummary()
+    
+    def entry_texts():
+        for entry in entries:
+            summary.add(entry)
+            yield _log_entry_json(entry)
     
-    return parsed_logs, analysis_results
+    return _write_log_json(entry_texts(), summary.analysis, out)
+
+def _analyze_log_shards_to_json(shards, out) -> Dict[str, Any]:
+    """
+    Merges the results of a parallel parse (see analysis.iter_log_file_shards)
+    into a JSON results file, identical to the one _analyze_log_to_json writes.
+    
+    Args:
+        shards: Each range's summary and entries formatted by _log_entry_json, in file order
+        out: The text file to write to
+        
+    Returns:
+        Dict: The analysis results
+    """
+    summary = anl.LogEventSummary()
+    
+    def entry_texts():
+        for shard_summary, texts in shards:
+            summary.merge(shard_summary)
+            yield from texts
+    
+    return _write_log_json(entry_texts(), summary.analysis, out)
 
 @analyze.command("parse-config")
 @click.argument("file_path")
@@ -299,8 +810,8 @@ def analyze_parse_config(file_path, output_file):
         click.echo(f"File not found: {file_path}")
         return
     
-    # Read the file content
-    with open(file_path, 'r') as f:
+    # Read the file content, decompressing it if needed
+    with evidence_storage.open_evidence_text(file_path, acq.stored_compression(file_path)) as f:
         config_content = f.read()
     
     # Parse the configuration file
@@ -495,12 +1006,7 @@ def report_generate(case_name, investigator, device_id, acquisition_ids, log_fil
     
     # Get the acquisition details
     acquisition_timestamps = [timestamp.strip() for timestamp in acquisition_ids.split(",")]
-    acquisitions = acq.list_acquisitions()
-    
-    acquisition_details = []
-    for acquisition in acquisitions:
-        if acquisition["timestamp"] in acquisition_timestamps:
-            acquisition_details.append(acquisition)
+    acquisition_details = acq.find_acquisitions(timestamps=acquisition_timestamps)
     
     if not acquisition_details:
         click.echo("No matching acquisitions found.")
@@ -533,7 +1039,8 @@ def report_generate(case_name, investigator, device_id, acquisition_ids, log_fil
         device_info=device,
         acquisition_details=acquisition_details,
         analysis_results=analysis_results,
-        notes=notes
+        notes=notes,
+        storage_stats=acq.storage_stats(acquisition_details)
     )
     
     click.echo(f"Report generated successfully: {report_path}")
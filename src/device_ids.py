@@ -0,0 +1,120 @@
+"""
+IoT Device ID Module
+
+This module generates unique, time-sortable device IDs and recovers the time a
+device was added from its ID.
+
+New IDs have the form DEV_<ULID>: a 26 character Crockford base32 string made
+of a 48-bit millisecond timestamp followed by 80 random bits. IDs generated in
+the same millisecond are kept in order by incrementing the random part, so IDs
+from one process sort in creation order. Legacy DEV_YYYYmmddHHMMSS IDs are
+still understood.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+DEVICE_ID_PREFIX = "DEV_"
+
+# Crockford's base32 alphabet, as used by ULIDs
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_LENGTH = 26
+RANDOM_BITS = 80
+
+# Format of the legacy, second-resolution device IDs
+LEGACY_ID_FORMAT = "%Y%m%d%H%M%S"
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+def _encode_ulid(timestamp_ms: int, randomness: int) -> str:
+    """
+    Encodes a timestamp and random part as a ULID string.
+
+    Args:
+        timestamp_ms: Milliseconds since the Unix epoch (48 bits)
+        randomness: The random part (80 bits)
+
+    Returns:
+        str: The 26 character ULID
+    """
+    value = (timestamp_ms << RANDOM_BITS) | randomness
+    chars = []
+    for _ in range(ULID_LENGTH):
+        chars.append(ULID_ALPHABET[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+def generate_device_id() -> str:
+    """
+    Generates a new unique, monotonically increasing device ID.
+
+    Returns:
+        str: The new device ID (DEV_ followed by a ULID)
+    """
+    global _last_ms, _last_random
+
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), "big")
+        else:
+            # Same (or earlier) millisecond: keep IDs strictly increasing
+            _last_random += 1
+            if _last_random >> RANDOM_BITS:
+                _last_ms += 1
+                _last_random = 0
+        return DEVICE_ID_PREFIX + _encode_ulid(_last_ms, _last_random)
+
+def device_id_timestamp(device_id: str) -> Optional[float]:
+    """
+    Recovers the creation time encoded in a device ID.
+
+    Args:
+        device_id: A ULID-based or legacy DEV_YYYYmmddHHMMSS device ID
+
+    Returns:
+        float or None: Seconds since the Unix epoch, or None if the ID does not
+        encode a time
+    """
+    if not device_id.startswith(DEVICE_ID_PREFIX):
+        return None
+    body = device_id[len(DEVICE_ID_PREFIX):]
+
+    if len(body) == ULID_LENGTH and all(char in ULID_ALPHABET for char in body):
+        value = 0
+        for char in body[:10]:
+            value = (value << 5) | ULID_ALPHABET.index(char)
+        return value / 1000
+
+    try:
+        return datetime.strptime(body[:14], LEGACY_ID_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+def device_added_at(device: Dict[str, Any]) -> Optional[float]:
+    """
+    Determines when a device was added to the knowledge base.
+
+    The time encoded in the device ID is used when available, falling back to
+    the device's date_added field.
+
+    Args:
+        device: The device record
+
+    Returns:
+        float or None: Seconds since the Unix epoch, or None if unknown
+    """
+    added_at = device_id_timestamp(device.get("id", ""))
+    if added_at is not None:
+        return added_at
+
+    try:
+        return datetime.fromisoformat(device.get("date_added", "")).timestamp()
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,196 @@
+"""
+IoT Device Evidence Storage Module
+
+This module provides the optional compressed storage format for acquired
+evidence. Data is split into fixed-size frames, each compressed as an
+independent gzip member or xz stream, so the stored file is a valid gzip or xz
+file as a whole and any frame can also be decompressed on its own. Readers
+take the codec from the acquisition's metadata: an acquired file that happens
+to be compressed is evidence as it stands, not something to decompress.
+"""
+
+import bisect
+import gzip
+import io
+import lzma
+import zlib
+from typing import BinaryIO, Dict, List, Optional, TextIO
+
+# Supported compression codecs and the extension added to their files
+COMPRESSION_EXTENSIONS = {
+    "gzip": ".gz",
+    "lzma": ".xz"
+}
+
+# Uncompressed size of each independently decompressible frame
+DEFAULT_FRAME_SIZE = 4 * 1024 * 1024
+
+def compress_frame(data: bytes, compression: str) -> bytes:
+    """
+    Compresses one frame as a standalone gzip member or xz stream.
+
+    Args:
+        data: The uncompressed frame
+        compression: The codec ("gzip" or "lzma")
+
+    Returns:
+        bytes: The compressed frame
+
+    Raises:
+        ValueError: If the codec is not supported
+    """
+    if compression == "gzip":
+        # A fixed mtime keeps the output reproducible
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == "lzma":
+        return lzma.compress(data)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+def decompress_frame(data: bytes, compression: str) -> bytes:
+    """
+    Decompresses one frame.
+
+    Args:
+        data: The compressed frame
+        compression: The codec ("gzip" or "lzma")
+
+    Returns:
+        bytes: The uncompressed frame
+
+    Raises:
+        ValueError: If the codec is not supported or the frame is corrupted
+    """
+    try:
+        if compression == "gzip":
+            return gzip.decompress(data)
+        if compression == "lzma":
+            return lzma.decompress(data)
+    except (OSError, EOFError, zlib.error, lzma.LZMAError) as e:
+        raise ValueError(f"Corrupted {compression} frame: {e}") from e
+    raise ValueError(f"Unsupported compression: {compression}")
+
+class FrameWriter:
+    """
+    Writes data to a binary file as a sequence of independently compressed frames.
+
+    The index of the frames written is available from the frames attribute once
+    the writer is closed. Each entry gives a frame's uncompressed offset and
+    size and its stored (compressed) offset and size.
+    """
+
+    def __init__(self, fileobj: BinaryIO, compression: str, frame_size: Optional[int] = None):
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        self.fileobj = fileobj
+        self.compression = compression
+        self.frame_size = frame_size or DEFAULT_FRAME_SIZE
+        self.frames: List[Dict[str, int]] = []
+        self.size = 0
+        self.stored_size = 0
+        self._pending = bytearray()
+
+    def write(self, data: bytes) -> None:
+        """
+        Buffers data, compressing and writing every frame that fills up.
+
+        Args:
+            data: The uncompressed data to write
+        """
+        self._pending += data
+        while len(self._pending) >= self.frame_size:
+            self._write_frame(bytes(self._pending[:self.frame_size]))
+            del self._pending[:self.frame_size]
+
+    def close(self) -> None:
+        """
+        Writes the last, partial frame. The underlying file is left open.
+        """
+        if self._pending:
+            self._write_frame(bytes(self._pending))
+            self._pending.clear()
+
+    def _write_frame(self, data: bytes) -> None:
+        """
+        Compresses and writes one frame, recording it in the index.
+
+        Args:
+            data: The uncompressed frame
+        """
+        compressed = compress_frame(data, self.compression)
+        self.fileobj.write(compressed)
+        self.frames.append({
+            "offset": self.size,
+            "size": len(data),
+            "stored_offset": self.stored_size,
+            "stored_size": len(compressed)
+        })
+        self.size += len(data)
+        self.stored_size += len(compressed)
+
+def open_evidence(file_path: str, compression: Optional[str] = None) -> BinaryIO:
+    """
+    Opens an evidence file for reading its uncompressed content.
+
+    The codec comes from the acquisition's metadata rather than the file's
+    magic bytes, so acquired files that are themselves compressed (rotated
+    .gz logs, say) are read as the bytes they were acquired as.
+
+    Args:
+        file_path: The path to the file
+        compression: The codec the file was stored with ("gzip" or "lzma"),
+            or None for raw files
+
+    Returns:
+        BinaryIO: A binary reader, decompressing if the file was stored compressed
+    """
+    if compression == "gzip":
+        return gzip.open(file_path, 'rb')
+    if compression == "lzma":
+        return lzma.open(file_path, 'rb')
+    if compression is not None:
+        raise ValueError(f"Unsupported compression: {compression}")
+    return open(file_path, 'rb', buffering=0)
+
+def open_evidence_text(file_path: str, compression: Optional[str] = None, errors: str = "strict") -> TextIO:
+    """
+    Opens an evidence file for reading its uncompressed content as UTF-8 text.
+
+    Args:
+        file_path: The path to the file
+        compression: The codec the file was stored with, or None for raw files
+        errors: How to handle decoding errors (as for open)
+
+    Returns:
+        TextIO: A text reader, decompressing if the file was stored compressed
+    """
+    return io.TextIOWrapper(io.BufferedReader(open_evidence(file_path, compression)), encoding="utf-8", errors=errors)
+
+def read_range(file_path: str, compression: str, frames: List[Dict[str, int]], offset: int, length: int) -> bytes:
+    """
+    Reads a range of uncompressed content, decompressing only the frames it spans.
+
+    Args:
+        file_path: The path to the file
+        compression: The file's codec
+        frames: The file's frame index
+        offset: Uncompressed offset of the range
+        length: Length of the range in bytes
+
+    Returns:
+        bytes: The content in the range (shorter if it extends past the end)
+    """
+    if length <= 0 or not frames:
+        return b""
+
+    first = max(bisect.bisect_right([frame["offset"] for frame in frames], offset) - 1, 0)
+    parts = []
+    end = offset + length
+    with open(file_path, 'rb') as f:
+        for frame in frames[first:]:
+            if frame["offset"] >= end:
+                break
+            f.seek(frame["stored_offset"])
+            data = decompress_frame(f.read(frame["stored_size"]), compression)
+            parts.append(data[max(offset - frame["offset"], 0):end - frame["offset"]])
+
+    return b"".join(parts)
@@ -0,0 +1,102 @@
+"""
+Advisory File Locking Module
+
+This module provides inter-process advisory locks on lock files, used to
+coordinate several CLI or GUI processes working on the same data directory.
+Locks are re-entrant within a process: nested acquisitions of a lock the
+current thread already holds do not touch the operating system lock again.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Per-path process-local state: a thread lock, the open lock file and nesting depth
+_held: Dict[str, Dict] = {}
+_held_guard = threading.Lock()
+
+def _os_lock(fd: int, shared: bool) -> None:
+    """
+    Takes the operating system lock on an open lock file, blocking until granted.
+
+    Args:
+        fd: The lock file descriptor
+        shared: Whether a shared (read) lock is sufficient
+    """
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        return
+
+    # msvcrt only offers exclusive locks; poll until the first byte is free
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.01)
+
+def _os_unlock(fd: int) -> None:
+    """
+    Releases the operating system lock on an open lock file.
+
+    Args:
+        fd: The lock file descriptor
+    """
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def locked(lock_path: str, shared: bool = False) -> Iterator[None]:
+    """
+    Holds an advisory lock on a lock file for the duration of a with block.
+
+    Args:
+        lock_path: Path of the lock file (created if missing)
+        shared: Take a shared lock allowing other readers, instead of an exclusive one
+
+    Raises:
+        RuntimeError: If an exclusive lock is requested while the current thread
+        only holds a shared one
+    """
+    key = os.path.abspath(lock_path)
+    with _held_guard:
+        state = _held.setdefault(key, {"thread_lock": threading.RLock(), "fd": None, "depth": 0, "shared": False})
+
+    with state["thread_lock"]:
+        if state["depth"] == 0:
+            lock_dir = os.path.dirname(key)
+            if not os.path.exists(lock_dir):
+                os.makedirs(lock_dir, exist_ok=True)
+            fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _os_lock(fd, shared)
+            except BaseException:
+                os.close(fd)
+                raise
+            state["fd"] = fd
+            state["shared"] = shared
+        elif state["shared"] and not shared:
+            raise RuntimeError(f"Cannot upgrade a shared lock on {lock_path} to exclusive")
+
+        state["depth"] += 1
+        try:
+            yield
+        finally:
+            state["depth"] -= 1
+            if state["depth"] == 0:
+                fd, state["fd"] = state["fd"], None
+                try:
+                    _os_unlock(fd)
+                finally:
+                    os.close(fd)
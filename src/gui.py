@@ -9,10 +9,11 @@ import src.video_acquisition as va # Added
 import src.video_analysis as vanl # Added
 # Existing src imports like knowledge_base, acquisition, analysis, reporting
 # Make sure these are correctly imported as per existing structure. For example:
-from src.knowledge_base import list_devices as kb_list_devices, get_device as kb_get_device, add_device, delete_device, update_device
+from src.knowledge_base import iter_devices as kb_iter_devices, get_device as kb_get_device, add_device, delete_device, update_device
 import src.acquisition as acq
 import src.analysis as anl
 import src.reporting as rep
+import src.evidence_storage as evidence_storage
 
 # Placeholder for actual forensic data store - This might be removed if not used by the final GUI structure
 # forensic_data_store = {} # Commenting out as it seems unused in the provided final structure
@@ -111,13 +112,13 @@ class App(tk.Tk):
 
     def refresh_kb_device_list(self):
         self.kb_device_listbox.delete(0, tk.END)
-        devices = kb_list_devices()
-        if not devices:
+        found = False
+        for device in kb_iter_devices(fields=["id", "name"]):
+            found = True
+            self.kb_device_listbox.insert(tk.END, f"{device.get('name') or 'Unknown Name'} (ID: {device.get('id') or 'Unknown ID'})")
+        if not found:
             self.kb_device_listbox.insert(tk.END, "No devices found in Knowledge Base.")
             self.update_kb_device_details_display(None)
-            return
-        for device in devices:
-            self.kb_device_listbox.insert(tk.END, f"{device.get('name', 'Unknown Name')} (ID: {device.get('id', 'Unknown ID')})")
 
     def on_kb_device_select(self, event=None):
         selection = self.kb_device_listbox.curselection()
@@ -398,8 +399,8 @@ class App(tk.Tk):
 
     def refresh_acq_sim_device_combo(self):
         try:
-            devices = kb_list_devices()
-            device_ids = [f"{d.get('name', 'Unknown')} (ID: {d.get('id', 'Unknown')})" for d in devices]
+            devices = kb_iter_devices(fields=["id", "name"])
+            device_ids = [f"{d.get('name') or 'Unknown'} (ID: {d.get('id') or 'Unknown'})" for d in devices]
             self.acq_sim_device_id_combo['values'] = device_ids
             if device_ids: self.acq_sim_device_id_combo.set(device_ids[0])
         except Exception as e:
@@ -573,18 +574,21 @@ class App(tk.Tk):
             messagebox.showerror("Error", f"Log file not found:\n{filepath}", parent=self)
             return
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f: log_content = f.read()
-            if not log_content.strip():
+            if os.path.getsize(filepath) == 0:
                 self._update_text_widget(self.log_analysis_results_text, "Log file is empty.")
                 return
-            parsed_logs = anl.parse_log_file(log_content)
-            if not parsed_logs:
+            first_entries = []
+            def keep_first_entries(entries):
+                for entry in entries:
+                    if len(first_entries) < 5: first_entries.append(entry)
+                    yield entry
+            with evidence_storage.open_evidence(filepath, acq.stored_compression(filepath)) as f: analysis_results = anl.analyze_log_events(keep_first_entries(anl.iter_log_entries(f, errors='ignore')))
+            if not first_entries:
                  self._update_text_widget(self.log_analysis_results_text, "No parsable log entries found or file format is unsupported by the current parser.")
                  return
-            analysis_results = anl.analyze_log_events(parsed_logs)
             output = "--- Parsed Log Summary (First 5 entries) ---\n"
-            for entry in parsed_logs[:5]: output += f"Timestamp: {entry.get('timestamp')}, Level: {entry.get('level')}, Message: {entry.get('message')[:100]}...\n"
-            if len(parsed_logs) > 5: output += f"... and {len(parsed_logs) - 5} more entries.\n"
+            for entry in map(anl.format_log_entry, first_entries): output += f"Timestamp: {entry.get('timestamp')}, Level: {entry.get('level')}, Message: {entry.get('message')[:100]}...\n"
+            if analysis_results["total_entries"] > 5: output += f"... and {analysis_results['total_entries'] - 5} more entries.\n"
             output += "\n--- Analysis Results ---\n"
             output += json.dumps(analysis_results, indent=4)
             self._update_text_widget(self.log_analysis_results_text, output)
@@ -608,7 +612,7 @@ class App(tk.Tk):
             messagebox.showerror("Error", f"Config file not found:\n{filepath}", parent=self)
             return
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f: config_content = f.read()
+            with evidence_storage.open_evidence_text(filepath, acq.stored_compression(filepath), errors='ignore') as f: config_content = f.read()
             if not config_content.strip():
                 self._update_text_widget(self.config_analysis_results_text, "Configuration file is empty.")
                 return
@@ -698,8 +702,8 @@ class App(tk.Tk):
 
     def refresh_report_device_combo(self):
         try:
-            devices = kb_list_devices()
-            device_display_list = [f"{d.get('name', 'Unknown')} (ID: {d.get('id', 'Unknown')})" for d in devices]
+            devices = kb_iter_devices(fields=["id", "name"])
+            device_display_list = [f"{d.get('name') or 'Unknown'} (ID: {d.get('id') or 'Unknown'})" for d in devices]
             self.report_device_id_combo['values'] = device_display_list
             if device_display_list: self.report_device_id_combo.current(0)
         except Exception as e:
@@ -735,12 +739,11 @@ class App(tk.Tk):
         acq_scrollbar = ttk.Scrollbar(listbox_frame, orient=tk.VERTICAL, command=acq_listbox.yview)
         acq_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         acq_listbox.config(yscrollcommand=acq_scrollbar.set)
-        all_acquisitions = acq.list_acquisitions()
+        device_acquisitions = acq.find_acquisitions(device_id=device_id_filter)
         self._dialog_acq_data = []
-        for item in all_acquisitions:
+        for item in device_acquisitions:
             acq_id = item.get('id', item.get('timestamp'))
             display_text = f"{item.get('device_id', 'N/A')} ({item.get('source_type', 'N/A')}) - {acq_id}"
-            if device_id_filter and item.get('device_id') != device_id_filter: continue
             acq_listbox.insert(tk.END, display_text)
             self._dialog_acq_data.append((display_text, item.get('id', item.get('file_path'))))
         def on_ok():
@@ -774,22 +777,20 @@ class App(tk.Tk):
             return
         selected_acq_file_paths = [s.strip() for s in acq_ids_str.split(',') if s.strip()]
         acquisition_details_for_report = []
-        all_acqs = acq.list_acquisitions()
+        selected_acqs = {acq_item['file_path']: acq_item for acq_item in acq.find_acquisitions(file_paths=selected_acq_file_paths)}
         for fp_id in selected_acq_file_paths:
-            found_acq = next((acq_item for acq_item in all_acqs if acq_item.get('file_path') == fp_id), None)
+            found_acq = selected_acqs.get(fp_id)
             if found_acq: acquisition_details_for_report.append(found_acq)
             else: print(f"Warning: Acquisition with ID/Path '{fp_id}' not found in full list.")
         analysis_data_for_report = {}
         if log_file_path and os.path.exists(log_file_path):
             try:
-                with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as f: log_content = f.read()
-                parsed_logs = anl.parse_log_file(log_content)
-                analysis_data_for_report["log_analysis"] = anl.analyze_log_events(parsed_logs)
+                with evidence_storage.open_evidence(log_file_path, acq.stored_compression(log_file_path)) as f: analysis_data_for_report["log_analysis"] = anl.analyze_log_events(anl.iter_log_entries(f, errors='ignore'))
             except Exception as e:
                 messagebox.showwarning("Report Gen Warning", f"Could not process log file {log_file_path}: {e}", parent=self)
         if config_file_path and os.path.exists(config_file_path):
             try:
-                with open(config_file_path, 'r', encoding='utf-8', errors='ignore') as f: config_content = f.read()
+                with evidence_storage.open_evidence_text(config_file_path, acq.stored_compression(config_file_path), errors='ignore') as f: config_content = f.read()
                 parsed_config = anl.parse_config_file(config_content)
                 if "error" not in parsed_config: analysis_data_for_report["config_analysis"] = anl.analyze_config(parsed_config)
                 else: analysis_data_for_report["config_analysis"] = parsed_config
@@ -799,7 +800,7 @@ class App(tk.Tk):
         if "log_analysis" in analysis_data_for_report: final_analysis_results.update(analysis_data_for_report["log_analysis"])
         if "config_analysis" in analysis_data_for_report: final_analysis_results.update(analysis_data_for_report["config_analysis"])
         try:
-            report_path = rep.generate_report(case_name=case_name, investigator=investigator_name, device_info=device_info, acquisition_details=acquisition_details_for_report, analysis_results=final_analysis_results, notes=notes)
+            report_path = rep.generate_report(case_name=case_name, investigator=investigator_name, device_info=device_info, acquisition_details=acquisition_details_for_report, analysis_results=final_analysis_results, notes=notes, storage_stats=acq.storage_stats(acquisition_details_for_report))
             messagebox.showinfo("Success", f"Report generated successfully:\n{report_path}", parent=self)
             self.refresh_reports_list()
             self.report_case_name_entry.delete(0, tk.END)
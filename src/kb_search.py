@@ -0,0 +1,181 @@
+"""
+IoT Device Knowledge Base Search Module
+
+This module provides an in-memory inverted index over device records, used to
+answer free-text and faceted (field=value) queries against the knowledge base.
+The index is updated incrementally as devices are added, updated or deleted.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Device fields covered by the index
+SEARCH_FIELDS = [
+    "name", "manufacturer", "model", "os", "storage_type", "data_paths",
+    "communication_protocols", "cloud_service", "notes"
+]
+
+# Short filter names accepted in addition to the field names
+FILTER_ALIASES = {
+    "protocol": "communication_protocols",
+    "protocols": "communication_protocols",
+    "path": "data_paths",
+    "paths": "data_paths",
+    "cloud": "cloud_service",
+    "storage": "storage_type"
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase alphanumeric search tokens.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        List[str]: The tokens found in the text
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+def resolve_filter_field(name: str) -> str:
+    """
+    Resolves a filter name (or alias) to the device field it applies to.
+
+    Args:
+        name: The filter name, e.g. "protocol" or "manufacturer"
+
+    Returns:
+        str: The device field name
+
+    Raises:
+        ValueError: If the name does not refer to a searchable field
+    """
+    field = FILTER_ALIASES.get(name.lower(), name.lower())
+    if field not in SEARCH_FIELDS:
+        raise ValueError(f"Unknown search field: {name}")
+    return field
+
+def _field_values(device: Dict[str, Any], field: str) -> List[str]:
+    """
+    Returns the values of a device field as a list of strings.
+
+    Args:
+        device: The device record
+        field: The field name
+
+    Returns:
+        List[str]: The field's values (list fields yield one value per item)
+    """
+    value = device.get(field)
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [str(value)]
+
+class DeviceSearchIndex:
+    """
+    Inverted index over device records supporting free-text and facet queries.
+
+    Free-text terms match whole tokens in any indexed field. Facet filters match
+    a field's value (or any item of a list field) exactly, ignoring case.
+    """
+
+    def __init__(self, devices: Iterable[Dict[str, Any]] = ()):
+        self._tokens: Dict[str, Set[str]] = {}
+        self._facets: Dict[tuple, Set[str]] = {}
+        self._doc_keys: Dict[str, tuple] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+        for device in devices:
+            self.add(device)
+
+    def __len__(self) -> int:
+        return len(self._doc_keys)
+
+    def add(self, device: Dict[str, Any]) -> None:
+        """
+        Adds a device to the index, replacing any previous entry with the same ID.
+
+        Args:
+            device: The device record
+        """
+        device_id = device["id"]
+        if device_id in self._doc_keys:
+            self._unindex(device_id)
+        else:
+            self._order[device_id] = self._next_order
+            self._next_order += 1
+
+        tokens = set()
+        facet_keys = set()
+        for field in SEARCH_FIELDS:
+            for value in _field_values(device, field):
+                tokens.update(tokenize(value))
+                facet_keys.add((field, value.strip().lower()))
+
+        for token in tokens:
+            self._tokens.setdefault(token, set()).add(device_id)
+        for key in facet_keys:
+            self._facets.setdefault(key, set()).add(device_id)
+        self._doc_keys[device_id] = (tokens, facet_keys)
+
+    def remove(self, device_id: str) -> None:
+        """
+        Removes a device from the index.
+
+        Args:
+            device_id: The ID of the device to remove
+        """
+        if device_id in self._doc_keys:
+            self._unindex(device_id)
+            del self._order[device_id]
+
+    def _unindex(self, device_id: str) -> None:
+        """
+        Removes a device's postings from the token and facet maps.
+
+        Args:
+            device_id: The ID of the indexed device
+        """
+        tokens, facet_keys = self._doc_keys.pop(device_id)
+        for postings, keys in ((self._tokens, tokens), (self._facets, facet_keys)):
+            for key in keys:
+                ids = postings[key]
+                ids.discard(device_id)
+                if not ids:
+                    del postings[key]
+
+    def search(self, terms: Iterable[str] = (), filters: Optional[Dict[str, str]] = None) -> List[str]:
+        """
+        Finds the devices matching all free-text terms and all filters.
+
+        Args:
+            terms: Free-text terms; every token of every term must match
+            filters: Field (or alias) to value filters
+
+        Returns:
+            List[str]: The IDs of the matching devices, in the order they were indexed
+        """
+        candidate_sets = []
+        for term in terms:
+            for token in tokenize(term):
+                candidate_sets.append(self._tokens.get(token, set()))
+        for name, value in (filters or {}).items():
+            key = (resolve_filter_field(name), value.strip().lower())
+            candidate_sets.append(self._facets.get(key, set()))
+
+        if not candidate_sets:
+            matches = set(self._doc_keys)
+        else:
+            candidate_sets.sort(key=len)
+            matches = set(candidate_sets[0])
+            for ids in candidate_sets[1:]:
+                if not matches:
+                    break
+                matches &= ids
+
+        return sorted(matches, key=self._order.__getitem__)
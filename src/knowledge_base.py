@@ -3,17 +3,98 @@ IoT Device Knowledge Base Manager Module
 
 This module provides functionality to manage a knowledge base of IoT devices.
 It allows adding, listing, retrieving, updating, and deleting device entries.
-The data is stored in a JSON file.
+The data is stored in a JSON file by default, or in an SQLite database when the
+"sqlite" backend is selected (see knowledge_base_sqlite).
+
+Changes to the JSON knowledge base are appended to a journal file next to it
+under an advisory lock, so several processes can add and update devices at
+once without rewriting the whole file. The journal is folded back into the
+JSON file by a background compaction once it grows large.
 """
 
+import bisect
+import csv
+import itertools
 import json
 import os
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, TextIO, Tuple
+
+from src import file_lock
+from src import knowledge_base_sqlite as kb_sqlite
+from src.kb_search import DeviceSearchIndex
+from src.device_ids import device_added_at, generate_device_id
 
 # Path to the knowledge base file
 KB_FILE_PATH = os.path.join("data", "device_knowledge_base.json")
 
+# Storage backend for the knowledge base: "json" or "sqlite"
+KB_BACKEND = os.environ.get("IOT_KB_BACKEND", "json")
+
+# Suffixes of the journal and lock files kept next to the JSON knowledge base
+JOURNAL_SUFFIX = ".journal"
+LOCK_SUFFIX = ".lock"
+
+# Journal size (in bytes) above which it is compacted into the JSON file
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# Device fields, in the column order used for import and export
+DEVICE_FIELDS = [
+    "id", "name", "manufacturer", "model", "os", "storage_type", "data_paths",
+    "communication_protocols", "cloud_service", "notes", "date_added"
+]
+
+# Fields that must be present when importing a device
+REQUIRED_FIELDS = [
+    "name", "manufacturer", "model", "os", "storage_type", "data_paths",
+    "communication_protocols", "cloud_service"
+]
+
+# Fields holding lists, stored as separator-joined text in CSV files
+LIST_FIELDS = ["data_paths", "communication_protocols"]
+CSV_LIST_SEPARATOR = ";"
+
+# Process-local cache of the JSON knowledge base, keyed on the file's identity
+# and the amount of journal already applied to it
+_kb_cache: Dict[str, Any] = {
+    "key": None, "journal_offset": 0, "generation": 0,
+    "data": None, "index": {}, "time_index": None, "sorted_ids": None
+}
+
+# Background compaction thread, if one is running
+_compaction: Dict[str, Optional[threading.Thread]] = {"thread": None}
+
+# In-memory search index and the knowledge base version it reflects
+_search_state: Dict[str, Any] = {"version": None, "index": None}
+
+def use_sqlite() -> bool:
+    """
+    Checks whether the SQLite backend is selected.
+
+    The first time the SQLite backend is used, an existing JSON knowledge base
+    is migrated into the new database automatically.
+
+    Returns:
+        bool: True if the SQLite backend is selected, False otherwise
+    """
+    if KB_BACKEND != "sqlite":
+        return False
+
+    if not os.path.exists(kb_sqlite.KB_DB_PATH):
+        kb_sqlite.migrate_from_json(KB_FILE_PATH)
+
+    return True
+
+def migrate_to_sqlite() -> int:
+    """
+    Migrates the devices in the JSON knowledge base file into the SQLite database.
+
+    Returns:
+        int: The number of devices migrated
+    """
+    return kb_sqlite.migrate_from_json(KB_FILE_PATH)
+
 def ensure_kb_file_exists() -> None:
     """
     Ensures that the knowledge base file exists.
@@ -26,16 +107,267 @@ def ensure_kb_file_exists() -> None:
         with open(KB_FILE_PATH, 'w') as f:
             json.dump({"devices": []}, f, indent=4)
 
+def _journal_path() -> str:
+    """
+    Returns the path of the journal file for the JSON knowledge base.
+    """
+    return KB_FILE_PATH + JOURNAL_SUFFIX
+
+def _lock_path() -> str:
+    """
+    Returns the path of the lock file for the JSON knowledge base.
+    """
+    return KB_FILE_PATH + LOCK_SUFFIX
+
+def _file_key() -> tuple:
+    """
+    Builds the cache key identifying the current state of the knowledge base file.
+    
+    Returns:
+        tuple: The file path, inode, modification time and size
+    """
+    stat = os.stat(KB_FILE_PATH)
+    return (KB_FILE_PATH, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def _journal_size() -> int:
+    """
+    Returns the current size of the journal file (0 if it does not exist).
+    """
+    try:
+        return os.path.getsize(_journal_path())
+    except FileNotFoundError:
+        return 0
+
+def _copy_device(device: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copies a device record so callers cannot modify the cached data.
+    
+    Args:
+        device: The device record to copy
+        
+    Returns:
+        Dict: A copy of the device record
+    """
+    return {key: list(value) if isinstance(value, list) else value for key, value in device.items()}
+
+def _set_cache(kb_data: Dict[str, List[Dict[str, Any]]], key: tuple) -> None:
+    """
+    Stores freshly loaded knowledge base data in the cache.
+    
+    Args:
+        kb_data: The knowledge base data read from the JSON file
+        key: The file key the data was read under
+    """
+    _kb_cache["key"] = key
+    _kb_cache["journal_offset"] = 0
+    _kb_cache["generation"] += 1
+    _kb_cache["data"] = kb_data
+    _kb_cache["index"] = {device["id"]: device for device in kb_data["devices"]}
+    _kb_cache["time_index"] = None
+    _kb_cache["sorted_ids"] = None
+
+def invalidate_cache() -> None:
+    """
+    Drops the cached knowledge base and search index so the next read parses
+    the file again.
+    """
+    _kb_cache["key"] = None
+    _kb_cache["journal_offset"] = 0
+    _kb_cache["data"] = None
+    _kb_cache["index"] = {}
+    _kb_cache["time_index"] = None
+    _kb_cache["sorted_ids"] = None
+    _search_state["index"] = None
+
+def _apply_op(op: Dict[str, Any]) -> None:
+    """
+    Applies one journal operation to the cached knowledge base.
+    
+    Operations are idempotent (adds replace, updates and deletes of missing
+    devices are ignored), so replaying a journal over a file that already
+    contains some of its changes yields the same result.
+    
+    Args:
+        op: The operation ("add", "update" or "delete")
+    """
+    devices = _kb_cache["data"]["devices"]
+    index = _kb_cache["index"]
+    
+    if op["op"] == "add":
+        device_id = op["device"]["id"]
+        existing = index.get(device_id)
+        if existing is None:
+            index[device_id] = dict(op["device"])
+            devices.append(index[device_id])
+            if _kb_cache["sorted_ids"] is not None:
+                bisect.insort(_kb_cache["sorted_ids"], device_id)
+        else:
+            existing.clear()
+            existing.update(op["device"])
+    elif op["op"] == "update":
+        device_id = op["id"]
+        if device_id in index:
+            index[device_id].update(op["changes"])
+    elif op["op"] == "delete":
+        device_id = op["id"]
+        existing = index.pop(device_id, None)
+        if existing is not None:
+            devices.remove(existing)
+            sorted_ids = _kb_cache["sorted_ids"]
+            if sorted_ids is not None:
+                del sorted_ids[bisect.bisect_left(sorted_ids, device_id)]
+    else:
+        return
+    
+    _kb_cache["time_index"] = None
+    
+    # The search index of the current generation follows the same operations
+    search_index = _search_state["index"]
+    if search_index is not None and _search_state["version"] == _json_search_version():
+        if device_id in index:
+            search_index.add(index[device_id])
+        else:
+            search_index.remove(device_id)
+
+def _replay_journal() -> None:
+    """
+    Applies journal entries appended since the cache was last updated.
+    
+    Only complete lines are applied; a trailing partial line left by an
+    interrupted writer is ignored.
+    """
+    offset = _kb_cache["journal_offset"]
+    if _journal_size() <= offset:
+        return
+    
+    with open(_journal_path(), 'rb') as f:
+        f.seek(offset)
+        pending = f.read()
+    
+    complete = pending.rfind(b"\n") + 1
+    for line in pending[:complete].splitlines():
+        try:
+            op = json.loads(line)
+        except ValueError:
+            # Skip lines corrupted by an interrupted writer
+            continue
+        _apply_op(op)
+    
+    _kb_cache["journal_offset"] = offset + complete
+
+def _load_cached() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Returns the cached knowledge base, re-reading the file only if it changed.
+    
+    New journal entries written by other processes are applied incrementally.
+    
+    Returns:
+        Dict: The cached knowledge base data (must not be modified by callers)
+    """
+    ensure_kb_file_exists()
+    with file_lock.locked(_lock_path(), shared=True):
+        key = _file_key()
+        if (_kb_cache["data"] is None or _kb_cache["key"] != key
+                or _journal_size() < _kb_cache["journal_offset"]):
+            with open(KB_FILE_PATH, 'r') as f:
+                _set_cache(json.load(f), key)
+        _replay_journal()
+    return _kb_cache["data"]
+
+def _append_journal(ops: List[Dict[str, Any]]) -> None:
+    """
+    Appends operations to the journal and applies them to the cache.
+    
+    Must be called while holding the exclusive knowledge base lock, after
+    _load_cached() has brought the cache up to date.
+    
+    Args:
+        ops: The operations to record
+    """
+    if not ops:
+        return
+    
+    lines = b"".join(json.dumps(op).encode('utf-8') + b"\n" for op in ops)
+    with open(_journal_path(), 'ab') as f:
+        # Drop a partial line left behind by an interrupted writer
+        if f.tell() > _kb_cache["journal_offset"]:
+            f.truncate(_kb_cache["journal_offset"])
+        f.write(lines)
+    
+    for op in ops:
+        _apply_op(op)
+    _kb_cache["journal_offset"] += len(lines)
+
+def _write_base(kb_data: Dict[str, List[Dict[str, Any]]]) -> tuple:
+    """
+    Atomically replaces the JSON file and empties the journal.
+    
+    Must be called while holding the exclusive knowledge base lock.
+    
+    Args:
+        kb_data: The complete knowledge base data to write
+        
+    Returns:
+        tuple: The file key of the new JSON file
+    """
+    tmp_path = KB_FILE_PATH + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(kb_data, f, indent=4)
+    os.replace(tmp_path, KB_FILE_PATH)
+    
+    # The operations are idempotent, so an interruption before the journal is
+    # emptied only causes them to be replayed harmlessly
+    with open(_journal_path(), 'wb'):
+        pass
+    
+    return _file_key()
+
+def compact_kb() -> None:
+    """
+    Folds the journal into the JSON knowledge base file.
+    """
+    if use_sqlite():
+        return
+    
+    ensure_kb_file_exists()
+    with file_lock.locked(_lock_path()):
+        kb_data = _load_cached()
+        if _kb_cache["journal_offset"] == 0 and _journal_size() == 0:
+            return
+        _kb_cache["key"] = _write_base(kb_data)
+        _kb_cache["journal_offset"] = 0
+
+def _maybe_compact() -> None:
+    """
+    Starts a background compaction if the journal has grown large.
+    
+    The thread is not a daemon, so a short-lived CLI process finishes the
+    compaction before exiting.
+    """
+    if _journal_size() < JOURNAL_COMPACT_BYTES:
+        return
+    
+    thread = _compaction["thread"]
+    if thread is not None and thread.is_alive():
+        return
+    
+    _compaction["thread"] = threading.Thread(target=compact_kb, name="kb-compaction")
+    _compaction["thread"].start()
+
 def load_kb() -> Dict[str, List[Dict[str, Any]]]:
     """
     Loads the knowledge base from the JSON file.
     
+    The file is only parsed again when its modification time or size changed
+    since the last load in this process.
+    
     Returns:
         Dict: The knowledge base data
     """
-    ensure_kb_file_exists()
-    with open(KB_FILE_PATH, 'r') as f:
-        return json.load(f)
+    if use_sqlite():
+        return {"devices": kb_sqlite.list_devices()}
+
+    return {"devices": [_copy_device(device) for device in _load_cached()["devices"]]}
 
 def save_kb(kb_data: Dict[str, List[Dict[str, Any]]]) -> None:
     """
@@ -44,9 +376,19 @@ def save_kb(kb_data: Dict[str, List[Dict[str, Any]]]) -> None:
     Args:
         kb_data (Dict): The knowledge base data to save
     """
+    if use_sqlite():
+        kb_sqlite.replace_all(kb_data["devices"])
+        return
+
     ensure_kb_file_exists()
-    with open(KB_FILE_PATH, 'w') as f:
-        json.dump(kb_data, f, indent=4)
+    kb_data = {"devices": [_copy_device(device) for device in kb_data["devices"]]}
+    with file_lock.locked(_lock_path()):
+        try:
+            key = _write_base(kb_data)
+        except Exception:
+            invalidate_cache()
+            raise
+        _set_cache(kb_data, key)
 
 def add_device(
     name: str,
@@ -76,10 +418,8 @@ def add_device(
     Returns:
         str: The ID of the newly added device
     """
-    kb_data = load_kb()
-    
     # Generate a unique ID
-    device_id = f"DEV_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    device_id = generate_device_id()
     
     # Create the device entry
     device = {
@@ -97,8 +437,15 @@ def add_device(
     }
     
     # Add the device to the knowledge base
-    kb_data["devices"].append(device)
-    save_kb(kb_data)
+    search_version = _search_version_before_write()
+    if use_sqlite():
+        kb_sqlite.insert_device(device)
+    else:
+        with file_lock.locked(_lock_path()):
+            _load_cached()
+            _append_journal([{"op": "add", "device": device}])
+        _maybe_compact()
+    _update_search_index(search_version, [device_id])
     
     return device_id
 
@@ -109,8 +456,95 @@ def list_devices() -> List[Dict[str, Any]]:
     Returns:
         List[Dict]: A list of all devices
     """
-    kb_data = load_kb()
-    return kb_data["devices"]
+    if use_sqlite():
+        return kb_sqlite.list_devices()
+
+    return load_kb()["devices"]
+
+def iter_devices(after: Optional[str] = None, fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the devices in the knowledge base one at a time.
+    
+    Devices are yielded in ID order (for generated IDs, the order they were
+    added) and copied (or projected) one by one, so listing a large
+    knowledge base does not build a full copy of it.
+    
+    Args:
+        after: Only yield devices whose ID sorts after this one (a cursor;
+            the device need not exist any more)
+        fields: Only include these fields in each yielded device (optional)
+        
+    Yields:
+        Dict: Each device
+    """
+    if use_sqlite():
+        devices = kb_sqlite.iter_devices(after)
+    else:
+        devices = _iter_cached_devices(after)
+    
+    for device in devices:
+        if fields is None:
+            yield _copy_device(device)
+        else:
+            yield {field: device.get(field) for field in fields}
+
+def _iter_cached_devices(after: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterates over the cached JSON knowledge base in ID order, starting after a cursor.
+    
+    Args:
+        after: The ID to start after (optional)
+        
+    Yields:
+        Dict: Each cached device (must not be modified)
+    """
+    _load_cached()
+    last_id = after
+    while True:
+        # Look the position up again for every device, so devices added or
+        # deleted while the caller consumes the iterator shift nothing
+        if _kb_cache["sorted_ids"] is None:
+            _kb_cache["sorted_ids"] = sorted(_kb_cache["index"])
+        sorted_ids = _kb_cache["sorted_ids"]
+        position = 0 if last_id is None else bisect.bisect_right(sorted_ids, last_id)
+        if position >= len(sorted_ids):
+            return
+        last_id = sorted_ids[position]
+        yield _kb_cache["index"][last_id]
+
+def list_devices_page(
+    limit: int,
+    after: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Returns one page of devices for cursor-based pagination.
+    
+    Args:
+        limit: The maximum number of devices in the page
+        after: The cursor returned with the previous page (optional)
+        fields: Only include these fields in each device (optional)
+        
+    Returns:
+        Tuple[List[Dict], Optional[str]]: The page of devices and the cursor for
+        the next page, or None if this is the last page
+        
+    Raises:
+        ValueError: If the limit is less than 1
+    """
+    if limit < 1:
+        raise ValueError("Page limit must be at least 1")
+    
+    devices = iter_devices(after=after)
+    page = list(itertools.islice(devices, limit + 1))
+    devices.close()
+    
+    next_cursor = page[limit - 1]["id"] if len(page) > limit else None
+    page = page[:limit]
+    if fields is not None:
+        page = [{field: device.get(field) for field in fields} for device in page]
+    
+    return page, next_cursor
 
 def get_device(device_id: str) -> Optional[Dict[str, Any]]:
     """
@@ -122,13 +556,73 @@ def get_device(device_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dict or None: The device data if found, None otherwise
     """
-    kb_data = load_kb()
+    if use_sqlite():
+        return kb_sqlite.get_device(device_id)
+
+    _load_cached()
+    device = _kb_cache["index"].get(device_id)
     
-    for device in kb_data["devices"]:
-        if device["id"] == device_id:
-            return device
+    return _copy_device(device) if device is not None else None
+
+def find_devices(manufacturer: Optional[str] = None, model: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Finds devices with an exact manufacturer and/or model.
     
-    return None
+    Args:
+        manufacturer: The manufacturer to match (optional)
+        model: The model to match (optional)
+        
+    Returns:
+        List[Dict]: The matching devices
+    """
+    if use_sqlite():
+        return kb_sqlite.find_devices(manufacturer=manufacturer, model=model)
+
+    return [
+        device for device in list_devices()
+        if (manufacturer is None or device["manufacturer"] == manufacturer)
+        and (model is None or device["model"] == model)
+    ]
+
+def list_devices_added_between(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Lists the devices added to the knowledge base between two instants.
+    
+    The time a device was added is taken from its ID (or its date_added field for
+    IDs that do not encode a time), and looked up through a sorted time index
+    instead of scanning every device.
+    
+    Args:
+        start: The start of the range (inclusive, unbounded if omitted)
+        end: The end of the range (inclusive, unbounded if omitted)
+        
+    Returns:
+        List[Dict]: The matching devices, oldest first
+    """
+    start_ts = start.timestamp() if start else float("-inf")
+    end_ts = end.timestamp() if end else float("inf")
+    
+    if use_sqlite():
+        return kb_sqlite.list_devices_added_between(start_ts, end_ts)
+
+    _load_cached()
+    if _kb_cache["time_index"] is None:
+        entries = sorted(
+            (added_at, position, device["id"])
+            for position, device in enumerate(_kb_cache["data"]["devices"])
+            for added_at in [device_added_at(device)]
+            if added_at is not None
+        )
+        _kb_cache["time_index"] = ([entry[0] for entry in entries], [entry[2] for entry in entries])
+    
+    times, device_ids = _kb_cache["time_index"]
+    first = bisect.bisect_left(times, start_ts)
+    last = bisect.bisect_right(times, end_ts)
+    
+    return [_copy_device(_kb_cache["index"][device_id]) for device_id in device_ids[first:last]]
 
 def update_device(
     device_id: str,
@@ -160,37 +654,36 @@ def update_device(
     Returns:
         bool: True if the device was updated, False otherwise
     """
-    kb_data = load_kb()
-    
-    for i, device in enumerate(kb_data["devices"]):
-        if device["id"] == device_id:
-            # Update only the provided fields
-            if name is not None:
-                device["name"] = name
-            if manufacturer is not None:
-                device["manufacturer"] = manufacturer
-            if model is not None:
-                device["model"] = model
-            if os is not None:
-                device["os"] = os
-            if storage_type is not None:
-                device["storage_type"] = storage_type
-            if data_paths is not None:
-                device["data_paths"] = data_paths
-            if communication_protocols is not None:
-                device["communication_protocols"] = communication_protocols
-            if cloud_service is not None:
-                device["cloud_service"] = cloud_service
-            if notes is not None:
-                device["notes"] = notes
-            
-            # Update the device in the knowledge base
-            kb_data["devices"][i] = device
-            save_kb(kb_data)
+    # Collect only the provided fields
+    changes = {
+        "name": name,
+        "manufacturer": manufacturer,
+        "model": model,
+        "os": os,
+        "storage_type": storage_type,
+        "data_paths": data_paths,
+        "communication_protocols": communication_protocols,
+        "cloud_service": cloud_service,
+        "notes": notes
+    }
+    changes = {field: value for field, value in changes.items() if value is not None}
+    
+    search_version = _search_version_before_write()
+    if use_sqlite():
+        if not kb_sqlite.update_device(device_id, changes):
+            return False
+    else:
+        with file_lock.locked(_lock_path()):
+            _load_cached()
+            if device_id not in _kb_cache["index"]:
+                return False
             
-            return True
+            # Record only the provided fields
+            _append_journal([{"op": "update", "id": device_id, "changes": changes}])
+        _maybe_compact()
     
-    return False
+    _update_search_index(search_version, [device_id])
+    return True
 
 def delete_device(device_id: str) -> bool:
     """
@@ -202,14 +695,345 @@ def delete_device(device_id: str) -> bool:
     Returns:
         bool: True if the device was deleted, False otherwise
     """
-    kb_data = load_kb()
-    
-    for i, device in enumerate(kb_data["devices"]):
-        if device["id"] == device_id:
-            # Remove the device from the knowledge base
-            kb_data["devices"].pop(i)
-            save_kb(kb_data)
+    search_version = _search_version_before_write()
+    if use_sqlite():
+        if not kb_sqlite.delete_device(device_id):
+            return False
+    else:
+        with file_lock.locked(_lock_path()):
+            _load_cached()
+            if device_id not in _kb_cache["index"]:
+                return False
             
-            return True
+            # Remove the device from the knowledge base
+            _append_journal([{"op": "delete", "id": device_id}])
+        _maybe_compact()
+    
+    _update_search_index(search_version, [device_id])
+    return True
+
+def validate_device_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validates an imported device record and normalizes it into a device entry.
+    
+    List fields may be given as lists or as separator-joined strings (as found
+    in CSV files). A missing ID or date is generated.
+    
+    Args:
+        record: The raw device record
+        
+    Returns:
+        Dict: The normalized device entry
+        
+    Raises:
+        ValueError: If the record is not a valid device
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Record is not an object")
+    
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) in (None, "", [])]
+    if missing:
+        raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+    
+    device = {}
+    for field in DEVICE_FIELDS:
+        value = record.get(field)
+        if field in LIST_FIELDS:
+            if isinstance(value, str):
+                value = [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError(f"Field '{field}' must be a list of strings")
+        elif value is None:
+            value = ""
+        elif not isinstance(value, str):
+            raise ValueError(f"Field '{field}' must be a string")
+        device[field] = value
+    
+    if not device["id"]:
+        device["id"] = generate_device_id()
+    if not device["date_added"]:
+        device["date_added"] = datetime.now().isoformat()
+    
+    return device
+
+def import_devices(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Adds many devices to the knowledge base in a single load and commit.
+    
+    Invalid records and records with an ID already in the knowledge base are
+    reported as errors without aborting the rest of the batch.
+    
+    Args:
+        records: The device records to import
+        
+    Returns:
+        Dict: The IDs of the added devices ("added") and a list of
+        (row number, error message) tuples ("errors")
+    """
+    return _import_rows(
+        (row_number, record, None) for row_number, record in enumerate(records, 1)
+    )
+
+def import_devices_from_file(file_path: str, file_format: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Streams device records from a CSV or JSONL file into the knowledge base.
+    
+    Args:
+        file_path: The path of the file to import
+        file_format: "csv" or "jsonl" (detected from the file extension if omitted)
+        
+    Returns:
+        Dict: The import results, as returned by import_devices
+    """
+    file_format = file_format or detect_file_format(file_path)
+    with open(file_path, 'r', newline='', encoding='utf-8') as f:
+        return _import_rows(_read_records(f, file_format))
+
+def export_devices(file_path: str, file_format: Optional[str] = None) -> int:
+    """
+    Writes all devices in the knowledge base to a CSV or JSONL file.
+    
+    Args:
+        file_path: The path of the file to write
+        file_format: "csv" or "jsonl" (detected from the file extension if omitted)
+        
+    Returns:
+        int: The number of devices exported
+    """
+    file_format = file_format or detect_file_format(file_path)
+    count = 0
+    
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        if file_format == "csv":
+            writer = csv.DictWriter(f, fieldnames=DEVICE_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+        
+        for device in list_devices():
+            if file_format == "csv":
+                row = dict(device)
+                for field in LIST_FIELDS:
+                    row[field] = CSV_LIST_SEPARATOR.join(device.get(field, []))
+                writer.writerow(row)
+            else:
+                f.write(json.dumps(device) + "\n")
+            count += 1
+    
+    return count
+
+def detect_file_format(file_path: str) -> str:
+    """
+    Detects the import/export format from a file extension.
+    
+    Args:
+        file_path: The path of the file
+        
+    Returns:
+        str: "csv" or "jsonl"
+        
+    Raises:
+        ValueError: If the extension is not recognized
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Cannot detect format of {file_path}; use csv or jsonl")
+
+def _read_records(f: TextIO, file_format: str) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Reads device records from an open CSV or JSONL file one row at a time.
+    
+    Args:
+        f: The open file
+        file_format: "csv" or "jsonl"
+        
+    Yields:
+        Tuple: The row number, the raw record and a parse error message (or None)
+    """
+    if file_format == "csv":
+        for row_number, row in enumerate(csv.DictReader(f), 1):
+            yield row_number, row, None
+    elif file_format == "jsonl":
+        for row_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield row_number, json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e}"
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+def _import_rows(rows: Iterable[Tuple[int, Any, Optional[str]]]) -> Dict[str, Any]:
+    """
+    Validates imported rows and commits the valid devices in one write.
+    
+    Args:
+        rows: Tuples of (row number, raw record, parse error message or None)
+        
+    Returns:
+        Dict: The import results, as returned by import_devices
+    """
+    sqlite_backend = use_sqlite()
+    search_version = _search_version_before_write()
+    if sqlite_backend:
+        existing_ids = {}
+    else:
+        _load_cached()
+        existing_ids = _kb_cache["index"]
+    
+    devices = []
+    device_rows = {}
+    errors = []
+    
+    for row_number, record, error in rows:
+        if error is None:
+            try:
+                device = validate_device_record(record)
+                if device["id"] in existing_ids or device["id"] in device_rows:
+                    raise ValueError(f"Duplicate device ID: {device['id']}")
+            except ValueError as e:
+                error = str(e)
+        
+        if error is not None:
+            errors.append((row_number, error))
+            continue
+        
+        device_rows[device["id"]] = row_number
+        devices.append(device)
+    
+    if sqlite_backend:
+        duplicates = set(kb_sqlite.insert_devices(devices))
+    elif devices:
+        with file_lock.locked(_lock_path()):
+            # Devices added by other processes since validation are duplicates too
+            _load_cached()
+            duplicates = {device["id"] for device in devices if device["id"] in _kb_cache["index"]}
+            _append_journal([
+                {"op": "add", "device": device} for device in devices if device["id"] not in duplicates
+            ])
+        _maybe_compact()
+    else:
+        duplicates = set()
+    
+    if duplicates:
+        for device_id in duplicates:
+            errors.append((device_rows[device_id], f"Duplicate device ID: {device_id}"))
+        errors.sort()
+        devices = [device for device in devices if device["id"] not in duplicates]
+    
+    added = [device["id"] for device in devices]
+    if added:
+        _update_search_index(search_version, added)
+    
+    return {"added": added, "errors": errors}
+
+def search_devices(terms: Iterable[str] = (), filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Searches the knowledge base by free-text terms and field filters.
+    
+    Every token of every term must appear in one of the indexed fields, and each
+    filter must match the field's value (or an item of a list field) exactly,
+    ignoring case. Filter names may use short aliases such as "protocol".
+    
+    Args:
+        terms: Free-text search terms
+        filters: Field name to value filters, e.g. {"protocol": "Zigbee"}
+        
+    Returns:
+        List[Dict]: The matching devices
+        
+    Raises:
+        ValueError: If a filter names an unknown field
+    """
+    device_ids = _search_index().search(terms, filters)
+    
+    if use_sqlite():
+        return kb_sqlite.get_devices(device_ids)
+    
+    return [_copy_device(_kb_cache["index"][device_id]) for device_id in device_ids]
+
+def _search_version() -> tuple:
+    """
+    Identifies the current state of the knowledge base for the search index.
+    
+    Returns:
+        tuple: The JSON cache key, or the SQLite path and change counter
+    """
+    if use_sqlite():
+        return (kb_sqlite.KB_DB_PATH, kb_sqlite.data_version())
+    
+    _load_cached()
+    return _json_search_version()
+
+def _json_search_version() -> tuple:
+    """
+    Identifies the cached JSON knowledge base for the search index.
+    
+    Journal entries are applied to the search index as they are replayed, so
+    the index only needs rebuilding when the JSON file itself is reloaded.
+    
+    Returns:
+        tuple: The JSON file path and cache generation
+    """
+    return (KB_FILE_PATH, _kb_cache["generation"])
+
+def _search_index() -> DeviceSearchIndex:
+    """
+    Returns the search index, rebuilding it if the knowledge base changed
+    outside this process.
+    
+    Returns:
+        DeviceSearchIndex: An index matching the current knowledge base
+    """
+    version = _search_version()
+    if _search_state["index"] is None or _search_state["version"] != version:
+        if use_sqlite():
+            devices = kb_sqlite.list_devices()
+        else:
+            devices = _kb_cache["data"]["devices"]
+        _search_state["index"] = DeviceSearchIndex(devices)
+        _search_state["version"] = version
+    
+    return _search_state["index"]
+
+def _search_version_before_write() -> Optional[tuple]:
+    """
+    Records the SQLite knowledge base state before a write, if a search index
+    exists. (The JSON backend updates its index while replaying the journal.)
+    
+    Returns:
+        tuple or None: The current version, or None if there is no index to maintain
+    """
+    if _search_state["index"] is None or not use_sqlite():
+        return None
+    return _search_version()
+
+def _update_search_index(version_before: Optional[tuple], device_ids: List[str]) -> None:
+    """
+    Applies the devices changed by an SQLite write to the search index incrementally.
+    
+    If the index was already stale, or other changes were made to the knowledge
+    base concurrently, the index is left to be rebuilt by the next search.
+    
+    Args:
+        version_before: The version returned by _search_version_before_write
+        device_ids: The IDs of the devices added, updated or deleted by the write
+    """
+    index = _search_state["index"]
+    if index is None or version_before is None or _search_state["version"] != version_before:
+        return
+    
+    version_after = (kb_sqlite.KB_DB_PATH, kb_sqlite.data_version())
+    if version_after[1] != version_before[1] + len(device_ids):
+        _search_state["index"] = None
+        return
     
-    return False
\ No newline at end of file
+    current = {device["id"]: device for device in kb_sqlite.get_devices(device_ids)}
+    for device_id in device_ids:
+        if device_id in current:
+            index.add(current[device_id])
+        else:
+            index.remove(device_id)
+    _search_state["version"] = version_after
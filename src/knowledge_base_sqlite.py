@@ -0,0 +1,412 @@
+"""
+IoT Device Knowledge Base SQLite Storage Module
+
+This module provides an SQLite storage engine for the device knowledge base.
+Devices are stored one row per device with indexed id, manufacturer and model
+columns, so lookups and edits no longer rewrite the whole knowledge base.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Any
+
+from src.device_ids import device_added_at
+
+# Path to the knowledge base database file
+KB_DB_PATH = os.path.join("data", "device_knowledge_base.db")
+
+# Columns stored alongside the full JSON record so they can be indexed
+INDEXED_COLUMNS = ("name", "manufacturer", "model", "date_added")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    name TEXT,
+    manufacturer TEXT,
+    model TEXT,
+    date_added TEXT,
+    data TEXT NOT NULL,
+    added_at REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_devices_id ON devices (id);
+CREATE INDEX IF NOT EXISTS idx_devices_manufacturer ON devices (manufacturer);
+CREATE INDEX IF NOT EXISTS idx_devices_model ON devices (model);
+CREATE TABLE IF NOT EXISTS kb_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS devices_version_insert AFTER INSERT ON devices BEGIN
+    UPDATE kb_meta SET value = value + 1 WHERE key = 'version';
+END;
+CREATE TRIGGER IF NOT EXISTS devices_version_update AFTER UPDATE ON devices BEGIN
+    UPDATE kb_meta SET value = value + 1 WHERE key = 'version';
+END;
+CREATE TRIGGER IF NOT EXISTS devices_version_delete AFTER DELETE ON devices BEGIN
+    UPDATE kb_meta SET value = value + 1 WHERE key = 'version';
+END;
+"""
+
+INSERT_SQL = (
+    "INSERT INTO devices (id, name, manufacturer, model, date_added, data, added_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+def connect() -> sqlite3.Connection:
+    """
+    Opens a connection to the knowledge base database, creating the schema if needed.
+
+    Returns:
+        sqlite3.Connection: An open database connection
+    """
+    db_dir = os.path.dirname(KB_DB_PATH)
+    if db_dir and not os.path.exists(db_dir):
+        os.makedirs(db_dir)
+
+    # Concurrent writers wait for each other instead of failing, and readers
+    # are not blocked by writers thanks to write-ahead logging
+    conn = sqlite3.connect(KB_DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    _upgrade_schema(conn)
+    return conn
+
+def _upgrade_schema(conn: sqlite3.Connection) -> None:
+    """
+    Adds columns introduced after a database was first created.
+
+    Args:
+        conn: An open database connection
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(devices)")}
+    if "added_at" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE devices ADD COLUMN added_at REAL")
+            rows = conn.execute("SELECT seq, data FROM devices").fetchall()
+            conn.executemany(
+                "UPDATE devices SET added_at = ? WHERE seq = ?",
+                ((device_added_at(json.loads(data)), seq) for seq, data in rows)
+            )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_devices_added_at ON devices (added_at)")
+    if conn.execute("SELECT 1 FROM kb_meta WHERE key = 'version'").fetchone() is None:
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO kb_meta (key, value) VALUES ('version', 0)")
+
+def data_version() -> int:
+    """
+    Returns the change counter of the device table.
+
+    The counter is incremented by triggers for every inserted, updated or deleted
+    device, by any process, so it can be used to detect stale in-memory indexes.
+
+    Returns:
+        int: The current change counter
+    """
+    conn = connect()
+    try:
+        return conn.execute("SELECT value FROM kb_meta WHERE key = 'version'").fetchone()[0]
+    finally:
+        conn.close()
+
+def _row_values(device: Dict[str, Any]) -> tuple:
+    """
+    Builds the column values stored for a device record.
+
+    Args:
+        device: The device record
+
+    Returns:
+        tuple: Values for (id, name, manufacturer, model, date_added, data, added_at)
+    """
+    return (
+        device["id"],
+        *(device.get(column) for column in INDEXED_COLUMNS),
+        json.dumps(device),
+        device_added_at(device)
+    )
+
+def insert_device(device: Dict[str, Any]) -> None:
+    """
+    Inserts a device record into the database.
+
+    Args:
+        device: The device record to insert
+    """
+    conn = connect()
+    try:
+        with conn:
+            conn.execute(
+                INSERT_SQL,
+                _row_values(device)
+            )
+    finally:
+        conn.close()
+
+def insert_devices(devices: List[Dict[str, Any]]) -> List[str]:
+    """
+    Inserts many device records in a single transaction.
+
+    Devices whose ID already exists are skipped rather than aborting the batch.
+
+    Args:
+        devices: The device records to insert
+
+    Returns:
+        List[str]: The IDs of the devices that were skipped as duplicates
+    """
+    duplicates = []
+
+    conn = connect()
+    try:
+        with conn:
+            for device in devices:
+                try:
+                    conn.execute(
+                        INSERT_SQL,
+                        _row_values(device)
+                    )
+                except sqlite3.IntegrityError:
+                    duplicates.append(device["id"])
+    finally:
+        conn.close()
+
+    return duplicates
+
+def get_device(device_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieves a device by its ID using the id index.
+
+    Args:
+        device_id: The ID of the device to retrieve
+
+    Returns:
+        Dict or None: The device data if found, None otherwise
+    """
+    conn = connect()
+    try:
+        row = conn.execute("SELECT data FROM devices WHERE id = ?", (device_id,)).fetchone()
+    finally:
+        conn.close()
+
+    return json.loads(row[0]) if row else None
+
+def get_devices(device_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Retrieves several devices by ID.
+
+    Args:
+        device_ids: The IDs of the devices to retrieve
+
+    Returns:
+        List[Dict]: The devices found, in the order of the given IDs
+    """
+    found = {}
+
+    conn = connect()
+    try:
+        # Stay well below SQLite's limit on the number of query parameters
+        for start in range(0, len(device_ids), 500):
+            batch = device_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            for device_id, data in conn.execute(
+                f"SELECT id, data FROM devices WHERE id IN ({placeholders})", batch
+            ):
+                found[device_id] = json.loads(data)
+    finally:
+        conn.close()
+
+    return [found[device_id] for device_id in device_ids if device_id in found]
+
+def list_devices() -> List[Dict[str, Any]]:
+    """
+    Lists all devices in insertion order.
+
+    Returns:
+        List[Dict]: A list of all devices
+    """
+    conn = connect()
+    try:
+        rows = conn.execute("SELECT data FROM devices ORDER BY seq").fetchall()
+    finally:
+        conn.close()
+
+    return [json.loads(row[0]) for row in rows]
+
+def iter_devices(after: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streams devices in ID order, one database row at a time.
+
+    Args:
+        after: Only yield devices whose ID sorts after this one (optional; the
+            device need not exist any more)
+
+    Yields:
+        Dict: Each device record
+    """
+    conn = connect()
+    try:
+        if after is None:
+            rows = conn.execute("SELECT data FROM devices ORDER BY id")
+        else:
+            rows = conn.execute("SELECT data FROM devices WHERE id > ? ORDER BY id", (after,))
+        for (data,) in rows:
+            yield json.loads(data)
+    finally:
+        conn.close()
+
+def find_devices(manufacturer: Optional[str] = None, model: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Finds devices by manufacturer and/or model using the column indexes.
+
+    Args:
+        manufacturer: Exact manufacturer to match (optional)
+        model: Exact model to match (optional)
+
+    Returns:
+        List[Dict]: The matching devices
+    """
+    clauses = []
+    params = []
+    if manufacturer is not None:
+        clauses.append("manufacturer = ?")
+        params.append(manufacturer)
+    if model is not None:
+        clauses.append("model = ?")
+        params.append(model)
+
+    query = "SELECT data FROM devices"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY seq"
+
+    conn = connect()
+    try:
+        rows = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+    return [json.loads(row[0]) for row in rows]
+
+def list_devices_added_between(start: float, end: float) -> List[Dict[str, Any]]:
+    """
+    Lists devices added within a time range using the added_at index.
+
+    Args:
+        start: Range start, in seconds since the Unix epoch (inclusive)
+        end: Range end, in seconds since the Unix epoch (inclusive)
+
+    Returns:
+        List[Dict]: The matching devices, oldest first
+    """
+    conn = connect()
+    try:
+        rows = conn.execute(
+            "SELECT data FROM devices WHERE added_at BETWEEN ? AND ? ORDER BY added_at, seq",
+            (start, end)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return [json.loads(row[0]) for row in rows]
+
+def update_device(device_id: str, changes: Dict[str, Any]) -> bool:
+    """
+    Applies field changes to a stored device.
+
+    Args:
+        device_id: The ID of the device to update
+        changes: The fields to overwrite
+
+    Returns:
+        bool: True if the device was updated, False otherwise
+    """
+    conn = connect()
+    try:
+        with conn:
+            row = conn.execute("SELECT data FROM devices WHERE id = ?", (device_id,)).fetchone()
+            if row is None:
+                return False
+
+            device = json.loads(row[0])
+            device.update(changes)
+            values = _row_values(device)
+            conn.execute(
+                "UPDATE devices SET name = ?, manufacturer = ?, model = ?, date_added = ?, data = ?, "
+                "added_at = ? WHERE id = ?",
+                values[1:] + (device_id,)
+            )
+    finally:
+        conn.close()
+
+    return True
+
+def delete_device(device_id: str) -> bool:
+    """
+    Deletes a device from the database.
+
+    Args:
+        device_id: The ID of the device to delete
+
+    Returns:
+        bool: True if the device was deleted, False otherwise
+    """
+    conn = connect()
+    try:
+        with conn:
+            cursor = conn.execute("DELETE FROM devices WHERE id = ?", (device_id,))
+    finally:
+        conn.close()
+
+    return cursor.rowcount > 0
+
+def replace_all(devices: List[Dict[str, Any]]) -> None:
+    """
+    Replaces the database contents with the given devices in one transaction.
+
+    Args:
+        devices: The complete list of devices to store
+    """
+    conn = connect()
+    try:
+        with conn:
+            conn.execute("DELETE FROM devices")
+            conn.executemany(
+                INSERT_SQL,
+                (_row_values(device) for device in devices)
+            )
+    finally:
+        conn.close()
+
+def migrate_from_json(json_path: str) -> int:
+    """
+    Copies all devices from a JSON knowledge base file into the database.
+
+    Devices whose ID already exists in the database are left untouched, so the
+    migration can safely be run more than once.
+
+    Args:
+        json_path: Path to the JSON knowledge base file
+
+    Returns:
+        int: The number of devices migrated
+    """
+    if not os.path.exists(json_path):
+        return 0
+
+    with open(json_path, 'r') as f:
+        devices = json.load(f).get("devices", [])
+
+    conn = connect()
+    try:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                INSERT_SQL.replace("INSERT", "INSERT OR IGNORE", 1),
+                (_row_values(device) for device in devices)
+            )
+            migrated = conn.total_changes - before
+    finally:
+        conn.close()
+
+    return migrated
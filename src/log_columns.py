@@ -0,0 +1,297 @@
+"""
+IoT Device Columnar Log Module
+
+This module holds parsed logs column by column in NumPy arrays rather than
+as one dict per line, so a log of millions of lines costs tens of bytes per
+line: int64 timestamps (nanoseconds since the epoch, see
+analysis.parse_timestamp), level codes and message ids into tables of the
+distinct levels and messages, and masked (nullable) sensor and battery
+arrays. analyze_log_events, extract_events_by_type and extract_time_range
+mirror the functions of the same name in the analysis module, as vectorized
+operations over the columns; LogColumns.to_entries() gives the list of dicts
+analysis.parse_log_file returns, and iter_entries() the same dicts a batch of
+rows at a time.
+"""
+
+from array import array
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+import numpy as np
+
+from src import analysis as anl
+
+# Number of rows converted to dicts at a time by LogColumns.iter_entries
+ENTRY_BATCH_SIZE = 65536
+
+class LogColumns:
+    """
+    A parsed log, stored as columns.
+
+    Attributes:
+        timestamps: int64 nanoseconds since the epoch
+        utc_offsets: float64 UTC offsets in seconds, NaN for timestamps without one
+        level_codes: int32 indices into levels
+        levels: The distinct levels, in order of first appearance in the log
+        message_ids: int32 indices into messages
+        messages: The distinct messages
+        sensor_values: Masked int64 sensor readings, masked where a line has none
+        battery_levels: Masked int64 battery levels, masked where a line has none
+    """
+
+    def __init__(self, timestamps: np.ndarray, utc_offsets: np.ndarray, level_codes: np.ndarray, levels: List[str],
+                 message_ids: np.ndarray, messages: List[str], sensor_values: np.ma.MaskedArray,
+                 battery_levels: np.ma.MaskedArray):
+        self.timestamps = timestamps
+        self.utc_offsets = utc_offsets
+        self.level_codes = level_codes
+        self.levels = levels
+        self.message_ids = message_ids
+        self.messages = messages
+        self.sensor_values = sensor_values
+        self.battery_levels = battery_levels
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def take(self, rows: np.ndarray) -> "LogColumns":
+        """
+        Selects rows, sharing the level and message tables.
+
+        Args:
+            rows: A boolean mask, an array of row indices or a slice
+
+        Returns:
+            LogColumns: The selected rows, in the order given
+        """
+        return LogColumns(
+            self.timestamps[rows], self.utc_offsets[rows], self.level_codes[rows], self.levels,
+            self.message_ids[rows], self.messages, self.sensor_values[rows], self.battery_levels[rows]
+        )
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Converts the columns to one dict per line, ENTRY_BATCH_SIZE rows at a
+        time, so only one batch of dicts need be held at once.
+
+        Yields:
+            Dict: The log entries as analysis.parse_log_file returns them
+        """
+        for start in range(0, len(self), ENTRY_BATCH_SIZE):
+            batch = self.take(slice(start, start + ENTRY_BATCH_SIZE))
+            levels = [self.levels[code] for code in batch.level_codes.tolist()]
+            messages = [self.messages[message_id] for message_id in batch.message_ids.tolist()]
+            utc_offsets = [None if offset != offset else offset for offset in batch.utc_offsets.tolist()]
+            for timestamp, utc_offset, level, message, sensor_value, battery_level in zip(
+                batch.timestamps.tolist(), utc_offsets, levels, messages,
+                batch.sensor_values.tolist(), batch.battery_levels.tolist()
+            ):
+                entry = {"timestamp": anl.format_timestamp(timestamp, utc_offset), "level": level, "message": message}
+                if sensor_value is not None:
+                    entry["sensor_value"] = sensor_value
+                if battery_level is not None:
+                    entry["battery_level"] = battery_level
+                yield entry
+
+    def to_entries(self) -> List[Dict[str, Any]]:
+        """
+        Converts the columns to one dict per line.
+
+        Returns:
+            List[Dict]: The log entries as analysis.parse_log_file returns them
+        """
+        return list(self.iter_entries())
+
+def from_entries(parsed_logs: Iterable[Dict[str, Any]]) -> LogColumns:
+    """
+    Builds columns from parsed log entries.
+
+    Entries are consumed one at a time, so a stream of entries (see
+    analysis.iter_log_entries) is never held as dicts.
+
+    Args:
+        parsed_logs: Parsed log entries, with either "timestamp_ns" or an ISO
+            format "timestamp"
+
+    Returns:
+        LogColumns: The columns
+
+    Raises:
+        ValueError: If an entry has an invalid ISO format timestamp
+        OverflowError: If a sensor reading or battery level does not fit in 64 bits
+    """
+    timestamps = array('q')
+    level_codes = array('i')
+    message_ids = array('i')
+    level_table: Dict[str, int] = {}
+    message_table: Dict[str, int] = {}
+    # Offsets, readings and levels appear on few lines; note them by row
+    offset_rows, offsets = array('q'), array('d')
+    sensor_rows, sensor_values = array('q'), array('q')
+    battery_rows, battery_levels = array('q'), array('q')
+
+    add_timestamp, add_level_code, add_message_id = timestamps.append, level_codes.append, message_ids.append
+    for row, entry in enumerate(parsed_logs):
+        timestamp = entry.get("timestamp_ns")
+        if timestamp is None:
+            timestamp, utc_offset = anl.parse_timestamp(entry["timestamp"])
+        else:
+            utc_offset = entry.get("utc_offset")
+        add_timestamp(timestamp)
+        if utc_offset is not None:
+            offset_rows.append(row)
+            offsets.append(utc_offset)
+
+        level = entry["level"]
+        add_level_code(level_table.setdefault(level, len(level_table)))
+        message = entry["message"]
+        add_message_id(message_table.setdefault(message, len(message_table)))
+
+        sensor_value = entry.get("sensor_value")
+        if sensor_value is not None:
+            sensor_rows.append(row)
+            sensor_values.append(sensor_value)
+        battery_level = entry.get("battery_level")
+        if battery_level is not None:
+            battery_rows.append(row)
+            battery_levels.append(battery_level)
+
+    rows = len(timestamps)
+
+    def scatter(row_indices: array, values: array, dtype: type, fill: Any) -> np.ndarray:
+        column = np.full(rows, fill, dtype=dtype)
+        column[np.frombuffer(row_indices, dtype=np.int64)] = np.frombuffer(values, dtype=dtype)
+        return column
+
+    def nullable(row_indices: array, values: array) -> np.ma.MaskedArray:
+        mask = np.ones(rows, dtype=np.bool_)
+        mask[np.frombuffer(row_indices, dtype=np.int64)] = False
+        return np.ma.MaskedArray(scatter(row_indices, values, np.int64, 0), mask=mask)
+
+    return LogColumns(
+        np.frombuffer(timestamps, dtype=np.int64),
+        scatter(offset_rows, offsets, np.float64, np.nan),
+        np.frombuffer(level_codes, dtype=np.int32),
+        list(level_table),
+        np.frombuffer(message_ids, dtype=np.int32),
+        list(message_table),
+        nullable(sensor_rows, sensor_values),
+        nullable(battery_rows, battery_levels)
+    )
+
+def parse_log_columns(log_file: Union[BinaryIO, TextIO, Iterable[str]], errors: str = "replace") -> LogColumns:
+    """
+    Parses a log straight into columns.
+
+    Args:
+        log_file: A binary or text file handle, or any iterable of lines
+        errors: How to handle UTF-8 decoding errors in binary files (as for bytes.decode)
+
+    Returns:
+        LogColumns: The valid log entries, in file order
+    """
+    return from_entries(anl.iter_log_entries(log_file, errors=errors))
+
+def _value_stats(values: np.ma.MaskedArray) -> Optional[Dict[str, float]]:
+    """
+    Summarizes the unmasked values of a nullable column.
+
+    Args:
+        values: The column
+
+    Returns:
+        Dict or None: The count, min, max and average of the values, or None if there are none
+    """
+    present = values.compressed()
+    if not len(present):
+        return None
+    return {
+        "count": len(present),
+        "min": int(present.min()),
+        "max": int(present.max()),
+        # Summed as Python ints, which unlike int64 cannot overflow
+        "avg": sum(present.tolist()) / len(present)
+    }
+
+def analyze_log_events(columns: LogColumns) -> Dict[str, Any]:
+    """
+    Analyzes a columnar log, with the same results as analysis.analyze_log_events
+    gives for its entries.
+
+    Args:
+        columns: The columns
+
+    Returns:
+        Dict: Analysis results
+    """
+    if not len(columns):
+        return {"error": "No log entries to analyze"}
+
+    # The first of equal timestamps wins, as in the entry-by-entry analysis
+    first, last = int(columns.timestamps.argmin()), int(columns.timestamps.argmax())
+    start, end = int(columns.timestamps[first]), int(columns.timestamps[last])
+
+    def utc_offset(row: int) -> Optional[float]:
+        offset = float(columns.utc_offsets[row])
+        return None if offset != offset else offset
+
+    # Count events by level, listing levels in order of first appearance
+    counts = np.bincount(columns.level_codes, minlength=len(columns.levels))
+    present_codes, first_rows = np.unique(columns.level_codes, return_index=True)
+    event_counts = {
+        columns.levels[code]: int(counts[code])
+        for code in present_codes[np.argsort(first_rows)].tolist()
+    }
+
+    analysis = {
+        "total_entries": len(columns),
+        "start_time": anl.format_timestamp(start, utc_offset(first)),
+        "end_time": anl.format_timestamp(end, utc_offset(last)),
+        "duration_seconds": (end - start) // 1000 / 1000000,
+        "event_counts": event_counts,
+        "error_count": event_counts.get("ERROR", 0),
+        "warning_count": event_counts.get("WARNING", 0)
+    }
+
+    sensor_stats = _value_stats(columns.sensor_values)
+    if sensor_stats:
+        analysis["sensor_stats"] = sensor_stats
+    battery_stats = _value_stats(columns.battery_levels)
+    if battery_stats:
+        analysis["battery_stats"] = battery_stats
+
+    return analysis
+
+def extract_events_by_type(columns: LogColumns, event_type: str) -> LogColumns:
+    """
+    Extracts log events of a specific type.
+
+    Args:
+        columns: The columns
+        event_type: The type of events to extract (INFO, WARNING, ERROR, DEBUG)
+
+    Returns:
+        LogColumns: The matching rows
+    """
+    if event_type not in columns.levels:
+        return columns.take(np.zeros(len(columns), dtype=np.bool_))
+    return columns.take(columns.level_codes == columns.levels.index(event_type))
+
+def extract_time_range(columns: LogColumns, start_time: str, end_time: str) -> LogColumns:
+    """
+    Extracts log events within a specific time range.
+
+    Args:
+        columns: The columns
+        start_time: The start time in ISO format
+        end_time: The end time in ISO format
+
+    Returns:
+        LogColumns: The matching rows (none if a time is invalid)
+    """
+    try:
+        start = anl.parse_timestamp(start_time)[0]
+        end = anl.parse_timestamp(end_time)[0]
+    except ValueError:
+        return columns.take(np.zeros(len(columns), dtype=np.bool_))
+
+    return columns.take((columns.timestamps >= start) & (columns.timestamps <= end))
@@ -0,0 +1,503 @@
+"""
+IoT Device Network Acquisition Module
+
+This module acquires logs and configurations from devices that expose them
+over the network, many devices at once. Targets are URLs:
+
+- http://host[:port]/path: fetched with an HTTP/1.1 GET. Connections are kept
+  alive and reused for later requests to the same host.
+- tcp://host:port[/command]: the command (if any) is sent followed by a
+  newline, and everything the device sends until it closes the connection
+  is acquired.
+
+All transfers run on one asyncio event loop. A connection pool bounds the
+number of connections open to each host and in total (idle keep-alive
+connections included), and every connect and read is subject to a timeout.
+Data is written and hashed as it arrives (see acquisition.AcquisitionWriter),
+so each acquisition produces the same .meta record as a simulated one.
+"""
+
+import asyncio
+import contextlib
+from typing import AsyncIterator, Awaitable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from src import acquisition as acq
+
+# Default number of connections open to a single host at once
+DEFAULT_PER_HOST_LIMIT = 2
+
+# Default number of connections open at once across all hosts
+DEFAULT_MAX_CONNECTIONS = 64
+
+# Default timeout, in seconds, for connecting and for each read
+DEFAULT_TIMEOUT = 30.0
+
+# Maximum number of bytes read from a connection at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# Default ports of the supported schemes
+DEFAULT_PORTS = {"http": 80}
+
+class NetworkAcquisitionError(Exception):
+    """
+    Raised when a device cannot be reached or returns an invalid response.
+    """
+
+def parse_target_url(url: str) -> Tuple[str, str, int, str]:
+    """
+    Splits a target URL into its parts.
+
+    Args:
+        url: The target URL (http://host[:port]/path or tcp://host:port[/command])
+
+    Returns:
+        Tuple[str, str, int, str]: The scheme, host, port and path
+
+    Raises:
+        ValueError: If the scheme is not supported or the URL has no host or port
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "tcp"):
+        raise ValueError(f"Unsupported target URL scheme: {url}")
+    if not parts.hostname:
+        raise ValueError(f"Target URL has no host: {url}")
+
+    port = parts.port or DEFAULT_PORTS.get(scheme)
+    if port is None:
+        raise ValueError(f"Target URL has no port: {url}")
+
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return scheme, parts.hostname, port, path
+
+class PooledConnection:
+    """
+    A connection borrowed from a ConnectionPool.
+
+    The connection is returned to the pool for reuse when released, unless
+    reusable has been cleared (for instance because the server closes it
+    after the response).
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, reused: bool):
+        self.reader = reader
+        self.writer = writer
+        self.reused = reused
+        self.reusable = True
+
+    def close(self) -> None:
+        """
+        Closes the underlying connection.
+        """
+        self.writer.close()
+
+class ConnectionPool:
+    """
+    Keeps connections to device endpoints open for reuse, limiting how many
+    are in use at once per host and how many are open in total.
+
+    Idle connections count against the total: when it is reached, an idle
+    connection is closed to make room for a new one.
+    """
+
+    def __init__(
+        self,
+        per_host_limit: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.per_host_limit = per_host_limit or DEFAULT_PER_HOST_LIMIT
+        self.max_connections = max_connections or DEFAULT_MAX_CONNECTIONS
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.connections_opened = 0
+        self._open = 0
+        self._idle: Dict[Tuple[str, int], List[PooledConnection]] = {}
+        self._host_slots: Dict[Tuple[str, int], asyncio.Semaphore] = {}
+        # Set whenever a connection is closed or becomes idle
+        self._changed = asyncio.Event()
+
+    def _discard(self, conn: Optional[PooledConnection] = None) -> None:
+        """
+        Closes a connection and frees its place in the total limit.
+
+        Args:
+            conn: The connection, or None to free the place of one that failed to open
+        """
+        if conn is not None:
+            conn.close()
+        self._open -= 1
+        self._changed.set()
+
+    async def _open_connection(self, host: str, port: int) -> PooledConnection:
+        """
+        Opens a new connection, once the total limit allows it.
+
+        Args:
+            host: The endpoint's host
+            port: The endpoint's port
+
+        Returns:
+            PooledConnection: The new connection
+        """
+        while self._open >= self.max_connections:
+            # Make room by closing the longest idle connection, if any
+            idle = next((connections for connections in self._idle.values() if connections), None)
+            if idle:
+                self._discard(idle.pop(0))
+                continue
+            self._changed.clear()
+            await self._changed.wait()
+        self._open += 1
+
+        try:
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.timeout)
+            except asyncio.TimeoutError:
+                raise NetworkAcquisitionError(f"Timed out connecting to {host}:{port}") from None
+            except OSError as e:
+                raise NetworkAcquisitionError(f"Cannot connect to {host}:{port}: {e}") from e
+        except BaseException:
+            self._discard()
+            raise
+        self.connections_opened += 1
+        return PooledConnection(reader, writer, reused=False)
+
+    @contextlib.asynccontextmanager
+    async def connection(self, host: str, port: int, reuse: bool = True) -> AsyncIterator[PooledConnection]:
+        """
+        Borrows a connection to an endpoint, waiting while the host's or the
+        pool's limit is reached.
+
+        The connection is closed instead of being returned to the pool if the
+        block raises or clears its reusable flag.
+
+        Args:
+            host: The endpoint's host
+            port: The endpoint's port
+            reuse: Whether an idle connection may be reused (otherwise a new one is opened)
+
+        Yields:
+            PooledConnection: An open connection
+        """
+        key = (host, port)
+        host_slots = self._host_slots.setdefault(key, asyncio.Semaphore(self.per_host_limit))
+        async with host_slots:
+            idle = self._idle.get(key, [])
+            if reuse and idle:
+                conn = idle.pop()
+            else:
+                conn = await self._open_connection(host, port)
+
+            try:
+                yield conn
+            except BaseException:
+                self._discard(conn)
+                raise
+            if conn.reusable and not conn.reader.at_eof():
+                conn.reused = True
+                self._idle.setdefault(key, []).append(conn)
+                self._changed.set()
+            else:
+                self._discard(conn)
+
+    def close_idle(self, host: str, port: int) -> None:
+        """
+        Closes the idle connections to an endpoint, once nothing more is to be
+        fetched from it.
+
+        Args:
+            host: The endpoint's host
+            port: The endpoint's port
+        """
+        for conn in self._idle.pop((host, port), []):
+            self._discard(conn)
+
+    async def close(self) -> None:
+        """
+        Closes every idle connection.
+        """
+        for host, port in list(self._idle):
+            self.close_idle(host, port)
+
+async def _read(coroutine: Awaitable[bytes], timeout: float, what: str) -> bytes:
+    """
+    Awaits a read from a connection, subject to a timeout.
+
+    Args:
+        coroutine: The read
+        timeout: Timeout of the read, in seconds
+        what: Description of what is read, for error messages
+
+    Returns:
+        bytes: The data read
+
+    Raises:
+        NetworkAcquisitionError: If the read times out or the connection closes early
+    """
+    try:
+        return await asyncio.wait_for(coroutine, timeout)
+    except asyncio.TimeoutError:
+        raise NetworkAcquisitionError(f"Timed out reading {what}") from None
+    except asyncio.IncompleteReadError as e:
+        raise NetworkAcquisitionError(f"Connection closed while reading {what}") from e
+
+async def _http_response(conn: PooledConnection, host: str, port: int, path: str, timeout: float) -> AsyncIterator[bytes]:
+    """
+    Sends a GET request and streams the response body.
+
+    Args:
+        conn: The connection to use
+        host: The endpoint's host
+        port: The endpoint's port
+        path: The path requested
+        timeout: Timeout of each read, in seconds
+
+    Yields:
+        bytes: Successive pieces of the response body
+
+    Raises:
+        NetworkAcquisitionError: If the response is not a successful HTTP response
+        ConnectionResetError: If a reused connection turns out to have been closed by the server
+    """
+    host_header = host if port == DEFAULT_PORTS["http"] else f"{host}:{port}"
+    conn.writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host_header}\r\nConnection: keep-alive\r\n\r\n".encode("latin-1")
+    )
+    await conn.writer.drain()
+
+    status_line = await _read(conn.reader.readline(), timeout, "the status line")
+    if not status_line:
+        # Servers may close idle keep-alive connections at any time
+        raise ConnectionResetError("Connection closed before the response")
+    try:
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        status = int(status)
+    except ValueError:
+        raise NetworkAcquisitionError(f"Invalid HTTP status line: {status_line!r}") from None
+
+    headers = {}
+    while True:
+        line = await _read(conn.reader.readline(), timeout, "the response headers")
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("connection", "").lower() == "close" or version == "HTTP/1.0":
+        conn.reusable = False
+    if status != 200:
+        conn.reusable = False
+        raise NetworkAcquisitionError(f"HTTP {status} from {host_header}{path}")
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = await _read(conn.reader.readline(), timeout, "a chunk size")
+            try:
+                size = int(size_line.split(b";")[0], 16)
+            except ValueError:
+                raise NetworkAcquisitionError(f"Invalid chunk size: {size_line!r}") from None
+            if size == 0:
+                # Skip any trailer headers
+                while await _read(conn.reader.readline(), timeout, "the trailer") not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            while size:
+                data = await _read(conn.reader.read(min(size, READ_CHUNK_SIZE)), timeout, "the response body")
+                if not data:
+                    raise NetworkAcquisitionError("Connection closed while reading the response body")
+                size -= len(data)
+                yield data
+            await _read(conn.reader.readexactly(2), timeout, "a chunk terminator")
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            data = await _read(conn.reader.read(min(remaining, READ_CHUNK_SIZE)), timeout, "the response body")
+            if not data:
+                raise NetworkAcquisitionError("Connection closed while reading the response body")
+            remaining -= len(data)
+            yield data
+    else:
+        # The body runs until the server closes the connection
+        conn.reusable = False
+        while True:
+            data = await _read(conn.reader.read(READ_CHUNK_SIZE), timeout, "the response body")
+            if not data:
+                return
+            yield data
+
+async def _tcp_response(conn: PooledConnection, path: str, timeout: float) -> AsyncIterator[bytes]:
+    """
+    Sends a raw TCP command and streams everything received until the device
+    closes the connection.
+
+    Args:
+        conn: The connection to use
+        path: The URL path, whose text after the leading slash is the command
+        timeout: Timeout of each read, in seconds
+
+    Yields:
+        bytes: Successive pieces of the data received
+    """
+    conn.reusable = False
+    command = unquote(path.lstrip("/"))
+    if command:
+        conn.writer.write(command.encode() + b"\n")
+        await conn.writer.drain()
+    while True:
+        data = await _read(conn.reader.read(READ_CHUNK_SIZE), timeout, "the device's data")
+        if not data:
+            return
+        yield data
+
+async def acquire_target(
+    pool: ConnectionPool,
+    device_id: str,
+    source_type: str,
+    url: str,
+    compression: Optional[str] = None,
+    dedup: bool = False
+) -> Tuple[str, str, str]:
+    """
+    Acquires data from one network endpoint.
+
+    Args:
+        pool: The connection pool to use
+        device_id: The ID of the device the data comes from
+        source_type: The type of data acquired (log, config, etc.)
+        url: The endpoint's URL
+        compression: Store the data compressed with this codec (optional)
+        dedup: Store the data in the object store, shared with identical acquisitions
+
+    Returns:
+        Tuple[str, str, str]: The output file path, the SHA256 hash, and the acquisition timestamp
+
+    Raises:
+        ValueError: If the URL is not supported
+        NetworkAcquisitionError: If the device cannot be reached or its response is invalid
+    """
+    scheme, host, port, path = parse_target_url(url)
+
+    # An idle keep-alive connection may have been closed by the server; retry once on a new one
+    for reuse in (True, False):
+        writer = None
+        try:
+            async with pool.connection(host, port, reuse=reuse and scheme == "http") as conn:
+                # Output files are only opened once a connection is available
+                writer = acq.AcquisitionWriter(device_id, source_type, compression=compression, dedup=dedup)
+                if scheme == "http":
+                    response = _http_response(conn, host, port, path, pool.timeout)
+                else:
+                    response = _tcp_response(conn, path, pool.timeout)
+                try:
+                    async for data in response:
+                        writer.write(data)
+                except ConnectionError as e:
+                    if reuse and conn.reused and writer.file_size == 0:
+                        raise
+                    raise NetworkAcquisitionError(f"Connection to {host}:{port} failed: {e}") from e
+        except ConnectionError:
+            writer.abort()
+            continue
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        return writer.finish()
+
+    raise NetworkAcquisitionError(f"Connection to {host}:{port} failed")
+
+async def acquire_targets(
+    targets: Iterable[Tuple[str, str, str]],
+    per_host_limit: Optional[int] = None,
+    max_connections: Optional[int] = None,
+    timeout: Optional[float] = None,
+    compression: Optional[str] = None,
+    dedup: bool = False
+) -> AsyncIterator[Dict]:
+    """
+    Acquires data from many network endpoints concurrently.
+
+    Args:
+        targets: The (device ID, source type, URL) of each endpoint
+        per_host_limit: Maximum number of connections open to one host at once
+        max_connections: Maximum number of connections open at once
+        timeout: Timeout, in seconds, for connecting and for each read
+        compression: Store the data compressed with this codec (optional)
+        dedup: Store the data in the object store, shared with identical acquisitions
+
+    Yields:
+        Dict: The result of each target as it finishes, with its device ID,
+        source type and URL and either the output path, hash and timestamp
+        or an error
+    """
+    targets = list(targets)
+    if not targets:
+        return
+
+    # Create the catalog up front so concurrent acquisitions do not race to rebuild it
+    acq._ensure_catalog()
+
+    pool = ConnectionPool(per_host_limit, max_connections, timeout)
+
+    # Targets left per endpoint, so its idle connections are closed after the last one
+    remaining: Dict[Tuple[str, int], int] = {}
+    for _, _, url in targets:
+        with contextlib.suppress(ValueError):
+            endpoint = parse_target_url(url)[1:3]
+            remaining[endpoint] = remaining.get(endpoint, 0) + 1
+
+    async def run(device_id: str, source_type: str, url: str) -> Dict:
+        result = {"device_id": device_id, "source_type": source_type, "url": url}
+        try:
+            result["output_path"], result["sha256_hash"], result["timestamp"] = await acquire_target(
+                pool, device_id, source_type, url, compression, dedup
+            )
+            result["status"] = "done"
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        finally:
+            with contextlib.suppress(ValueError):
+                endpoint = parse_target_url(url)[1:3]
+                remaining[endpoint] -= 1
+                if not remaining[endpoint]:
+                    pool.close_idle(*endpoint)
+        return result
+
+    try:
+        for future in asyncio.as_completed([run(*target) for target in targets]):
+            yield await future
+    finally:
+        await pool.close()
+
+def run_network_acquisition(
+    targets: Iterable[Tuple[str, str, str]],
+    per_host_limit: Optional[int] = None,
+    max_connections: Optional[int] = None,
+    timeout: Optional[float] = None,
+    compression: Optional[str] = None,
+    dedup: bool = False
+) -> List[Dict]:
+    """
+    Acquires data from many network endpoints concurrently, from synchronous code.
+
+    Args:
+        targets: The (device ID, source type, URL) of each endpoint
+        per_host_limit: Maximum number of connections open to one host at once
+        max_connections: Maximum number of connections open at once
+        timeout: Timeout, in seconds, for connecting and for each read
+        compression: Store the data compressed with this codec (optional)
+        dedup: Store the data in the object store, shared with identical acquisitions
+
+    Returns:
+        List[Dict]: The result of each target, in the order they finished
+    """
+    async def collect() -> List[Dict]:
+        return [result async for result in acquire_targets(
+            targets, per_host_limit, max_connections, timeout, compression, dedup
+        )]
+
+    return asyncio.run(collect())
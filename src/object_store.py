@@ -0,0 +1,177 @@
+"""
+IoT Device Evidence Object Store Module
+
+This module provides a content-addressed store of evidence blobs, so that
+identical acquisitions (e.g. repeated configuration pulls) share one copy of
+their bytes. Blobs are named after the SHA256 of their stored bytes and kept
+read-only under objects/<first two hex digits>/<remaining digits>.
+Acquisitions reference blobs from their .meta files and their output file is
+a hard link to the blob, so existing readers are unaffected.
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+import time
+from typing import BinaryIO, Dict, Iterable, Iterator, Tuple
+
+# Subdirectory holding blobs still being written
+TEMP_DIR = "tmp"
+
+# Blobs (and temporary files) touched more recently than this are never
+# collected, so acquisitions in progress do not lose their blob
+GC_GRACE_SECONDS = 3600
+
+class HashingWriter:
+    """
+    Wraps a binary file, hashing everything written to it.
+    """
+
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.hasher = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hasher.update(data)
+        return self.fileobj.write(data)
+
+def object_path(objects_dir: str, key: str) -> str:
+    """
+    Returns the path of a blob.
+
+    Args:
+        objects_dir: The object store directory
+        key: The blob's SHA256 as a hex string
+
+    Returns:
+        str: The path of the blob
+    """
+    return os.path.join(objects_dir, key[:2], key[2:])
+
+def create_temp(objects_dir: str) -> Tuple[str, BinaryIO]:
+    """
+    Creates a temporary file for a blob being written.
+
+    Args:
+        objects_dir: The object store directory
+
+    Returns:
+        Tuple[str, BinaryIO]: The temporary path and the file, open for binary writing
+    """
+    temp_dir = os.path.join(objects_dir, TEMP_DIR)
+    os.makedirs(temp_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+    return temp_path, os.fdopen(fd, 'wb')
+
+def add(objects_dir: str, temp_path: str, key: str) -> str:
+    """
+    Moves a fully written temporary file into the store, unless a blob with
+    the same content already exists.
+
+    Args:
+        objects_dir: The object store directory
+        temp_path: The temporary file holding the blob's bytes
+        key: The SHA256 of the temporary file's bytes
+
+    Returns:
+        str: The path of the blob
+    """
+    blob_path = object_path(objects_dir, key)
+    if os.path.exists(blob_path):
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.chmod(temp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        # Concurrent writers of the same content replace it with identical bytes
+        os.replace(temp_path, blob_path)
+    return blob_path
+
+def link(blob_path: str, output_path: str) -> bool:
+    """
+    Makes an output path refer to a blob, replacing any file already there.
+
+    A hard link is used when the filesystem supports it; otherwise the blob
+    is copied.
+
+    Args:
+        blob_path: The path of the blob
+        output_path: The path the acquisition's data should appear at
+
+    Returns:
+        bool: True if the output path shares the blob's storage, False if it is a copy
+    """
+    temp_link = f"{output_path}.link-tmp"
+    try:
+        os.link(blob_path, temp_link)
+    except OSError:
+        shutil.copyfile(blob_path, output_path)
+        # Copying leaves the blob's change time alone; keep it out of collection
+        os.utime(blob_path)
+        return False
+    os.replace(temp_link, output_path)
+    return True
+
+def iter_objects(objects_dir: str) -> Iterator[Tuple[str, str]]:
+    """
+    Lists the blobs in the store.
+
+    Args:
+        objects_dir: The object store directory
+
+    Yields:
+        Tuple[str, str]: Each blob's key and path
+    """
+    if not os.path.isdir(objects_dir):
+        return
+    for prefix in sorted(os.listdir(objects_dir)):
+        prefix_dir = os.path.join(objects_dir, prefix)
+        if prefix == TEMP_DIR or len(prefix) != 2 or not os.path.isdir(prefix_dir):
+            continue
+        for rest in sorted(os.listdir(prefix_dir)):
+            yield prefix + rest, os.path.join(prefix_dir, rest)
+
+def collect_garbage(objects_dir: str, referenced: Iterable[str], dry_run: bool = False) -> Dict[str, int]:
+    """
+    Removes the blobs no acquisition references, and abandoned temporary files.
+
+    Args:
+        objects_dir: The object store directory
+        referenced: The keys of the blobs referenced by .meta files
+        dry_run: Only report what would be removed
+
+    Returns:
+        Dict[str, int]: The number of blobs kept and removed, and the bytes freed
+        (blobs still hard linked from an output file free nothing)
+    """
+    referenced = set(referenced)
+    cutoff = time.time() - GC_GRACE_SECONDS
+    stats = {"kept": 0, "removed": 0, "freed_bytes": 0}
+
+    def recently_touched(file_stat: os.stat_result) -> bool:
+        # Linking a blob updates its change time
+        return max(file_stat.st_mtime, file_stat.st_ctime) > cutoff
+
+    for key, blob_path in iter_objects(objects_dir):
+        blob_stat = os.stat(blob_path)
+        if key in referenced or recently_touched(blob_stat):
+            stats["kept"] += 1
+            continue
+        stats["removed"] += 1
+        if blob_stat.st_nlink == 1:
+            stats["freed_bytes"] += blob_stat.st_size
+        if not dry_run:
+            os.remove(blob_path)
+
+    temp_dir = os.path.join(objects_dir, TEMP_DIR)
+    if os.path.isdir(temp_dir):
+        for name in os.listdir(temp_dir):
+            temp_path = os.path.join(temp_dir, name)
+            temp_stat = os.stat(temp_path)
+            if not recently_touched(temp_stat):
+                stats["freed_bytes"] += temp_stat.st_size
+                if not dry_run:
+                    os.remove(temp_path)
+
+    return stats
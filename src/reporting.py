@@ -27,7 +27,8 @@ def generate_report(
     device_info: Dict[str, Any],
     acquisition_details: List[Dict[str, Any]],
     analysis_results: Dict[str, Any],
-    notes: str = ""
+    notes: str = "",
+    storage_stats: Optional[Dict[str, int]] = None
 ) -> str:
     """
     Generates a forensic report based on acquisition details and analysis findings.
@@ -39,6 +40,8 @@ def generate_report(
         acquisition_details: Details about the acquisition process
         analysis_results: Results of the analysis
         notes: Additional notes
+        storage_stats: Evidence storage and deduplication figures, as returned by
+            acquisition.storage_stats (optional)
         
     Returns:
         str: The path to the generated report
@@ -115,6 +118,20 @@ def generate_report(
         report_content.append("No acquisition details available.")
         report_content.append("")
     
+    # Add the evidence storage figures if available
+    if storage_stats:
+        logical_bytes = storage_stats.get('logical_bytes', 0)
+        saved_bytes = storage_stats.get('saved_bytes', 0)
+        saved_percent = 100 * saved_bytes / logical_bytes if logical_bytes else 0
+        report_content.append("EVIDENCE STORAGE")
+        report_content.append("-" * 80)
+        report_content.append(f"Acquisitions: {storage_stats.get('acquisitions', 0)}")
+        report_content.append(f"Unique Stored Files: {storage_stats.get('unique_files', 0)}")
+        report_content.append(f"Logical Size: {logical_bytes} bytes")
+        report_content.append(f"Stored Size: {storage_stats.get('stored_bytes', 0)} bytes")
+        report_content.append(f"Deduplication Savings: {saved_bytes} bytes ({saved_percent:.1f}%)")
+        report_content.append("")
+    
     # Add the analysis results
     report_content.append("ANALYSIS FINDINGS")
     report_content.append("-" * 80)
@@ -231,6 +248,8 @@ def generate_report(
         "analysis_results": analysis_results,
         "notes": notes
     }
+    if storage_stats:
+        report_data["storage_stats"] = storage_stats
     
     json_report_path = os.path.join(FORENSIC_REPORTS_DIR, f"{case_name.replace(' ', '_')}_{timestamp}.json")
     with open(json_report_path, 'w') as f:
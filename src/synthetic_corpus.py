@@ -0,0 +1,294 @@
+"""
+IoT Device Synthetic Corpus Module
+
+This module generates large, reproducible synthetic log and configuration
+corpora for load-testing the parsers. Output is assembled block by block with
+NumPy: every line is a sequence of byte snippets chosen from a precomputed
+table (date, hour, minute, second, level and message), so no Python code runs
+per line. The same seed and parameters always produce the same bytes.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+LOG_LEVELS = ("INFO", "WARNING", "ERROR", "DEBUG")
+
+# Messages without a value, as produced by acquisition.generate_random_content
+PLAIN_MESSAGES = (
+    "Device started",
+    "Connection established",
+    "Data sent to cloud",
+    "Configuration updated",
+    "Firmware update available",
+    "Connection lost",
+    "Reconnecting...",
+    "Device shutdown"
+)
+
+# Sensor readings and battery levels range from 0 to 100
+MAX_VALUE = 100
+
+# Fixed default start time, so corpora are reproducible without --start
+DEFAULT_START = datetime(2024, 1, 1)
+
+SENSOR_TYPES = ("temperature", "humidity", "motion", "light", "sound")
+SENSOR_UNITS = ("C", "%", "lux", "dB")
+
+# Number of lines (or config entries) assembled per block
+BLOCK_ROWS = 65536
+
+def _build_table(columns: List[List[bytes]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[int]]:
+    """
+    Packs snippet columns into one byte table.
+
+    Args:
+        columns: The snippets that can appear in each column of a row
+
+    Returns:
+        Tuple: The packed bytes, each snippet's offset and length, and the index
+        of the first snippet of each column
+    """
+    snippets = [snippet for column in columns for snippet in column]
+    lengths = np.array([len(snippet) for snippet in snippets], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    blob = np.frombuffer(b"".join(snippets), dtype=np.uint8)
+    bases = np.cumsum([0] + [len(column) for column in columns[:-1]]).tolist()
+    return blob, offsets, lengths, bases
+
+def _assemble(table: Tuple[np.ndarray, np.ndarray, np.ndarray, List[int]], pieces: np.ndarray) -> bytes:
+    """
+    Concatenates the snippets selected by each row, row after row.
+
+    Args:
+        table: The snippet table built by _build_table
+        pieces: A (rows, columns) array of snippet indices
+
+    Returns:
+        bytes: The assembled rows
+    """
+    blob, offsets, lengths, _ = table
+    flat = pieces.ravel()
+    segment_lengths = lengths[flat]
+    ends = np.cumsum(segment_lengths)
+    total = int(ends[-1]) if len(ends) else 0
+
+    # Output byte j comes from its segment's snippet, at its position within the segment
+    shift = np.repeat(offsets[flat] - (ends - segment_lengths), segment_lengths)
+    return blob[shift + np.arange(total)].tobytes()
+
+def _rows_that_fit(table: Tuple[np.ndarray, np.ndarray, np.ndarray, List[int]], pieces: np.ndarray, budget: int) -> int:
+    """
+    Counts how many leading rows fit within a byte budget.
+
+    Args:
+        table: The snippet table built by _build_table
+        pieces: A (rows, columns) array of snippet indices
+        budget: The number of bytes available
+
+    Returns:
+        int: The number of whole rows that fit
+    """
+    row_ends = np.cumsum(table[2][pieces].sum(axis=1))
+    return int(np.searchsorted(row_ends, budget, side="right"))
+
+def _normalize_weights(level_weights: Optional[Dict[str, float]]) -> np.ndarray:
+    """
+    Converts a level mix into probabilities over LOG_LEVELS.
+
+    Args:
+        level_weights: Relative weight of each level (missing levels weigh 0);
+            all levels are equally likely if omitted
+
+    Returns:
+        np.ndarray: The probability of each level
+
+    Raises:
+        ValueError: If a level is unknown or the weights are invalid
+    """
+    if not level_weights:
+        return np.full(len(LOG_LEVELS), 1 / len(LOG_LEVELS))
+
+    unknown = set(level_weights) - set(LOG_LEVELS)
+    if unknown:
+        raise ValueError(f"Unknown log level(s): {', '.join(sorted(unknown))}")
+
+    weights = np.array([float(level_weights.get(level, 0)) for level in LOG_LEVELS])
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("Level weights must be non-negative and not all zero")
+    return weights / weights.sum()
+
+def generate_log_corpus(
+    size: int,
+    seed: int = 0,
+    level_weights: Optional[Dict[str, float]] = None,
+    sensor_ratio: float = 0.1,
+    battery_ratio: float = 0.1,
+    start: Optional[datetime] = None,
+    span_seconds: int = 86400
+) -> Iterator[bytes]:
+    """
+    Generates a synthetic log corpus in the "[timestamp] [level] message" format.
+
+    Timestamps increase steadily from start to the end of the span over the
+    whole corpus. Output stops at the last whole line that fits in size.
+
+    Args:
+        size: Maximum size of the corpus in bytes
+        seed: Seed of the random generator
+        level_weights: Relative weight of each log level (equal if omitted)
+        sensor_ratio: Fraction of lines that are sensor readings
+        battery_ratio: Fraction of lines that are battery levels
+        start: Time of the first line (DEFAULT_START if omitted)
+        span_seconds: Time covered by the corpus, in seconds
+
+    Yields:
+        bytes: Successive blocks of newline-terminated log lines
+
+    Raises:
+        ValueError: If the level mix or the ratios are invalid
+    """
+    if sensor_ratio < 0 or battery_ratio < 0 or sensor_ratio + battery_ratio > 1:
+        raise ValueError("Sensor and battery ratios must be non-negative and sum to at most 1")
+    level_p = _normalize_weights(level_weights)
+    start = start or DEFAULT_START
+    span_seconds = max(int(span_seconds), 0)
+
+    start_offset = start.hour * 3600 + start.minute * 60 + start.second
+
+    days = [(start + timedelta(days=day)).strftime("[%Y-%m-%dT").encode()
+            for day in range((start_offset + span_seconds) // 86400 + 1)]
+    messages = (list(PLAIN_MESSAGES)
+                + [f"Sensor reading: {value}" for value in range(MAX_VALUE + 1)]
+                + [f"Battery level: {value}%" for value in range(MAX_VALUE + 1)])
+    tails = [f"] [{level}] {message}\n".encode() for level in LOG_LEVELS for message in messages]
+    table = _build_table([
+        days,
+        [f"{hour:02d}".encode() for hour in range(24)],
+        [f":{minute:02d}".encode() for minute in range(60)],
+        [f":{second:02d}".encode() for second in range(60)],
+        tails
+    ])
+    day_base, hour_base, minute_base, second_base, tail_base = table[3]
+
+    # Spread the span evenly over the expected number of lines
+    message_p = np.concatenate((
+        np.full(len(PLAIN_MESSAGES), (1 - sensor_ratio - battery_ratio) / len(PLAIN_MESSAGES)),
+        np.full(MAX_VALUE + 1, sensor_ratio / (MAX_VALUE + 1)),
+        np.full(MAX_VALUE + 1, battery_ratio / (MAX_VALUE + 1))
+    ))
+    tail_lengths = table[2][tail_base:].reshape(len(LOG_LEVELS), len(messages))
+    expected_line = 20 + float(level_p @ tail_lengths @ message_p)
+    seconds_per_line = span_seconds / max(size / expected_line, 1)
+
+    rng = np.random.default_rng(seed)
+    remaining = size
+    line = 0
+    while remaining > 0:
+        levels = rng.choice(len(LOG_LEVELS), size=BLOCK_ROWS, p=level_p)
+        kinds = rng.random(BLOCK_ROWS)
+        values = rng.integers(0, MAX_VALUE + 1, size=BLOCK_ROWS)
+        plain = rng.integers(0, len(PLAIN_MESSAGES), size=BLOCK_ROWS)
+        message_index = np.where(
+            kinds < sensor_ratio, len(PLAIN_MESSAGES) + values,
+            np.where(kinds < sensor_ratio + battery_ratio, len(PLAIN_MESSAGES) + MAX_VALUE + 1 + values, plain)
+        )
+
+        offsets = np.minimum(((line + np.arange(BLOCK_ROWS)) * seconds_per_line).astype(np.int64), span_seconds)
+        seconds = start_offset + offsets
+        pieces = np.column_stack((
+            day_base + seconds // 86400,
+            hour_base + seconds // 3600 % 24,
+            minute_base + seconds // 60 % 60,
+            second_base + seconds % 60,
+            tail_base + levels * len(messages) + message_index
+        ))
+
+        rows = _rows_that_fit(table, pieces, remaining)
+        if rows == 0:
+            return
+        block = _assemble(table, pieces[:rows])
+        remaining -= len(block)
+        line += rows
+        yield block
+        if rows < BLOCK_ROWS:
+            return
+
+def generate_config_corpus(size: int, seed: int = 0) -> Iterator[bytes]:
+    """
+    Generates a synthetic configuration corpus: one JSON document in the
+    layout of simulated device configurations, whose sensor list is grown
+    until the document reaches size.
+
+    Args:
+        size: Maximum size of the corpus in bytes
+        seed: Seed of the random generator
+
+    Yields:
+        bytes: Successive blocks of the JSON document
+    """
+    rng = np.random.default_rng(seed)
+    alphabet = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"))
+
+    def token(length: int) -> str:
+        return "".join(rng.choice(alphabet, size=length))
+
+    header = (
+        '{\n'
+        '    "device": {\n'
+        f'        "name": "{token(8)}",\n'
+        f'        "id": "{token(16)}",\n'
+        f'        "version": "{rng.integers(1, 11)}.{rng.integers(0, 10)}.{rng.integers(0, 10)}"\n'
+        '    },\n'
+        '    "network": {\n'
+        f'        "ssid": "{token(10)}",\n'
+        f'        "type": "{rng.choice(["WiFi", "Ethernet", "Bluetooth", "Zigbee", "Z-Wave"])}",\n'
+        f'        "port": {rng.integers(1024, 65536)}\n'
+        '    },\n'
+        '    "settings": {\n'
+        f'        "logging_level": "{rng.choice(list(LOG_LEVELS))}",\n'
+        f'        "update_interval": {rng.integers(1, 25)}\n'
+        '    },\n'
+        '    "sensors": ['
+    ).encode()
+    footer = b'\n    ]\n}\n'
+    if len(header) + len(footer) > size:
+        return
+
+    # Sensor IDs are split in two zero-padded 4-digit halves so that every
+    # snippet comes from a bounded table
+    table = _build_table([
+        [b'\n        {"id": "SENSOR_', b',\n        {"id": "SENSOR_'],
+        [f"{half:04d}".encode() for half in range(10000)],
+        [f"{half:04d}".encode() for half in range(10000)],
+        [f'", "type": "{sensor_type}", "interval": '.encode() for sensor_type in SENSOR_TYPES],
+        [f"{interval}".encode() for interval in range(1, 61)],
+        [f', "unit": "{unit}"}}'.encode() for unit in SENSOR_UNITS]
+    ])
+    open_base, high_base, low_base, type_base, interval_base, unit_base = table[3]
+
+    yield header
+    remaining = size - len(header) - len(footer)
+    sensor = 0
+    while True:
+        ids = sensor + np.arange(BLOCK_ROWS)
+        pieces = np.column_stack((
+            open_base + (ids > 0),
+            high_base + ids // 10000 % 10000,
+            low_base + ids % 10000,
+            type_base + rng.integers(0, len(SENSOR_TYPES), size=BLOCK_ROWS),
+            interval_base + rng.integers(0, 60, size=BLOCK_ROWS),
+            unit_base + rng.integers(0, len(SENSOR_UNITS), size=BLOCK_ROWS)
+        ))
+
+        rows = _rows_that_fit(table, pieces, remaining)
+        if rows:
+            block = _assemble(table, pieces[:rows])
+            remaining -= len(block)
+            sensor += rows
+            yield block
+        if rows < BLOCK_ROWS:
+            break
+
+    yield footer
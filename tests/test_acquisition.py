@@ -0,0 +1,653 @@
+import errno
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from src import acquisition as acq
+from src import analysis as anl
+from src import evidence_storage
+from src import merkle
+from src import object_store
+from src import synthetic_corpus
+
+
+class AcquisitionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.saved_output_dir = acq.FORENSIC_OUTPUT_DIR
+        acq.FORENSIC_OUTPUT_DIR = os.path.join(self.tmp_dir.name, "forensic_output")
+
+    def tearDown(self):
+        acq.FORENSIC_OUTPUT_DIR = self.saved_output_dir
+        self.tmp_dir.cleanup()
+
+    def write_file(self, name, data):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+
+class TestHashing(AcquisitionTestCase):
+
+    def test_hash_file_computes_all_digests_in_one_pass(self):
+        data = os.urandom(3 * 1024 + 17) + b"\r\n\x00\xff"
+        path = self.write_file("image.bin", data)
+
+        digests = acq.hash_file(path, ("sha256", "md5", "sha1", "blake2b"), chunk_size=1000)
+
+        self.assertEqual(digests["sha256"], hashlib.sha256(data).hexdigest())
+        self.assertEqual(digests["md5"], hashlib.md5(data).hexdigest())
+        self.assertEqual(digests["sha1"], hashlib.sha1(data).hexdigest())
+        self.assertEqual(digests["blake2b"], hashlib.blake2b(data).hexdigest())
+
+    def test_verify_binary_file(self):
+        data = bytes(range(256)) * 10
+        path = self.write_file("image.bin", data)
+
+        self.assertTrue(acq.verify_file_integrity(path, hashlib.sha256(data).hexdigest().upper()))
+        self.assertFalse(acq.verify_file_integrity(path, hashlib.sha256(b"other").hexdigest()))
+        self.assertFalse(acq.verify_file_integrity(path + ".missing", hashlib.sha256(data).hexdigest()))
+
+    def test_simulated_acquisition_verifies(self):
+        output_path, sha256_hash, _ = acq.simulate_acquisition("DEV_TEST", "log")
+        self.assertTrue(acq.verify_file_integrity(output_path, sha256_hash))
+        with open(output_path + ".meta") as f:
+            self.assertEqual(json.load(f)["sha256_hash"], sha256_hash)
+
+
+class TestStreamingAcquisition(AcquisitionTestCase):
+
+    def test_hash_and_size_cover_every_chunk(self):
+        chunks = [os.urandom(1000) for _ in range(5)]
+
+        path, sha256_hash, _ = acq.acquire_stream("DEV_A", "image", iter(chunks), "image.dat")
+
+        data = b"".join(chunks)
+        self.assertEqual(sha256_hash, hashlib.sha256(data).hexdigest())
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), data)
+        with open(path + ".meta") as f:
+            self.assertEqual(json.load(f)["file_size"], len(data))
+
+    def test_log_chunks_form_one_log(self):
+        chunks = list(acq.generate_content_chunks(50_000, "log", chunk_size=4096))
+
+        self.assertGreater(len(chunks), 1)
+        lines = b"".join(chunks).decode("utf-8").split("\n")
+        self.assertEqual(len(lines), 500)
+        self.assertTrue(all(line.startswith("[") for line in lines))
+
+    def test_simulate_with_size(self):
+        path, sha256_hash, _ = acq.simulate_acquisition("DEV_A", "binary", "blob.dat", size=3 * 1024 * 1024 + 5)
+
+        self.assertEqual(os.path.getsize(path), 3 * 1024 * 1024 + 5)
+        self.assertTrue(acq.verify_file_integrity(path, sha256_hash, force=True))
+
+
+class TestSyntheticCorpus(AcquisitionTestCase):
+
+    def test_log_corpus_is_reproducible_and_parseable(self):
+        options = dict(seed=7, level_weights={"INFO": 3, "ERROR": 1}, sensor_ratio=0.5, battery_ratio=0.25,
+                       start=datetime(2024, 3, 1, 23, 0), span_seconds=7200)
+        data = b"".join(synthetic_corpus.generate_log_corpus(200_000, **options))
+
+        self.assertEqual(data, b"".join(synthetic_corpus.generate_log_corpus(200_000, **options)))
+        self.assertNotEqual(data, b"".join(synthetic_corpus.generate_log_corpus(200_000, **dict(options, seed=8))))
+        self.assertLessEqual(len(data), 200_000)
+        self.assertTrue(data.endswith(b"\n"))
+
+        entries = anl.parse_log_file(data.decode("utf-8"))
+        self.assertEqual(len(entries), data.count(b"\n"))
+        self.assertEqual({entry["level"] for entry in entries}, {"INFO", "ERROR"})
+        self.assertEqual(entries[0]["timestamp"], "2024-03-01T23:00:00")
+        self.assertLessEqual(entries[-1]["timestamp"], "2024-03-02T01:00:00")
+        self.assertEqual([e["timestamp"] for e in entries], sorted(e["timestamp"] for e in entries))
+        sensor_share = sum("sensor_value" in entry for entry in entries) / len(entries)
+        self.assertAlmostEqual(sensor_share, 0.5, delta=0.05)
+
+    def test_config_corpus_is_valid_json(self):
+        data = b"".join(synthetic_corpus.generate_config_corpus(100_000, seed=1))
+
+        self.assertLessEqual(len(data), 100_000)
+        self.assertGreater(len(data), 99_000)
+        config = json.loads(data)
+        self.assertGreater(len(config["sensors"]), 1000)
+        self.assertEqual(data, b"".join(synthetic_corpus.generate_config_corpus(100_000, seed=1)))
+
+    def test_seeded_acquisition(self):
+        _, first_hash, _ = acq.simulate_acquisition("DEV_A", "log", "first.dat", size=50_000, seed=3)
+        _, second_hash, _ = acq.simulate_acquisition("DEV_A", "log", "second.dat", size=50_000, seed=3)
+
+        self.assertEqual(first_hash, second_hash)
+
+
+class TestCompressedStorage(AcquisitionTestCase):
+
+    def acquire(self, compression, data, frame_size=1000):
+        with patch.object(evidence_storage, "DEFAULT_FRAME_SIZE", frame_size):
+            chunks = (data[i:i + 333] for i in range(0, len(data), 333))
+            return acq.acquire_stream("DEV_A", "log", chunks, compression=compression)
+
+    def test_meta_records_uncompressed_hash_and_frames(self):
+        data = b"[2024-01-01T00:00:00] [INFO] Device started\n" * 200
+        for compression in ("gzip", "lzma"):
+            with self.subTest(compression=compression):
+                path, sha256_hash, _ = self.acquire(compression, data)
+                with open(path + ".meta") as f:
+                    metadata = json.load(f)
+
+                self.assertTrue(path.endswith(evidence_storage.COMPRESSION_EXTENSIONS[compression]))
+                self.assertEqual(sha256_hash, hashlib.sha256(data).hexdigest())
+                self.assertEqual(metadata["file_size"], len(data))
+                self.assertEqual(metadata["stored_size"], os.path.getsize(path))
+                self.assertLess(metadata["stored_size"], len(data))
+                self.assertEqual(len(metadata["frames"]), 9)
+                with evidence_storage.open_evidence(path, compression) as f:
+                    self.assertEqual(f.read(), data)
+
+    def test_readers_are_transparent(self):
+        data = os.urandom(2500) + b"\n".join(b"line %d" % i for i in range(500))
+        path, sha256_hash, _ = self.acquire("gzip", data)
+
+        self.assertTrue(acq.verify_file_integrity(path, sha256_hash, force=True))
+        self.assertEqual(acq.stored_compression(path), "gzip")
+        self.assertNotEqual(acq.hash_file(path)["sha256"], sha256_hash)
+        with evidence_storage.open_evidence(path, "gzip") as f:
+            self.assertEqual(f.read(), data)
+
+        for offset, length in ((0, 10), (995, 10), (1500, 2200), (len(data) - 5, 100)):
+            self.assertEqual(acq.read_acquisition_range(path, offset, length), data[offset:offset + length])
+
+    def test_simulated_log_is_analyzable(self):
+        path, _, _ = acq.simulate_acquisition("DEV_A", "log", size=20_000, seed=1, compression="lzma")
+        with evidence_storage.open_evidence_text(path, acq.stored_compression(path)) as f:
+            self.assertGreater(len(anl.parse_log_file(f.read())), 100)
+
+
+class TestChunkVerification(AcquisitionTestCase):
+
+    def acquire(self, data, compression=None, chunk_size=1000):
+        with patch.object(merkle, "MERKLE_CHUNK_SIZE", chunk_size), \
+                patch.object(evidence_storage, "DEFAULT_FRAME_SIZE", chunk_size):
+            path, _, _ = acq.acquire_stream("DEV_A", "image", iter([data]), compression=compression)
+        return path
+
+    def corrupt(self, path, offset, data):
+        with open(path, "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+
+    def test_merkle_root(self):
+        leaves = [merkle.leaf_hash(bytes([i])) for i in range(3)]
+        node = lambda left, right: hashlib.sha256(b"\x01" + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+        self.assertIsNone(merkle.merkle_root([]))
+        self.assertEqual(merkle.merkle_root(leaves[:1]), leaves[0])
+        self.assertEqual(merkle.merkle_root(leaves), node(node(leaves[0], leaves[1]), leaves[2]))
+
+    def test_chunk_hashes_recorded(self):
+        data = os.urandom(3500)
+        path = self.acquire(data)
+        with open(path + ".meta") as f:
+            metadata = json.load(f)
+
+        expected = [merkle.leaf_hash(data[i:i + 1000]) for i in range(0, 3500, 1000)]
+        self.assertEqual(metadata["chunk_hashes"], expected)
+        self.assertEqual(metadata["merkle_root"], merkle.merkle_root(expected))
+        self.assertEqual(acq.verify_chunks(path, max_workers=2)["status"], "ok")
+
+    def test_locates_corrupted_ranges(self):
+        path = self.acquire(os.urandom(5500))
+        self.corrupt(path, 1500, b"x")
+        self.corrupt(path, 2999, b"x")
+        self.corrupt(path, 5200, b"x")
+
+        result = acq.verify_chunks(path, max_workers=3)
+
+        self.assertEqual(result["status"], "corrupted")
+        self.assertFalse(result["merkle_root_ok"])
+        self.assertEqual(result["corrupted_chunks"], [1, 2, 5])
+        self.assertEqual(result["corrupted_ranges"], [(1000, 3000), (5000, 5500)])
+
+    def test_compressed_frame_corruption_and_trailing_data(self):
+        path = self.acquire(b"0123456789" * 500, compression="gzip")
+        with open(path + ".meta") as f:
+            frames = json.load(f)["frames"]
+        self.corrupt(path, frames[3]["stored_offset"] + 12, b"\xff\xff\xff")
+        with open(path, "ab") as f:
+            f.write(b"extra")
+
+        result = acq.verify_chunks(path)
+
+        self.assertEqual(result["corrupted_ranges"], [(3000, 4000)])
+        self.assertEqual(result["trailing_bytes"], 5)
+
+    def test_legacy_acquisition_without_chunk_hashes(self):
+        path = self.write_file("legacy.dat", b"data")
+        self.assertEqual(acq.verify_chunks(path)["status"], "error")
+
+
+class TestFilesystemAcquisition(AcquisitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.image = os.path.join(self.tmp_dir.name, "image")
+        self.files = {
+            "var/log/syslog": os.urandom(5000),
+            "var/log/app/app.log": b"[2024-01-01T00:00:00] [INFO] Device started\n",
+            "var/log/app/old.meta": b"not metadata",
+            "etc/config.json": b'{"a": 1}',
+            "etc/other.txt": b"ignored"
+        }
+        for relative_path, data in self.files.items():
+            path = os.path.join(self.image, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def test_copies_matching_files_with_metadata(self):
+        results = list(acq.acquire_filesystem(self.image, "DEV_A", ["/var/log/", "/etc/*.json", "/missing/"], max_workers=3))
+
+        self.assertTrue(all(result["status"] == "done" for result in results))
+        acquired = {r["metadata"]["source_path"]: r["metadata"] for r in results}
+        self.assertEqual(sorted(acquired), ["/etc/config.json", "/var/log/app/app.log", "/var/log/app/old.meta", "/var/log/syslog"])
+        for source_path, metadata in acquired.items():
+            data = self.files[source_path.lstrip("/")]
+            with open(metadata["file_path"], "rb") as f:
+                self.assertEqual(f.read(), data)
+            self.assertEqual(metadata["sha256_hash"], hashlib.sha256(data).hexdigest())
+            self.assertEqual(metadata["source_type"], "filesystem")
+            self.assertTrue(os.path.exists(metadata["file_path"] + ".meta"))
+
+        # Acquired files named *.meta are not mistaken for metadata
+        self.assertEqual(len(acq.list_acquisitions()), 4)
+        self.assertEqual(acq.rebuild_catalog(), 4)
+        self.assertEqual(len(acq.find_acquisitions(device_id="DEV_A", source_type="filesystem")), 4)
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symbolic links not supported")
+    def test_symlinks_are_not_followed(self):
+        outside = self.write_file("host_secret", b"secret")
+        os.symlink(outside, os.path.join(self.image, "var/log/link"))
+        os.symlink(os.path.dirname(outside), os.path.join(self.image, "hostdir"))
+
+        results = list(acq.acquire_filesystem(self.image, "DEV_A", ["/var/log/", "/hostdir/", "/../"]))
+
+        self.assertEqual(sorted(r["metadata"]["source_path"] for r in results),
+                         ["/var/log/app/app.log", "/var/log/app/old.meta", "/var/log/syslog"])
+
+    def test_file_named_like_another_files_metadata_is_not_written(self):
+        with open(os.path.join(self.image, "var/log/syslog.meta"), "wb") as f:
+            f.write(b'{"file_path": "syslog"}')
+
+        for max_workers in (1, 3):
+            with self.subTest(max_workers=max_workers):
+                results = {r["source_path"]: r for r in acq.acquire_filesystem(self.image, "DEV_A", ["/var/log/"], max_workers=max_workers)}
+
+                collision = results.pop(os.path.join(os.path.realpath(self.image), "var", "log", "syslog.meta"))
+                self.assertEqual(collision["status"], "failed")
+                self.assertIn("metadata file of syslog", collision["error"])
+                self.assertTrue(all(result["status"] == "done" for result in results.values()))
+
+                syslog = next(r["metadata"] for r in results.values() if r["metadata"]["source_path"] == "/var/log/syslog")
+                with open(syslog["file_path"], "rb") as f:
+                    self.assertEqual(f.read(), self.files["var/log/syslog"])
+                self.assertEqual(acq.verify_acquisition(syslog, force=True)["status"], "ok")
+                with open(syslog["file_path"] + ".meta") as f:
+                    self.assertEqual(json.load(f)["sha256_hash"], syslog["sha256_hash"])
+
+    def test_compressed_source_files_are_acquired_as_is(self):
+        data = evidence_storage.compress_frame(b"[2024-01-01T00:00:00] [INFO] Device started\n" * 100, "gzip")
+        with open(os.path.join(self.image, "var/log/syslog.2.gz"), "wb") as f:
+            f.write(data)
+
+        results = list(acq.acquire_filesystem(self.image, "DEV_A", ["/var/log/syslog.2.gz"]))
+        metadata = results[0]["metadata"]
+        path = metadata["file_path"]
+
+        self.assertEqual(metadata["sha256_hash"], hashlib.sha256(data).hexdigest())
+        self.assertIsNone(acq.stored_compression(path))
+        self.assertEqual(acq.verify_acquisition(metadata, force=True)["status"], "ok")
+        self.assertEqual(acq.verify_acquisition(metadata)["status"], "ok")
+        self.assertEqual([r["status"] for r in acq.verify_all_acquisitions(max_workers=1, force=True)], ["ok"])
+        self.assertTrue(acq.verify_file_integrity(path, metadata["sha256_hash"], force=True))
+        self.assertEqual(acq.verify_chunks(path)["status"], "ok")
+        self.assertEqual(acq.read_acquisition_range(path, 0, 100), data[:100])
+
+    def test_zero_copy_fallbacks(self):
+        data = os.urandom(300_000)
+        source = self.write_file("source.bin", data)
+        for disabled in ((), ("copy_file_range",), ("copy_file_range", "sendfile")):
+            with self.subTest(disabled=disabled):
+                dest = os.path.join(self.tmp_dir.name, "dest_" + "_".join(disabled))
+                patches = [patch.object(os, name, side_effect=OSError(errno.ENOSYS, "unsupported"))
+                           for name in disabled if hasattr(os, name)]
+                for p in patches:
+                    p.start()
+                try:
+                    with open(source, "rb") as fsrc, open(dest, "wb") as fdst:
+                        acq._zero_copy(fsrc.fileno(), fdst.fileno(), len(data))
+                finally:
+                    for p in patches:
+                        p.stop()
+                with open(dest, "rb") as f:
+                    self.assertEqual(f.read(), data)
+
+
+class TestDedupStore(AcquisitionTestCase):
+
+    def acquire(self, data, **kwargs):
+        return acq.acquire_stream("DEV_TEST", "config", [data], dedup=True, **kwargs)
+
+    def test_identical_acquisitions_share_one_blob(self):
+        data = b'{"device": {"id": "X"}}\n' * 100
+        first, sha256_hash, _ = self.acquire(data)
+        second, _, _ = self.acquire(data)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(os.stat(first).st_ino, os.stat(second).st_ino)
+        blob_path = object_store.object_path(acq.objects_dir(), sha256_hash)
+        self.assertTrue(os.path.samefile(first, blob_path))
+        with open(second + ".meta") as f:
+            self.assertEqual(json.load(f)["blob"], sha256_hash)
+        self.assertTrue(acq.verify_file_integrity(second, sha256_hash))
+
+        stats = acq.storage_stats()
+        self.assertEqual(stats["acquisitions"], 2)
+        self.assertEqual(stats["unique_files"], 1)
+        self.assertEqual(stats["logical_bytes"], 2 * len(data))
+        self.assertEqual(stats["saved_bytes"], len(data))
+
+    def test_compressed_blob_is_keyed_on_stored_bytes(self):
+        output_path, _, _ = self.acquire(b"line\n" * 1000, compression="gzip")
+
+        with open(output_path, "rb") as f:
+            stored = f.read()
+        with open(output_path + ".meta") as f:
+            self.assertEqual(json.load(f)["blob"], hashlib.sha256(stored).hexdigest())
+        self.assertEqual(acq.read_acquisition_range(output_path, 0, 5), b"line\n")
+
+    def test_object_store_is_not_read_as_metadata(self):
+        self.acquire(b"data")
+        self.assertEqual(acq.rebuild_catalog(), 1)
+
+    def test_gc_removes_only_unreferenced_blobs(self):
+        kept_path, kept_hash, _ = self.acquire(b"kept")
+        dropped_path, dropped_hash, _ = self.acquire(b"dropped")
+        os.remove(dropped_path)
+        os.remove(dropped_path + ".meta")
+
+        with patch.object(object_store, "GC_GRACE_SECONDS", -10):
+            self.assertEqual(acq.gc_objects(dry_run=True)["removed"], 1)
+            self.assertTrue(os.path.exists(object_store.object_path(acq.objects_dir(), dropped_hash)))
+
+            result = acq.gc_objects()
+
+        self.assertEqual(result, {"kept": 1, "removed": 1, "freed_bytes": len(b"dropped")})
+        self.assertFalse(os.path.exists(object_store.object_path(acq.objects_dir(), dropped_hash)))
+        self.assertTrue(acq.verify_file_integrity(kept_path, kept_hash))
+
+    def test_gc_spares_recent_blobs(self):
+        output_path, _, _ = self.acquire(b"in progress")
+        os.remove(output_path + ".meta")
+
+        self.assertEqual(acq.gc_objects()["removed"], 0)
+
+    def test_overwriting_named_output_does_not_touch_shared_blob(self):
+        _, sha256_hash, _ = self.acquire(b"shared", output_filename="named.dat")
+        acq.acquire_stream("DEV_TEST", "config", [b"replacement"], output_filename="named.dat")
+
+        with open(object_store.object_path(acq.objects_dir(), sha256_hash), "rb") as f:
+            self.assertEqual(f.read(), b"shared")
+
+
+class TestResumableAcquisition(AcquisitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for target, value in ((merkle, "MERKLE_CHUNK_SIZE"), (acq, "HASH_CHUNK_SIZE")):
+            patcher = patch.object(target, value, 1000)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.data = os.urandom(10500)
+        self.source = self.write_file("flash.img", self.data)
+
+    def interrupt_after(self, writes):
+        original_write = acq.AcquisitionWriter.write
+        calls = []
+
+        def flaky_write(writer, chunk):
+            calls.append(chunk)
+            if len(calls) > writes:
+                raise KeyboardInterrupt
+            original_write(writer, chunk)
+
+        with patch.object(acq.AcquisitionWriter, "write", flaky_write):
+            with self.assertRaises(KeyboardInterrupt):
+                acq.acquire_image(self.source, "DEV_TEST")
+
+    def test_interrupted_acquisition_resumes(self):
+        self.interrupt_after(4)
+        checkpoint = acq.find_checkpoint("DEV_TEST", self.source)
+        self.assertEqual(checkpoint["bytes_written"], 4000)
+
+        resumed = []
+        with patch.object(acq.AcquisitionWriter, "write", autospec=True, side_effect=acq.AcquisitionWriter.write) as write:
+            output_path, sha256_hash, _ = acq.acquire_image(self.source, "DEV_TEST", on_resume=lambda *args: resumed.append(args))
+        self.assertEqual(sum(len(call.args[1]) for call in write.call_args_list), len(self.data) - 4000)
+        self.assertEqual(resumed, [(output_path, 4000)])
+
+        self.assertEqual(sha256_hash, hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(output_path, checkpoint["file_path"])
+        with open(output_path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        with open(output_path + ".meta") as f:
+            metadata = json.load(f)
+        self.assertEqual(metadata["resumed_at"], [4000])
+        self.assertEqual(metadata["source_path"], os.path.abspath(self.source))
+        self.assertEqual(metadata["merkle_root"], merkle.merkle_root(
+            [merkle.leaf_hash(self.data[i:i + 1000]) for i in range(0, len(self.data), 1000)]))
+        self.assertFalse(os.path.exists(output_path + acq.PART_SUFFIX))
+        self.assertFalse(os.path.exists(output_path + acq.CHECKPOINT_SUFFIX))
+        self.assertEqual(acq.verify_acquisition(metadata)["status"], "ok")
+
+    def test_corrupted_partial_data_is_rehashed(self):
+        self.interrupt_after(6)
+        part_path = glob.glob(os.path.join(acq.FORENSIC_OUTPUT_DIR, "*" + acq.PART_SUFFIX))[0]
+        with open(part_path, "r+b") as f:
+            f.seek(2500)
+            f.write(b"\x00" if self.data[2500] else b"\x01")
+        with open(part_path[:-len(acq.PART_SUFFIX)] + acq.CHECKPOINT_SUFFIX, "a") as f:
+            f.write('{"bytes_written": 70')
+
+        resumed = []
+        output_path, sha256_hash, _ = acq.acquire_image(self.source, "DEV_TEST", on_resume=lambda *args: resumed.append(args))
+
+        self.assertEqual(resumed, [(output_path, 2000)])
+        self.assertEqual(sha256_hash, hashlib.sha256(self.data).hexdigest())
+        with open(output_path + ".meta") as f:
+            self.assertEqual(json.load(f)["resumed_at"], [2000])
+
+    def test_changed_source_starts_over(self):
+        self.interrupt_after(4)
+        self.data = os.urandom(3000)
+        self.write_file("flash.img", self.data)
+        os.utime(self.source, ns=(0, 0))
+
+        resumed = []
+        output_path, sha256_hash, _ = acq.acquire_image(self.source, "DEV_TEST", on_resume=lambda *args: resumed.append(args))
+
+        self.assertEqual(resumed, [])
+        self.assertEqual(sha256_hash, hashlib.sha256(self.data).hexdigest())
+        with open(output_path + ".meta") as f:
+            self.assertNotIn("resumed_at", json.load(f))
+        self.assertEqual(sorted(os.listdir(acq.FORENSIC_OUTPUT_DIR)),
+                         sorted([os.path.basename(output_path), os.path.basename(output_path) + ".meta", "catalog.db"]))
+
+    def test_missing_partial_data_starts_over(self):
+        self.interrupt_after(4)
+        os.remove(glob.glob(os.path.join(acq.FORENSIC_OUTPUT_DIR, "*" + acq.PART_SUFFIX))[0])
+
+        resumed = []
+        _, sha256_hash, _ = acq.acquire_image(self.source, "DEV_TEST", on_resume=lambda *args: resumed.append(args))
+
+        self.assertEqual(resumed, [])
+        self.assertEqual(sha256_hash, hashlib.sha256(self.data).hexdigest())
+
+    def test_resumable_acquisitions_are_stored_raw(self):
+        with self.assertRaises(ValueError):
+            acq.AcquisitionWriter("DEV_TEST", "image", compression="gzip", resumable=True)
+
+
+class TestVerifyAll(AcquisitionTestCase):
+
+    def test_reports_each_acquisition(self):
+        intact, _, _ = acq.simulate_acquisition("DEV_A", "log", "intact.dat")
+        tampered, _, _ = acq.simulate_acquisition("DEV_A", "config", "tampered.dat")
+        missing, _, _ = acq.simulate_acquisition("DEV_B", "log", "missing.dat")
+        with open(tampered, "ab") as f:
+            f.write(b"tampered")
+        os.remove(missing)
+
+        results = {r["file_path"]: r["status"] for r in acq.verify_all_acquisitions(max_workers=2)}
+
+        self.assertEqual(results, {intact: "ok", tampered: "mismatch", missing: "missing"})
+
+    def test_checks_meta_files_rather_than_catalog(self):
+        uncataloged, _, _ = acq.simulate_acquisition("DEV_A", "log", "intact.dat")
+        dropped, _, _ = acq.simulate_acquisition("DEV_A", "log", "dropped.dat")
+        os.remove(dropped + ".meta")
+
+        # A .meta file the catalog has never seen, whose hash does not match
+        copy = os.path.join(acq.FORENSIC_OUTPUT_DIR, "copy.dat")
+        with open(uncataloged, "rb") as src, open(copy, "wb") as dst:
+            dst.write(src.read() + b"changed")
+        with open(uncataloged + ".meta") as f:
+            metadata = json.load(f)
+        metadata["file_path"] = copy
+        with open(copy + ".meta", "w") as f:
+            json.dump(metadata, f)
+
+        results = {r["file_path"]: r["status"] for r in acq.verify_all_acquisitions(max_workers=1)}
+
+        self.assertEqual(results, {uncataloged: "ok", copy: "mismatch"})
+
+    def test_empty_output_dir(self):
+        self.assertEqual(list(acq.verify_all_acquisitions()), [])
+
+
+class TestCatalog(AcquisitionTestCase):
+
+    def test_lookups_use_catalog(self):
+        log_a, _, _ = acq.simulate_acquisition("DEV_A", "log", "a_log.dat")
+        config_a, _, _ = acq.simulate_acquisition("DEV_A", "config", "a_config.dat")
+        log_b, _, _ = acq.simulate_acquisition("DEV_B", "log", "b_log.dat")
+
+        paths = lambda acquisitions: sorted(a["file_path"] for a in acquisitions)
+        self.assertEqual(paths(acq.list_acquisitions()), sorted([log_a, config_a, log_b]))
+        self.assertEqual(paths(acq.find_acquisitions(device_id="DEV_A")), sorted([log_a, config_a]))
+        self.assertEqual(paths(acq.find_acquisitions(source_type="log")), sorted([log_a, log_b]))
+        self.assertEqual(paths(acq.find_acquisitions(device_id="DEV_A", source_type="log")), [log_a])
+        self.assertEqual(paths(acq.find_acquisitions(file_paths=[log_b, "missing.dat"])), [log_b])
+        self.assertEqual(acq.find_acquisitions(timestamps=[]), [])
+
+    def test_rebuild_from_meta_files(self):
+        path, sha256_hash, timestamp = acq.simulate_acquisition("DEV_A", "log", "a_log.dat")
+        os.remove(acq.catalog_path())
+
+        # A missing catalog is rebuilt from the .meta files on first use
+        found = acq.find_acquisitions(timestamps=[timestamp])
+        self.assertEqual([(a["file_path"], a["sha256_hash"]) for a in found], [(path, sha256_hash)])
+
+        os.remove(path + ".meta")
+        self.assertEqual(acq.rebuild_catalog(), 0)
+        self.assertEqual(acq.list_acquisitions(), [])
+
+
+class TestHashCache(AcquisitionTestCase):
+
+    def write_file(self, name, data):
+        # Only evidence in the output directory is cached
+        acq.ensure_output_dir_exists()
+        return super().write_file(os.path.join("forensic_output", name), data)
+
+    def make_old(self, path):
+        # Files modified within the last moments are never cached
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 60 * 10**9))
+
+    def test_unchanged_file_is_answered_from_cache(self):
+        data = b"evidence" * 1000
+        path = self.write_file("image.bin", data)
+        self.make_old(path)
+        expected = hashlib.sha256(data).hexdigest()
+
+        self.assertEqual(acq.hash_file_cached(path), ({"sha256": expected}, False))
+        self.assertEqual(acq.hash_file_cached(path), ({"sha256": expected}, True))
+        self.assertEqual(acq.hash_file_cached(path, force=True), ({"sha256": expected}, False))
+
+        # Algorithms not cached yet force a read
+        digests, cached = acq.hash_file_cached(path, ("sha256", "md5"))
+        self.assertFalse(cached)
+        self.assertEqual(digests["md5"], hashlib.md5(data).hexdigest())
+
+    def test_modified_file_is_rehashed(self):
+        path = self.write_file("image.bin", b"original")
+        self.make_old(path)
+        acq.hash_file_cached(path)
+
+        with open(path, "wb") as f:
+            f.write(b"tampered")
+        self.make_old(path)
+
+        digests, cached = acq.hash_file_cached(path)
+        self.assertFalse(cached)
+        self.assertEqual(digests["sha256"], hashlib.sha256(b"tampered").hexdigest())
+
+    def test_recently_modified_file_is_not_cached(self):
+        path = self.write_file("image.bin", b"fresh")
+        acq.hash_file_cached(path)
+        self.assertFalse(acq.hash_file_cached(path)[1])
+
+    def test_files_outside_output_dir_leave_catalog_alone(self):
+        path = AcquisitionTestCase.write_file(self, "elsewhere.bin", b"not evidence")
+        self.make_old(path)
+
+        self.assertTrue(acq.verify_file_integrity(path, hashlib.sha256(b"not evidence").hexdigest()))
+        self.assertEqual(acq.hash_file_cached(path)[1], False)
+        self.assertFalse(os.path.exists(acq.FORENSIC_OUTPUT_DIR))
+
+
+class TestBatch(AcquisitionTestCase):
+
+    def test_runs_every_job_once(self):
+        device_ids = [f"DEV_{i}" for i in range(5)]
+
+        results = list(acq.run_acquisition_batch(device_ids, ["log", "config"], max_workers=4))
+
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(result["status"] == "done" for result in results))
+        self.assertEqual(
+            sorted((r["device_id"], r["source_type"]) for r in results),
+            sorted((d, t) for d in device_ids for t in ["log", "config"])
+        )
+        self.assertEqual(len(acq.list_acquisitions()), 10)
+        for result in results:
+            self.assertTrue(acq.verify_file_integrity(result["output_path"], result["sha256_hash"]))
+
+    def test_same_second_acquisitions_do_not_collide(self):
+        results = list(acq.run_acquisition_batch(["DEV_A"] * 6, ["log"], max_workers=6))
+
+        paths = {result["output_path"] for result in results}
+        self.assertEqual(len(paths), 6)
+        self.assertEqual(sorted(a["file_path"] for a in acq.list_acquisitions()), sorted(paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import io
+import itertools
+import os
+import tempfile
+import tracemalloc
+import unittest
+from datetime import datetime
+
+from src import analysis as anl
+from src import evidence_storage
+from src import synthetic_corpus
+
+
+SAMPLE_LOG = (
+    "[2024-01-01T10:00:00] [INFO] Device started\n"
+    "[2024-01-01T10:00:05] [INFO] Sensor reading: 42\r\n"
+    "not a log line\n"
+    "[not a timestamp] [ERROR] Skipped\n"
+    "[2024-01-01T09:59:00] [WARNING] Battery level: 15%\n"
+    "[2024-01-01T10:01:00] [ERROR] Sensor reading: 7\n"
+    "[2024-01-01T10:02:00] [DEBUG] Battery level: 80%"
+)
+
+
+class TestStreamingLogParser(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write_file(self, name, data):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_stream_matches_parse_log_file(self):
+        expected = anl.parse_log_file(SAMPLE_LOG)
+
+        self.assertEqual(len(expected), 5)
+        self.assertEqual(expected[0], {"timestamp": "2024-01-01T10:00:00", "level": "INFO", "message": "Device started"})
+        self.assertEqual(list(map(anl.format_log_entry, anl.iter_log_entries(io.StringIO(SAMPLE_LOG)))), expected)
+        self.assertEqual(list(map(anl.format_log_entry, anl.iter_log_entries(io.BytesIO(SAMPLE_LOG.encode())))), expected)
+
+    def test_stream_from_raw_and_compressed_evidence(self):
+        data = b"".join(synthetic_corpus.generate_log_corpus(200000, seed=5))
+        expected = anl.parse_log_file(data.decode())
+
+        raw_path = self.write_file("log.dat", data)
+        with evidence_storage.open_evidence(raw_path) as f:
+            self.assertEqual(list(map(anl.format_log_entry, anl.iter_log_entries(f))), expected)
+
+        gzip_path = self.write_file("log.dat.gz", evidence_storage.compress_frame(data, "gzip"))
+        with evidence_storage.open_evidence(gzip_path, "gzip") as f:
+            self.assertEqual(list(map(anl.format_log_entry, anl.iter_log_entries(f))), expected)
+
+    def test_invalid_utf8_is_replaced(self):
+        entries = list(anl.iter_log_entries(io.BytesIO(b"[2024-01-01T10:00:00] [INFO] caf\xe9\n")))
+        self.assertEqual(entries[0]["message"], "caf\ufffd")
+
+    def test_single_pass_extraction_edge_cases(self):
+        lines = [
+            "[2024-01-01T10:00:00] [INFO] Sensor reading: 42",
+            "[2024-01-01T10:00:00] [INFO] Battery level: 15%",
+            "[2024-01-01T10:00:00] [INFO] Probe 3 Sensor reading: 17 (late)",
+            "[2024-01-01T10:00:00] [INFO] Battery level: 15% Sensor reading: 9",
+            "[2024-01-01T10:00:00] [INFO] Sensor reading: n/a, Battery level: 5%",
+            "[2024-01-01T10:00:00] [INFO] Battery level: 15",
+            "[2024-01-01T10:00:00] [IN]FO] level with a bracket",
+        ]
+        entries = anl.parse_log_file("\n".join(lines))
+
+        fields = [{key: entry[key] for key in ("sensor_value", "battery_level") if key in entry} for entry in entries]
+        self.assertEqual(fields, [
+            {"sensor_value": 42},
+            {"battery_level": 15},
+            {"sensor_value": 17},
+            {"sensor_value": 9},
+            {},
+            {},
+            {}
+        ])
+        self.assertEqual(entries[2]["message"], "Probe 3 Sensor reading: 17 (late)")
+        self.assertEqual((entries[6]["level"], entries[6]["message"]), ("IN]FO", "level with a bracket"))
+
+    def test_analysis_of_stream_matches_list(self):
+        entries = anl.parse_log_file(SAMPLE_LOG)
+        analysis = anl.analyze_log_events(iter(entries))
+
+        self.assertEqual(analysis, anl.analyze_log_events(entries))
+        self.assertEqual(analysis["total_entries"], 5)
+        self.assertEqual(analysis["start_time"], "2024-01-01T09:59:00")
+        self.assertEqual(analysis["end_time"], "2024-01-01T10:02:00")
+        self.assertEqual(analysis["duration_seconds"], 180.0)
+        self.assertEqual(analysis["event_counts"], {"INFO": 2, "WARNING": 1, "ERROR": 1, "DEBUG": 1})
+        self.assertEqual((analysis["error_count"], analysis["warning_count"]), (1, 1))
+        self.assertEqual(analysis["sensor_stats"], {"count": 2, "min": 7, "max": 42, "avg": 24.5})
+        self.assertEqual(analysis["battery_stats"], {"count": 2, "min": 15, "max": 80, "avg": 47.5})
+        self.assertEqual(anl.analyze_log_events(iter([])), {"error": "No log entries to analyze"})
+
+    def test_analysis_of_native_timestamps(self):
+        entries = list(anl.iter_log_entries(io.StringIO(SAMPLE_LOG)))
+
+        self.assertEqual(entries[0]["timestamp_ns"], 1704103200 * 10**9)
+        self.assertEqual(anl.analyze_log_events(entries), anl.analyze_log_events(anl.parse_log_file(SAMPLE_LOG)))
+        in_range = anl.extract_time_range(entries, "2024-01-01T10:00:00", "2024-01-01T10:01:00")
+        self.assertEqual([entry["level"] for entry in in_range], ["INFO", "INFO", "ERROR"])
+        self.assertEqual(anl.extract_time_range(entries, "yesterday", "today"), [])
+
+    def test_timestamps_match_datetime(self):
+        timestamps = [
+            "2024-01-01T10:00:00",
+            "2024-02-29 23:59:59",
+            "1969-12-31T23:59:59.999999",
+            "2024-01-01T10:00:00.000001",
+            "2024-01-01T10:00:00.5",
+            "2024-01-01T10:00:00.1234567",
+            "20240101T100000",
+            "2024-01-01T10:00:00+05:30",
+            "2024-01-01T10:00:00.250000Z",
+            "2024-06-01T00:00:00-07:00"
+        ]
+        for timestamp_str in timestamps:
+            with self.subTest(timestamp_str):
+                timestamp = datetime.fromisoformat(timestamp_str)
+                formatted = anl.format_timestamp(*anl.parse_timestamp(timestamp_str))
+                self.assertEqual(formatted, timestamp.isoformat())
+
+        self.assertEqual(anl.parse_timestamp("2024-01-01T10:00:00+05:30"), (1704083400 * 10**9, 19800.0))
+        for invalid in ("2024-13-01T10:00:00", "2024-01-01T10:00:00.12345\u0663", "not a timestamp"):
+            with self.assertRaises(ValueError):
+                anl.parse_timestamp(invalid)
+
+    def test_offset_timestamps_round_trip(self):
+        log = "[2024-01-01T10:00:00+02:00] [INFO] a\n[2024-01-01T09:30:00] [INFO] b\n[2024-01-01T07:00:00-01:00] [INFO] c"
+        entries = anl.parse_log_file(log)
+        analysis = anl.analyze_log_events(anl.iter_log_entries(io.StringIO(log)))
+
+        self.assertEqual([entry["timestamp"] for entry in entries], ["2024-01-01T10:00:00+02:00", "2024-01-01T09:30:00", "2024-01-01T07:00:00-01:00"])
+        self.assertEqual((analysis["start_time"], analysis["end_time"]), ("2024-01-01T10:00:00+02:00", "2024-01-01T09:30:00"))
+        self.assertEqual(analysis, anl.analyze_log_events(entries))
+
+    def test_analysis_memory_is_bounded(self):
+        line = "[2024-01-01T10:00:00] [ERROR] Sensor reading: 42\n"
+
+        def peak_for(lines):
+            tracemalloc.start()
+            anl.analyze_log_events(anl.iter_log_entries(itertools.repeat(line, lines)))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        self.assertLess(peak_for(50000), 2 * peak_for(5000) + 64 * 1024)
+
+
+class TestParallelLogParser(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        data = b"".join(synthetic_corpus.generate_log_corpus(400000, seed=11, sensor_ratio=0.3, battery_ratio=0.1))
+        # Lines the parser skips, invalid UTF-8 and an unterminated last line
+        data += SAMPLE_LOG.encode() + b"\n[2024-01-01T10:03:00] [INFO] caf\xe9\n[2024-01-01T10:04:00] [INFO] last"
+        self.log_path = os.path.join(self.tmp_dir.name, "device.log")
+        with open(self.log_path, "wb") as f:
+            f.write(data)
+        self.data = data
+
+    def test_split_log_file_aligns_ranges_to_lines(self):
+        for shard_count in (1, 2, 7, 64, 5000):
+            ranges = anl.split_log_file(self.log_path, shard_count)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], len(self.data))
+            self.assertLessEqual(len(ranges), shard_count)
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, start)
+                self.assertEqual(self.data[start - 1:start], b"\n")
+
+        lines_path = os.path.join(self.tmp_dir.name, "lines.log")
+        with open(lines_path, "wb") as f:
+            f.write(b"aaa\nbbb\n")
+        self.assertEqual(anl.split_log_file(lines_path, 2), [(0, 4), (4, 8)])
+        self.assertEqual(anl.split_log_file(lines_path, 100), [(0, 4), (4, 8)])
+
+        empty_path = os.path.join(self.tmp_dir.name, "empty.log")
+        open(empty_path, "wb").close()
+        self.assertEqual(anl.split_log_file(empty_path, 4), [])
+        self.assertEqual(anl.analyze_log_file_parallel(empty_path, max_workers=2), {"error": "No log entries to analyze"})
+
+    def test_parallel_analysis_matches_sequential(self):
+        with open(self.log_path, "rb") as f:
+            expected = anl.analyze_log_events(anl.iter_log_entries(f))
+
+        for workers in (1, 3):
+            self.assertEqual(anl.analyze_log_file_parallel(self.log_path, max_workers=workers), expected)
+
+    def test_parallel_entries_match_sequential(self):
+        with open(self.log_path, "rb") as f:
+            expected = [anl.format_log_entry(entry) for entry in anl.iter_log_entries(f)]
+
+        shards = list(anl.iter_log_file_shards(self.log_path, max_workers=2, format_entry=anl.format_log_entry))
+        self.assertGreater(len(shards), 1)
+        self.assertEqual([entry for _, entries in shards for entry in entries], expected)
+        self.assertEqual(expected[-2]["message"], "caf\ufffd")
+
+    def test_merged_summaries_match_single_pass(self):
+        log = "[2024-01-01T10:00:00] [DEBUG] a\n" + SAMPLE_LOG + "\n[2024-01-01T10:02:00+00:00] [INFO] b\n[2024-01-01T09:59:00] [DEBUG] c"
+        entries = list(anl.iter_log_entries(io.StringIO(log)))
+
+        for split in range(len(entries) + 1):
+            with self.subTest(split=split):
+                first, second = anl.LogEventSummary(), anl.LogEventSummary()
+                first.update(entries[:split])
+                second.update(entries[split:])
+                first.merge(second)
+                self.assertEqual(first.analysis(), anl.analyze_log_events(entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
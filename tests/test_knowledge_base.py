@@ -0,0 +1,404 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from src import device_ids
+from src import knowledge_base as kb
+from src import knowledge_base_sqlite as kb_sqlite
+
+
+def add_sample_device(name="Smart Plug", manufacturer="Acme", model="SP-1"):
+    return kb.add_device(
+        name=name,
+        manufacturer=manufacturer,
+        model=model,
+        os="PlugOS",
+        storage_type="Flash",
+        data_paths=["/var/log/"],
+        communication_protocols=["WiFi", "Zigbee"],
+        cloud_service="AWS IoT",
+        notes="Test device"
+    )
+
+
+def add_devices_in_process(kb_file_path, count):
+    kb.KB_FILE_PATH = kb_file_path
+    kb.KB_BACKEND = "json"
+    kb.invalidate_cache()
+    for i in range(count):
+        add_sample_device(name=f"Worker {os.getpid()} #{i}")
+    if kb._compaction["thread"] is not None:
+        kb._compaction["thread"].join()
+
+
+class TestDeviceIds(unittest.TestCase):
+
+    def test_ids_are_unique_and_sorted(self):
+        ids = [device_ids.generate_device_id() for _ in range(10000)]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(sorted(ids), ids)
+        self.assertTrue(all(i.startswith("DEV_") and len(i) == 30 for i in ids))
+
+    def test_timestamp_of_new_and_legacy_ids(self):
+        before = datetime.now().timestamp()
+        added_at = device_ids.device_id_timestamp(device_ids.generate_device_id())
+        self.assertLessEqual(abs(added_at - before), 1)
+
+        legacy = device_ids.device_id_timestamp("DEV_20250602213934")
+        self.assertEqual(legacy, datetime(2025, 6, 2, 21, 39, 34).timestamp())
+        self.assertIsNone(device_ids.device_id_timestamp("device-001"))
+
+
+class KnowledgeBaseTestCase(unittest.TestCase):
+    backend = "json"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.saved = (kb.KB_FILE_PATH, kb.KB_BACKEND, kb_sqlite.KB_DB_PATH)
+        kb.KB_FILE_PATH = os.path.join(self.tmp_dir.name, "device_knowledge_base.json")
+        kb_sqlite.KB_DB_PATH = os.path.join(self.tmp_dir.name, "device_knowledge_base.db")
+        kb.KB_BACKEND = self.backend
+        kb.invalidate_cache()
+
+    def tearDown(self):
+        kb.KB_FILE_PATH, kb.KB_BACKEND, kb_sqlite.KB_DB_PATH = self.saved
+        self.tmp_dir.cleanup()
+
+
+class TestJsonKnowledgeBase(KnowledgeBaseTestCase):
+
+    def test_add_get_update_delete(self):
+        device_id = add_sample_device()
+        self.assertEqual(kb.get_device(device_id)["name"], "Smart Plug")
+
+        self.assertTrue(kb.update_device(device_id, name="Smart Plug Pro"))
+        device = kb.get_device(device_id)
+        self.assertEqual(device["name"], "Smart Plug Pro")
+        self.assertEqual(device["model"], "SP-1")
+
+        self.assertTrue(kb.delete_device(device_id))
+        self.assertIsNone(kb.get_device(device_id))
+        self.assertFalse(kb.delete_device(device_id))
+        self.assertFalse(kb.update_device(device_id, name="Gone"))
+
+    def test_cache_avoids_reparsing_unchanged_file(self):
+        device_id = add_sample_device()
+        with mock.patch.object(kb.json, "load", wraps=json.load) as json_load:
+            for _ in range(5):
+                self.assertEqual(kb.get_device(device_id)["name"], "Smart Plug")
+            self.assertEqual(json_load.call_count, 0)
+
+            # An external rewrite of the (compacted) file invalidates the cache
+            kb.compact_kb()
+            with open(kb.KB_FILE_PATH, "w") as f:
+                json.dump({"devices": [{"id": "DEV_X", "name": "External device"}]}, f)
+            self.assertIsNone(kb.get_device(device_id))
+            self.assertEqual(kb.get_device("DEV_X")["name"], "External device")
+            self.assertEqual(json_load.call_count, 1)
+
+    def test_iteration_survives_changes_between_devices(self):
+        ids = [add_sample_device(name=f"Device {i}") for i in range(4)]
+
+        seen = []
+        for device in kb.iter_devices(fields=["id"]):
+            seen.append(device["id"])
+            if len(seen) == 1:
+                kb.delete_device(ids[0])
+                kb.delete_device(ids[2])
+                ids.append(add_sample_device(name="Late device"))
+        self.assertEqual(seen, [ids[0], ids[1], ids[3], ids[4]])
+
+    def test_returned_devices_do_not_alias_cache(self):
+        device_id = add_sample_device()
+        device = kb.get_device(device_id)
+        device["name"] = "Changed locally"
+        device["data_paths"].append("/tmp/")
+        kb.list_devices()[0]["name"] = "Changed in list"
+
+        cached = kb.get_device(device_id)
+        self.assertEqual(cached["name"], "Smart Plug")
+        self.assertEqual(cached["data_paths"], ["/var/log/"])
+
+
+class TestPagination(KnowledgeBaseTestCase):
+
+    def test_pages_cover_all_devices_in_order(self):
+        ids = [add_sample_device(name=f"Device {i}") for i in range(7)]
+        kb.delete_device(ids.pop(3))
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = kb.list_devices_page(3, after=cursor, fields=["id", "name"])
+            self.assertTrue(all(set(device) == {"id", "name"} for device in page))
+            seen.extend(device["id"] for device in page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, ids)
+
+        self.assertEqual([device["id"] for device in kb.iter_devices(after=ids[1])], ids[2:])
+        self.assertEqual(kb.list_devices_page(10, after=ids[-1]), ([], None))
+
+    def test_paging_continues_after_cursor_device_is_deleted(self):
+        ids = [add_sample_device(name=f"Device {i}") for i in range(6)]
+
+        page, cursor = kb.list_devices_page(2)
+        self.assertEqual(cursor, ids[1])
+        kb.delete_device(ids[1])
+        kb.delete_device(ids[2])
+
+        page, cursor = kb.list_devices_page(2, after=cursor)
+        self.assertEqual([device["id"] for device in page], ids[3:5])
+
+    def test_iter_devices_yields_copies(self):
+        device_id = add_sample_device()
+        for device in kb.iter_devices():
+            device["data_paths"].append("/changed/")
+        self.assertEqual(kb.get_device(device_id)["data_paths"], ["/var/log/"])
+
+
+class TestSqlitePagination(TestPagination):
+    backend = "sqlite"
+
+
+class TestAddedBetween(KnowledgeBaseTestCase):
+
+    def test_range_listing_mixes_legacy_and_new_ids(self):
+        kb.import_devices([
+            {"id": "DEV_20250101000000", "name": "Old", "manufacturer": "A", "model": "1",
+             "os": "x", "storage_type": "x", "data_paths": ["/"],
+             "communication_protocols": ["WiFi"], "cloud_service": "x"},
+            {"id": "custom-id", "name": "Custom", "manufacturer": "A", "model": "2",
+             "os": "x", "storage_type": "x", "data_paths": ["/"],
+             "communication_protocols": ["WiFi"], "cloud_service": "x",
+             "date_added": "2025-03-01T12:00:00"},
+        ])
+        new_id = add_sample_device()
+
+        names = lambda devices: [device["name"] for device in devices]
+        self.assertEqual(
+            names(kb.list_devices_added_between(datetime(2024, 12, 31), datetime(2025, 6, 1))),
+            ["Old", "Custom"]
+        )
+        self.assertEqual(
+            [device["id"] for device in kb.list_devices_added_between(datetime.now() - timedelta(minutes=1))],
+            [new_id]
+        )
+        self.assertEqual(names(kb.list_devices_added_between(end=datetime(2025, 1, 1))), ["Old"])
+        self.assertEqual(len(kb.list_devices_added_between()), 3)
+
+    def test_same_second_adds_get_distinct_ids(self):
+        ids = {add_sample_device(name=f"Device {i}") for i in range(20)}
+        self.assertEqual(len(ids), 20)
+        self.assertEqual(len(kb.list_devices()), 20)
+
+
+class TestSqliteAddedBetween(TestAddedBetween):
+    backend = "sqlite"
+
+
+class TestSearch(KnowledgeBaseTestCase):
+
+    def test_free_text_and_filters(self):
+        plug = add_sample_device(name="Smart Plug", manufacturer="Acme")
+        cam = add_sample_device(name="Smart Camera", manufacturer="Globex")
+
+        ids = lambda devices: [device["id"] for device in devices]
+        self.assertEqual(ids(kb.search_devices(["smart"])), [plug, cam])
+        self.assertEqual(ids(kb.search_devices(["CAMERA"])), [cam])
+        self.assertEqual(ids(kb.search_devices([], {"protocol": "zigbee", "manufacturer": "Acme"})), [plug])
+        self.assertEqual(ids(kb.search_devices(["smart plug"], {"path": "/var/log/"})), [plug])
+        self.assertEqual(kb.search_devices(["toaster"]), [])
+        with self.assertRaises(ValueError):
+            kb.search_devices([], {"colour": "red"})
+
+    def test_index_follows_add_update_delete(self):
+        plug = add_sample_device()
+        self.assertEqual(len(kb.search_devices(["plug"])), 1)
+
+        with mock.patch.object(kb, "DeviceSearchIndex", side_effect=AssertionError("rebuilt")):
+            cam = add_sample_device(name="Camera")
+            self.assertEqual(kb.search_devices(["camera"])[0]["id"], cam)
+
+            kb.update_device(plug, name="Thermostat", communication_protocols=["BLE"])
+            self.assertEqual(kb.search_devices(["plug"]), [])
+            self.assertEqual(kb.search_devices(["thermostat"], {"protocol": "BLE"})[0]["id"], plug)
+
+            kb.delete_device(cam)
+            self.assertEqual(kb.search_devices(["camera"]), [])
+
+            kb.import_devices([{
+                "name": "Doorbell", "manufacturer": "Acme", "model": "D-1", "os": "x",
+                "storage_type": "x", "data_paths": ["/"], "communication_protocols": ["WiFi"],
+                "cloud_service": "x"
+            }])
+            self.assertEqual(kb.search_devices(["doorbell"])[0]["name"], "Doorbell")
+
+
+class TestSqliteSearch(TestSearch):
+    backend = "sqlite"
+
+
+class TestImportExport(KnowledgeBaseTestCase):
+
+    def write_file(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w", newline="") as f:
+            f.write(content)
+        return path
+
+    def test_csv_import_reports_row_errors_without_aborting(self):
+        path = self.write_file("devices.csv", (
+            "name,manufacturer,model,os,storage_type,data_paths,communication_protocols,cloud_service,notes\n"
+            "Cam,Acme,C-1,CamOS,SD,/var/log/;/media/,WiFi;RTSP,AWS IoT,\n"
+            "Broken,Acme,,CamOS,SD,/var/log/,WiFi,AWS IoT,missing model\n"
+            "Hub,Acme,H-1,HubOS,Flash,/etc/,Zigbee,None,\n"
+        ))
+        results = kb.import_devices_from_file(path)
+
+        self.assertEqual(len(results["added"]), 2)
+        self.assertEqual(len(set(results["added"])), 2)
+        self.assertEqual([row for row, _ in results["errors"]], [2])
+        cam = kb.get_device(results["added"][0])
+        self.assertEqual(cam["data_paths"], ["/var/log/", "/media/"])
+        self.assertEqual(cam["communication_protocols"], ["WiFi", "RTSP"])
+
+    def test_export_round_trip_preserves_devices(self):
+        add_sample_device(name="First")
+        kb.import_devices([{
+            "name": "Second", "manufacturer": "Acme", "model": "S-2", "os": "OS",
+            "storage_type": "Flash", "data_paths": ["/a/"],
+            "communication_protocols": ["BLE"], "cloud_service": "None"
+        }])
+        originals = kb.list_devices()
+
+        for file_format in ("csv", "jsonl"):
+            path = os.path.join(self.tmp_dir.name, "export." + file_format)
+            self.assertEqual(kb.export_devices(path), 2)
+            for kb_path in (kb.KB_FILE_PATH, kb.KB_FILE_PATH + kb.JOURNAL_SUFFIX, kb_sqlite.KB_DB_PATH):
+                if os.path.exists(kb_path):
+                    os.remove(kb_path)
+            kb.invalidate_cache()
+
+            results = kb.import_devices_from_file(path)
+            self.assertEqual(results["errors"], [])
+            self.assertEqual(kb.list_devices(), originals)
+
+        # Importing the same IDs again is reported per row
+        results = kb.import_devices_from_file(path)
+        self.assertEqual(results["added"], [])
+        self.assertEqual([row for row, _ in results["errors"]], [1, 2])
+
+    def test_jsonl_import_reports_invalid_lines(self):
+        path = self.write_file("devices.jsonl", "{not json}\n[1, 2]\n")
+        results = kb.import_devices_from_file(path)
+        self.assertEqual(results["added"], [])
+        self.assertEqual([row for row, _ in results["errors"]], [1, 2])
+
+
+class TestSqliteImport(TestImportExport):
+    backend = "sqlite"
+
+
+class TestJournal(KnowledgeBaseTestCase):
+
+    def test_writes_append_to_journal_and_compact(self):
+        first = add_sample_device()
+        kb.update_device(first, name="Renamed")
+        second = add_sample_device()
+        kb.delete_device(second)
+
+        with open(kb.KB_FILE_PATH) as f:
+            self.assertEqual(json.load(f)["devices"], [])
+        kb.invalidate_cache()
+        self.assertEqual([d["name"] for d in kb.list_devices()], ["Renamed"])
+
+        kb.compact_kb()
+        self.assertEqual(os.path.getsize(kb.KB_FILE_PATH + kb.JOURNAL_SUFFIX), 0)
+        with open(kb.KB_FILE_PATH) as f:
+            self.assertEqual([d["name"] for d in json.load(f)["devices"]], ["Renamed"])
+
+        # Replaying a journal over a file that already contains it is harmless
+        kb.update_device(first, notes="after compaction")
+        with open(kb.KB_FILE_PATH + kb.JOURNAL_SUFFIX) as f:
+            journal = f.read()
+        kb.compact_kb()
+        with open(kb.KB_FILE_PATH + kb.JOURNAL_SUFFIX, "w") as f:
+            f.write(journal)
+        kb.invalidate_cache()
+        self.assertEqual(len(kb.list_devices()), 1)
+        self.assertEqual(kb.get_device(first)["notes"], "after compaction")
+
+    def test_partial_journal_line_is_ignored_and_repaired(self):
+        first = add_sample_device()
+        with open(kb.KB_FILE_PATH + kb.JOURNAL_SUFFIX, "a") as f:
+            f.write('{"op": "delete", "id": "')
+        kb.invalidate_cache()
+        self.assertIsNotNone(kb.get_device(first))
+
+        second = add_sample_device()
+        kb.invalidate_cache()
+        self.assertEqual([d["id"] for d in kb.list_devices()], [first, second])
+
+    def test_background_compaction(self):
+        with mock.patch.object(kb, "JOURNAL_COMPACT_BYTES", 1):
+            add_sample_device()
+            kb._compaction["thread"].join()
+        self.assertEqual(os.path.getsize(kb.KB_FILE_PATH + kb.JOURNAL_SUFFIX), 0)
+        with open(kb.KB_FILE_PATH) as f:
+            self.assertEqual(len(json.load(f)["devices"]), 1)
+
+    def test_concurrent_writers_do_not_lose_updates(self):
+        with mock.patch.object(kb, "JOURNAL_COMPACT_BYTES", 4096):
+            processes = [
+                multiprocessing.Process(target=add_devices_in_process, args=(kb.KB_FILE_PATH, 25))
+                for _ in range(4)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+                self.assertEqual(process.exitcode, 0)
+
+        kb.invalidate_cache()
+        self.assertEqual(len(kb.list_devices()), 100)
+        self.assertEqual(len({d["id"] for d in kb.list_devices()}), 100)
+
+
+class TestSqliteKnowledgeBase(KnowledgeBaseTestCase):
+    backend = "sqlite"
+
+    def test_migrates_existing_json_on_first_use(self):
+        devices = [
+            {"id": "DEV_20250101000000", "name": "Cam", "manufacturer": "Acme", "model": "C-1"},
+            {"id": "DEV_20250101000001", "name": "Hub", "manufacturer": "Other", "model": "H-1"},
+        ]
+        with open(kb.KB_FILE_PATH, "w") as f:
+            json.dump({"devices": devices}, f)
+
+        self.assertEqual([d["id"] for d in kb.list_devices()], [d["id"] for d in devices])
+        self.assertEqual(kb.get_device("DEV_20250101000001")["name"], "Hub")
+        # A second migration must not duplicate devices
+        self.assertEqual(kb.migrate_to_sqlite(), 0)
+        self.assertEqual(len(kb.list_devices()), 2)
+
+    def test_add_get_update_delete(self):
+        device_id = add_sample_device()
+        self.assertFalse(os.path.exists(kb.KB_FILE_PATH))
+        self.assertEqual(kb.get_device(device_id)["communication_protocols"], ["WiFi", "Zigbee"])
+
+        self.assertTrue(kb.update_device(device_id, manufacturer="Globex"))
+        self.assertEqual(kb.find_devices(manufacturer="Globex")[0]["id"], device_id)
+        self.assertEqual(kb.find_devices(manufacturer="Acme"), [])
+
+        self.assertTrue(kb.delete_device(device_id))
+        self.assertIsNone(kb.get_device(device_id))
+        self.assertFalse(kb.delete_device(device_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import unittest
+from unittest.mock import patch
+
+from src import analysis as anl
+from src import log_columns
+from src import synthetic_corpus
+
+
+SAMPLE_LOG = (
+    "[2024-01-01T10:00:00] [INFO] Device started\n"
+    "[2024-01-01T10:00:05] [INFO] Sensor reading: 42\n"
+    "not a log line\n"
+    "[2024-01-01T09:59:00] [WARNING] Battery level: 15%\n"
+    "[2024-01-01T10:01:00] [ERROR] Sensor reading: 7\n"
+    "[2024-01-01T10:01:00+01:00] [DEBUG] Battery level: 80%\n"
+    "[2024-01-01T10:02:00.250000] [INFO] Device started"
+)
+
+
+class TestLogColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = b"".join(synthetic_corpus.generate_log_corpus(500000, seed=7)).decode()
+
+    def test_columns_round_trip_to_entries(self):
+        for log in (SAMPLE_LOG, self.corpus):
+            columns = log_columns.parse_log_columns(io.StringIO(log))
+            self.assertEqual(columns.to_entries(), anl.parse_log_file(log))
+
+        columns = log_columns.parse_log_columns(io.StringIO(SAMPLE_LOG))
+        self.assertEqual(columns.levels, ["INFO", "WARNING", "ERROR", "DEBUG"])
+        self.assertEqual(columns.messages[columns.message_ids[-1]], "Device started")
+        self.assertEqual(len(columns.messages), 5)
+        self.assertEqual(columns.sensor_values.count(), 2)
+
+    def test_entries_are_converted_in_batches(self):
+        columns = log_columns.parse_log_columns(io.StringIO(self.corpus))
+        with patch.object(log_columns, "ENTRY_BATCH_SIZE", 1000):
+            self.assertEqual(list(log_columns.parse_log_columns(io.StringIO(self.corpus)).iter_entries()), columns.to_entries())
+
+    def test_from_entries_accepts_iso_timestamps(self):
+        entries = anl.parse_log_file(SAMPLE_LOG)
+        self.assertEqual(log_columns.from_entries(entries).to_entries(), entries)
+
+    def test_analysis_matches_entries(self):
+        for log in (SAMPLE_LOG, self.corpus):
+            entries = anl.parse_log_file(log)
+            columns = log_columns.from_entries(entries)
+            self.assertEqual(log_columns.analyze_log_events(columns), anl.analyze_log_events(entries))
+
+        empty = log_columns.from_entries([])
+        self.assertEqual(log_columns.analyze_log_events(empty), {"error": "No log entries to analyze"})
+        self.assertEqual(empty.to_entries(), [])
+
+    def test_value_stats_do_not_overflow(self):
+        entries = [{"timestamp": "2024-01-01T10:00:00", "level": "INFO", "message": "Sensor reading", "sensor_value": 2 ** 62}] * 4
+        analysis = log_columns.analyze_log_events(log_columns.from_entries(entries))
+
+        self.assertEqual(analysis["sensor_stats"]["avg"], float(2 ** 62))
+        self.assertEqual(analysis, anl.analyze_log_events(entries))
+
+    def test_event_counts_follow_first_appearance_in_selection(self):
+        columns = log_columns.parse_log_columns(io.StringIO(SAMPLE_LOG))
+        selection = columns.take(columns.level_codes != 0)
+
+        analysis = log_columns.analyze_log_events(selection)
+        self.assertEqual(list(analysis["event_counts"]), ["WARNING", "ERROR", "DEBUG"])
+        self.assertEqual(analysis, anl.analyze_log_events(selection.to_entries()))
+        self.assertNotIn("sensor_stats", log_columns.analyze_log_events(columns.take(columns.level_codes == 3)))
+
+    def test_extraction_matches_entries(self):
+        entries = anl.parse_log_file(self.corpus)
+        columns = log_columns.from_entries(entries)
+
+        for level in ("ERROR", "DEBUG", "CRITICAL"):
+            self.assertEqual(
+                log_columns.extract_events_by_type(columns, level).to_entries(),
+                anl.extract_events_by_type(entries, level)
+            )
+
+        for start, end in (("2024-01-01T01:00:00", "2024-01-01T02:30:00"), ("2024-01-02", "2024-01-01"), ("soon", "later")):
+            self.assertEqual(
+                log_columns.extract_time_range(columns, start, end).to_entries(),
+                anl.extract_time_range(entries, start, end)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src import acquisition as acq
+from src import network_acquisition as net
+
+
+LOG_DATA = b"[2024-01-01T00:00:00] [INFO] Device started\n" * 2000
+
+
+class StandInDevice:
+    """A local HTTP/1.1 server standing in for device endpoints."""
+
+    def __init__(self, delay=0.0, drop_idle=False):
+        self.delay = delay
+        self.drop_idle = drop_idle
+        self.connections = 0
+        self.open = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self.open += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                while await reader.readline() not in (b"\r\n", b""):
+                    pass
+                path = request_line.split()[1].decode()
+
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                try:
+                    await asyncio.sleep(self.delay)
+                    if path == "/slow":
+                        await asyncio.sleep(5)
+                    if path == "/log":
+                        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(LOG_DATA) + LOG_DATA)
+                    elif path == "/chunked":
+                        writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+                        for start in range(0, len(LOG_DATA), 7000):
+                            piece = LOG_DATA[start:start + 7000]
+                            writer.write(b"%x\r\n" % len(piece) + piece + b"\r\n")
+                        writer.write(b"0\r\n\r\n")
+                    elif path == "/close":
+                        writer.write(b"HTTP/1.1 200 OK\r\nConnection: close\r\n\r\n" + LOG_DATA)
+                        await writer.drain()
+                        return
+                    else:
+                        writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                    await writer.drain()
+                    if self.drop_idle:
+                        # Close the kept-alive connection without announcing it
+                        return
+                finally:
+                    self.active -= 1
+        finally:
+            self.open -= 1
+            writer.close()
+
+
+class TestNetworkAcquisition(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.saved_output_dir = acq.FORENSIC_OUTPUT_DIR
+        acq.FORENSIC_OUTPUT_DIR = os.path.join(self.tmp_dir.name, "forensic_output")
+
+    def tearDown(self):
+        acq.FORENSIC_OUTPUT_DIR = self.saved_output_dir
+        self.tmp_dir.cleanup()
+
+    async def start_device(self, **kwargs):
+        device = StandInDevice(**kwargs)
+        await device.start()
+        self.addAsyncCleanup(device.stop)
+        return device
+
+    async def collect(self, targets, **kwargs):
+        return [result async for result in net.acquire_targets(targets, **kwargs)]
+
+    def test_parse_target_url(self):
+        self.assertEqual(net.parse_target_url("http://cam.local/logs?n=1"), ("http", "cam.local", 80, "/logs?n=1"))
+        self.assertEqual(net.parse_target_url("tcp://10.0.0.5:9000/dump"), ("tcp", "10.0.0.5", 9000, "/dump"))
+        with self.assertRaises(ValueError):
+            net.parse_target_url("tcp://10.0.0.5")
+        with self.assertRaises(ValueError):
+            net.parse_target_url("ftp://10.0.0.5/logs")
+
+    async def test_http_acquisition_matches_simulated_metadata(self):
+        device = await self.start_device()
+        results = await self.collect([("DEV_TEST", "log", f"http://127.0.0.1:{device.port}/log")])
+
+        self.assertEqual(results[0]["status"], "done")
+        self.assertEqual(results[0]["sha256_hash"], hashlib.sha256(LOG_DATA).hexdigest())
+        with open(results[0]["output_path"] + ".meta") as f:
+            metadata = json.load(f)
+        simulated_path, _, _ = acq.simulate_acquisition("DEV_TEST", "log", size=100)
+        with open(simulated_path + ".meta") as f:
+            self.assertEqual(set(metadata), set(json.load(f)))
+        self.assertEqual(metadata["file_size"], len(LOG_DATA))
+        self.assertEqual(len(acq.find_acquisitions(device_id="DEV_TEST")), 2)
+        self.assertEqual(acq.verify_chunks(results[0]["output_path"])["status"], "ok")
+
+    async def test_connections_are_pooled_and_limited_per_host(self):
+        device = await self.start_device(delay=0.01)
+        targets = [(f"DEV_{i}", "log", f"http://127.0.0.1:{device.port}/log") for i in range(12)]
+
+        results = await self.collect(targets, per_host_limit=3)
+
+        self.assertTrue(all(result["status"] == "done" for result in results))
+        self.assertEqual(len(results), 12)
+        self.assertLessEqual(device.max_active, 3)
+        self.assertLessEqual(device.connections, 3)
+
+    async def test_idle_connections_count_against_the_total_limit(self):
+        devices = [await self.start_device() for _ in range(6)]
+        targets = [(f"DEV_{i}", "log", f"http://127.0.0.1:{device.port}/log") for i, device in enumerate(devices * 2)]
+
+        open_connections = peak = 0
+        open_connection = asyncio.open_connection
+
+        async def counting_open_connection(host, port):
+            nonlocal open_connections, peak
+            reader, writer = await open_connection(host, port)
+            open_connections += 1
+            peak = max(peak, open_connections)
+            close = writer.close
+
+            def counting_close():
+                nonlocal open_connections
+                if not writer.is_closing():
+                    open_connections -= 1
+                close()
+
+            writer.close = counting_close
+            return reader, writer
+
+        with patch.object(asyncio, "open_connection", counting_open_connection):
+            results = await self.collect(targets, max_connections=2)
+
+        self.assertEqual([result["status"] for result in results], ["done"] * 12)
+        self.assertLessEqual(peak, 2)
+        self.assertEqual(open_connections, 0)
+
+    async def test_idle_connections_close_after_a_hosts_last_target(self):
+        done, busy = await self.start_device(), await self.start_device(delay=0.3)
+        open_while_busy = []
+        results = []
+        async for result in net.acquire_targets([
+            ("DEV_A", "log", f"http://127.0.0.1:{done.port}/log"),
+            ("DEV_B", "log", f"http://127.0.0.1:{busy.port}/log")
+        ]):
+            open_while_busy.append(done.open)
+            results.append(result)
+
+        self.assertEqual([result["device_id"] for result in results], ["DEV_A", "DEV_B"])
+        self.assertEqual(open_while_busy[1], 0)
+
+    async def test_stale_pooled_connection_is_replaced(self):
+        device = await self.start_device(drop_idle=True)
+        targets = [(f"DEV_{i}", "log", f"http://127.0.0.1:{device.port}/log") for i in range(3)]
+
+        results = await self.collect(targets, per_host_limit=1)
+
+        self.assertEqual([result["status"] for result in results], ["done"] * 3)
+        self.assertEqual(device.connections, 3)
+
+    async def test_chunked_and_close_delimited_bodies(self):
+        device = await self.start_device()
+        results = await self.collect([
+            ("DEV_A", "log", f"http://127.0.0.1:{device.port}/chunked"),
+            ("DEV_B", "log", f"http://127.0.0.1:{device.port}/close")
+        ])
+
+        self.assertEqual([result["status"] for result in results], ["done", "done"])
+        self.assertTrue(all(result["sha256_hash"] == hashlib.sha256(LOG_DATA).hexdigest() for result in results))
+
+    async def test_failures_leave_no_partial_acquisition(self):
+        device = await self.start_device()
+        closed = await asyncio.start_server(lambda r, w: None, "127.0.0.1", 0)
+        closed_port = closed.sockets[0].getsockname()[1]
+        closed.close()
+        await closed.wait_closed()
+
+        results = await self.collect([
+            ("DEV_A", "log", f"http://127.0.0.1:{device.port}/missing"),
+            ("DEV_B", "log", f"http://127.0.0.1:{device.port}/slow"),
+            ("DEV_C", "log", f"http://127.0.0.1:{closed_port}/log")
+        ], timeout=0.2)
+
+        errors = {result["device_id"]: result["error"] for result in results}
+        self.assertEqual([result["status"] for result in results], ["failed"] * 3)
+        self.assertIn("404", errors["DEV_A"])
+        self.assertIn("Timed out", errors["DEV_B"])
+        self.assertIn("Cannot connect", errors["DEV_C"])
+        self.assertFalse([name for name in os.listdir(acq.FORENSIC_OUTPUT_DIR) if name.endswith(".dat")])
+
+    async def test_raw_tcp_acquisition(self):
+        async def handle(reader, writer):
+            command = await reader.readline()
+            writer.write(b"output of " + command)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        port = server.sockets[0].getsockname()[1]
+
+        results = await self.collect([("DEV_TEST", "config", f"tcp://127.0.0.1:{port}/dump%20config")])
+
+        with open(results[0]["output_path"], "rb") as f:
+            self.assertEqual(f.read(), b"output of dump config\n")
+
+
+if __name__ == "__main__":
+    unittest.main()